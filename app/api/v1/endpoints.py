@@ -1,77 +1,306 @@
-from fastapi import APIRouter, HTTPException
-from app.application.trading_service import trading_service
+from fastapi import APIRouter, Header, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from typing import Optional
+import asyncio
+import json
+from app.application.async_trading_service import async_trading_service, SNAPSHOT_PARTS
+from app.application.order_pipeline import order_pipeline, IdempotencyConflict, OrderQueueFull, OrderStoreUnavailable
+from app.application.push_service import push_hub, PushSubscriber, SlowConsumerError, TopicRejected
+from app.api.v1.responses import json_response
 from app.domain.models import Stock, Order
+from app.core.config import settings
+from app.core.profiler import ProfilerBusy, profiler
+from app.core.rate_limiter import kis_rate_limiter
+from app.core.tracing import span, tracer
 
 router = APIRouter()
 
+def cached_json(request: Request, cache_key: str, data):
+    """캐시된 데이터를 ETag/압축 응답으로 변환 (캐시 엔트리의 인코딩된 본문 재사용)"""
+    with span("serialize"):
+        cached = async_trading_service.get_cached_body(cache_key, data)
+        if cached is None:
+            return json_response(request, data)
+        body, etag = cached
+        return json_response(request, etag=etag, body=body)
+
 @router.get("/indices")
-def get_indices():
+async def get_indices(request: Request):
     try:
-        return trading_service.get_market_indices()
+        data = await async_trading_service.get_market_indices()
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    return cached_json(request, "market_indices", data)
 
 @router.get("/top-stocks")
-def get_top_stocks(market: str = "J"):
+async def get_top_stocks(request: Request, market: str = "J"):
     try:
-        return trading_service.get_market_top_stocks(market)
+        data = await async_trading_service.get_market_top_stocks(market)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    return cached_json(request, f"top_stocks_{market}", data)
 
 @router.get("/index-chart/{code}")
-def get_index_chart(code: str):
+async def get_index_chart(request: Request, code: str, since: Optional[int] = None):
+    """since: 이 시각(YYYYMMDDHHMMSS) 이후 봉만 응답 (같은 시각 포함)"""
     try:
-        return trading_service.get_index_chart(code)
+        data = await async_trading_service.get_index_chart(code, since=since)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    return cached_json(request, f"index_chart_{code}", data)
 
 @router.get("/transaction-rankings")
-def get_transaction_rankings():
+async def get_transaction_rankings(request: Request):
     try:
-        return trading_service.get_transaction_rankings()
+        data = await async_trading_service.get_transaction_rankings()
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    return cached_json(request, "transaction_rankings", data)
 
 @router.get("/search")
-def search_stocks(q: str):
+async def search_stocks(q: str):
     try:
-        return trading_service.find_stocks(q)
+        return await async_trading_service.find_stocks(q)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.get("/stocks")
+async def get_stocks(codes: str):
+    """
+    여러 종목 현재가 일괄 조회 (codes는 쉼표로 구분)
+    
+    종목별로 status("ok" | "not_found" | "error")를 담아 한 번에 응답합니다.
+    """
+    code_list = [c.strip() for c in codes.split(",") if c.strip()]
+    if not code_list:
+        raise HTTPException(status_code=400, detail="codes is required")
+    if len(code_list) > settings.QUOTE_BATCH_MAX_CODES:
+        raise HTTPException(status_code=400, detail=f"too many codes (max {settings.QUOTE_BATCH_MAX_CODES})")
+    results = await async_trading_service.get_stock_details(code_list)
+    return [{"code": code, **result} for code, result in results.items()]
+
 @router.get("/stock/{code}", response_model=Stock)
-def get_stock(code: str):
+async def get_stock(request: Request, code: str):
+    # 캐시된 dict와 인코딩된 본문을 그대로 사용 (Stock 모델 재생성/검증 생략, 스키마는 문서용)
     try:
-        return trading_service.get_stock_detail(code)
+        data = await async_trading_service.get_stock_detail_data(code)
     except Exception as e:
         raise HTTPException(status_code=404, detail=str(e))
+    return cached_json(request, f"stock_detail_{code}", data)
+
+@router.get("/stock/{code}/snapshot")
+async def get_stock_snapshot(request: Request, code: str, exclude: Optional[str] = None,
+                             chart_since: Optional[int] = None, hoga_since: Optional[int] = None):
+    """
+    상세 화면용 종합 조회 (detail, chart, hoga, balance를 한 번에)
+    
+    exclude: 제외할 항목 (쉼표로 구분, 예: "chart,balance")
+    chart_since: 차트는 이 시각 이후 봉만 포함
+    hoga_since: 호가는 이 seq 이후 변경분만 포함 (0이면 seq가 붙은 전체 호가)
+    """
+    excluded = {p.strip() for p in (exclude or "").split(",") if p.strip()}
+    unknown = excluded - set(SNAPSHOT_PARTS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"unknown parts: {', '.join(sorted(unknown))}")
+    snapshot = await async_trading_service.get_stock_snapshot(
+        code, exclude=excluded, chart_since=chart_since, hoga_since=hoga_since
+    )
+    with span("serialize"):
+        return json_response(request, body=async_trading_service.encode_snapshot(code, snapshot))
 
 @router.get("/stock/{code}/hoga")
-def get_hoga(code: str):
+async def get_hoga(request: Request, code: str, since: Optional[int] = None):
+    """since: 마지막으로 받은 seq, 주면 그 이후 바뀐 호가 칸만 응답 (0이면 seq가 붙은 전체 호가)"""
     try:
-        return trading_service.get_order_book(code)
+        if since is not None:
+            return json_response(request, await async_trading_service.get_order_book_delta(code, since=since))
+        data = await async_trading_service.get_order_book(code)
+    except LookupError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    return cached_json(request, f"order_book_{code}", data)
 
 @router.get("/stock/{code}/chart")
-def get_stock_chart(code: str):
+async def get_stock_chart(request: Request, code: str, since: Optional[int] = None):
+    """since: 이 시각(YYYYMMDDHHMMSS) 이후 봉만 응답 (같은 시각 포함)"""
     try:
-        return trading_service.get_stock_chart(code)
+        data = await async_trading_service.get_stock_chart(code, since=since)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    return cached_json(request, f"stock_chart_{code}", data)
 
-@router.get("/balance")
-def get_balance():
+@router.get("/stock/{code}/daily-chart")
+async def get_daily_chart(request: Request, code: str, start: Optional[int] = None, end: Optional[int] = None):
+    """일봉 (start/end: YYYYMMDD, 기본값은 최근 1년)"""
     try:
-        return trading_service.get_balance()
+        data = await async_trading_service.get_daily_chart(code, start=start, end=end)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    return cached_json(request, async_trading_service.daily_chart_key(code, start, end), data)
 
-@router.post("/order")
-def create_order(order: Order):
+@router.get("/balance")
+async def get_balance():
     try:
-        return trading_service.execute_order(
-            order.stock_code, order.quantity, order.price, order.order_type, order.order_dvsn
-        )
+        return await async_trading_service.get_balance()
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    return async_trading_service.get_cache_stats()
+
+@router.get("/rate-limit/stats")
+async def get_rate_limit_stats():
+    return kis_rate_limiter.stats()
+
+@router.get("/http/stats")
+async def get_http_stats():
+    """공유 HTTP 커넥션 풀의 연결 재사용 통계"""
+    from app.infrastructure.http_pool import http_pool
+    return http_pool.stats()
+
+@router.get("/search/stats")
+async def get_search_stats():
+    from app.infrastructure.stock_master import stock_master
+    return stock_master.stats()
+
+@router.get("/realtime/stats")
+async def get_realtime_stats():
+    from app.infrastructure.kis_realtime import kis_realtime_feed
+    return kis_realtime_feed.stats()
+
+@router.get("/debug/traces")
+async def get_traces(limit: int = 20, min_ms: float = 0):
+    """최근 trace (최신순, min_ms 이상 걸린 요청만), 요청에 X-Trace: 1 헤더를 붙이면 항상 기록"""
+    return {"stats": tracer.stats(), "traces": tracer.recent(limit, min_ms)}
+
+@router.get("/debug/traces/{trace_id}")
+async def get_trace(trace_id: str):
+    trace = tracer.get(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="trace not found (expired from buffer)")
+    return trace
+
+@router.post("/debug/profile")
+async def run_profiler(seconds: float = 5, interval_ms: float = 5, format: str = "json"):
+    """샘플링 프로파일러를 seconds 동안 실행 (settings.PROFILER_ENABLED일 때만), format=collapsed면 flame graph 입력 텍스트"""
+    if not settings.PROFILER_ENABLED:
+        raise HTTPException(status_code=403, detail="profiler is disabled (PROFILER_ENABLED)")
+    if not 0 < seconds <= settings.PROFILER_MAX_SECONDS or interval_ms < 1:
+        raise HTTPException(status_code=400, detail=f"seconds must be in (0, {settings.PROFILER_MAX_SECONDS}], interval_ms >= 1")
+    try:
+        result = await asyncio.to_thread(profiler.run, seconds, interval_ms / 1000)
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if format == "collapsed":
+        return PlainTextResponse(profiler.collapsed(result))
+    return result
+
+@router.delete("/cache")
+async def clear_cache(category: Optional[str] = None):
+    return {"cleared": await async_trading_service.clear_cache(category)}
+
+@router.post("/order", status_code=202)
+async def create_order(order: Order, idempotency_key: Optional[str] = Header(None)):
+    """
+    주문 접수 (KIS 전송은 주문 worker가 처리)
+    
+    응답은 주문 상태({"order_id", "state", ...})이며, 결과는 GET /order/{order_id}로 확인합니다.
+    Idempotency-Key 헤더가 같은 요청은 한 번만 주문됩니다.
+    """
+    try:
+        return await order_pipeline.submit(order, idempotency_key=idempotency_key)
+    except IdempotencyConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except (OrderQueueFull, OrderStoreUnavailable) as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+@router.get("/order/stats")
+async def get_order_stats():
+    return order_pipeline.stats()
+
+@router.get("/order/{order_id}")
+async def get_order_status(order_id: str, wait: float = 0):
+    """주문 상태 (wait: 완료될 때까지 최대 대기 시간(초), long polling)"""
+    try:
+        status = await order_pipeline.wait(order_id, min(wait, settings.ORDER_STATUS_MAX_WAIT))
+    except OrderStoreUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Unknown order: {order_id}")
+    return status
+
+@router.websocket("/ws")
+async def push_websocket(websocket: WebSocket):
+    """
+    서버 푸시 채널 (WebSocket)
+    
+    요청: {"action": "subscribe" | "unsubscribe", "topics": ["stock:005930", "hoga:005930", ...]}
+    응답: {"topic": "...", "data": ...}
+    """
+    await websocket.accept()
+    subscriber = PushSubscriber()
+    
+    async def receiver():
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+            except ValueError:
+                message = None
+            topics = message.get("topics", []) if isinstance(message, dict) else None
+            if not isinstance(topics, list) or not all(isinstance(topic, str) for topic in topics):
+                subscriber.offer(json.dumps({"error": "invalid message"}))
+                continue
+            action = message.get("action")
+            for topic in topics:
+                if action == "subscribe":
+                    try:
+                        push_hub.subscribe(subscriber, topic)
+                    except TopicRejected as e:
+                        subscriber.offer(json.dumps({"topic": topic, "error": str(e)}))
+                elif action == "unsubscribe":
+                    push_hub.unsubscribe(subscriber, topic)
+    
+    async def sender():
+        while True:
+            await websocket.send_text(await subscriber.next_message())
+    
+    tasks = [asyncio.create_task(receiver()), asyncio.create_task(sender())]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if isinstance(task.exception(), SlowConsumerError):
+                await websocket.close(code=1013)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        for task in tasks:
+            task.cancel()
+        push_hub.disconnect(subscriber)
+
+@router.get("/stream")
+async def push_stream(topics: str):
+    """서버 푸시 채널 (SSE), topics는 쉼표로 구분"""
+    subscriber = PushSubscriber()
+    for topic in filter(None, (t.strip() for t in topics.split(","))):
+        try:
+            push_hub.subscribe(subscriber, topic)
+        except TopicRejected as e:
+            push_hub.disconnect(subscriber)
+            raise HTTPException(status_code=400, detail=f"{e}: {topic}")
+    
+    async def event_stream():
+        try:
+            while True:
+                yield f"data: {await subscriber.next_message()}\n\n"
+        except SlowConsumerError:
+            pass
+        finally:
+            push_hub.disconnect(subscriber)
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+@router.get("/push/stats")
+async def get_push_stats():
+    return push_hub.stats()
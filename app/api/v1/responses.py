@@ -0,0 +1,65 @@
+"""
+HTTP Response Helpers (API Layer)
+
+폴링이 잦은 엔드포인트(차트, 랭킹, 지수, 호가)의 응답 비용을 줄입니다.
+Spring Boot 비유: ShallowEtagHeaderFilter + server.compression + Jackson 대신 빠른 ObjectMapper
+
+- ETag: 캐시 엔트리 버전으로 만들고, If-None-Match가 같으면 본문 없이 304
+- 인코딩: app.core.encoding (orjson 우선). 캐시 엔트리에 미리 인코딩된 본문이 있으면 그대로 사용
+- 압축: 클라이언트가 br을 받으면 brotli(pyproject 의존성)로 직접 압축.
+  그 외 gzip은 main.py의 GZipMiddleware가 처리합니다 (이미 압축된 응답은 건너뜀).
+"""
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+from app.core.config import settings
+from app.core.encoding import encode_json
+
+try:
+    import brotli
+except ImportError:  # 의존성 설치 전 환경: gzip만 사용
+    brotli = None
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # 약한 비교 (W/ 접두어 무시)
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in tags
+
+
+def json_response(request: Request, data: Any = None, etag: Optional[str] = None,
+                  body: Optional[bytes] = None) -> Response:
+    """
+    ETag/304 + 압축을 적용한 JSON 응답
+
+    Args:
+        request: 현재 요청 (If-None-Match, Accept-Encoding 확인용)
+        data: 응답 데이터 (body가 없을 때만 인코딩)
+        etag: 캐시 엔트리 ETag (None이면 조건부 응답 없이 본문 전송)
+        body: 미리 인코딩된 JSON 본문 (캐시 엔트리)
+    """
+    headers = {}
+    if etag is not None:
+        # 브라우저가 매번 재검증하도록 (fetch가 If-None-Match를 자동으로 붙임)
+        headers["ETag"] = etag
+        headers["Cache-Control"] = "no-cache"
+        if _etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+
+    if body is None:
+        body = encode_json(data)
+    if (
+        brotli is not None
+        and len(body) >= settings.COMPRESSION_MINIMUM_SIZE
+        and "br" in request.headers.get("accept-encoding", "")
+    ):
+        body = brotli.compress(body, quality=4)
+        headers["Content-Encoding"] = "br"
+        headers["Vary"] = "Accept-Encoding"
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,681 @@
+"""
+Async Trading Service (Application Layer)
+
+TradingService의 비동기 버전입니다. async 엔드포인트에서 사용합니다.
+Spring Boot 비유: WebFlux 기반 @Service (Mono/Flux 반환)
+
+캐싱 정책(카테고리별 TTL, single-flight, stale-while-revalidate)은 TradingService와 동일하며,
+스레드 대신 asyncio Task로 동시 요청을 합칩니다.
+"""
+from app.domain.repositories.async_stock_repository import AsyncStockRepository, OrderOutcomeUnknown
+from app.domain.models import Stock, Order
+from app.core.cache import MemoryCache
+from app.core.candles import CandleStore
+from app.core.config import settings
+from app.core.encoding import decode_json, encode_json
+from app.core.metrics import metrics, observe_upstream
+from app.core.order_book import OrderBookStore
+from app.core.rate_limiter import Priority, SharedRateWindow, kis_rate_limiter, wait_timeout
+from app.core.shared_cache import SharedCache, SharedCacheUnavailable
+from app.core.tracing import annotate, span
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+import asyncio
+import re
+import time
+import uuid
+
+# 종합 조회(get_stock_snapshot)에 포함되는 항목
+SNAPSHOT_PARTS = ("detail", "chart", "hoga", "balance")
+# 시장 지수 조회(get_market_indices) 응답 키 -> 업종코드
+MARKET_INDEX_CODES = {"kospi": "0001", "kosdaq": "1001", "kospi200": "2001"}
+
+# 공유 캐시 키 접두어 (값, 워커 간 조회 잠금)와 다른 워커의 조회 결과를 확인하는 간격(초)
+SHARED_VALUE_PREFIX = settings.SHARED_CACHE_KEY_PREFIX + "cache:"
+SHARED_LOCK_PREFIX = settings.SHARED_CACHE_KEY_PREFIX + "lock:"
+SHARED_POLL_INTERVAL = 0.02
+# 계좌별 잔고 세대 번호 (주문/체결 시 증가, 잔고 캐시 키에 포함)와 보관 시간(초)
+BALANCE_GENERATION_PREFIX = settings.SHARED_CACHE_KEY_PREFIX + "balance_gen:"
+BALANCE_GENERATION_TTL = 86400
+
+_REFRESH_ERRORS = metrics.counter(
+    "cache_refresh_errors_total", "Upstream fetches that failed while refreshing the cache", ("category",))
+
+
+class AsyncTradingService:
+    """
+    주식 거래 비즈니스 로직을 담당하는 비동기 서비스
+
+    - AsyncStockRepository를 생성자 주입으로 받음
+    - 종목 마스터가 아직 적재되지 않았을 때의 검색만 kis_client(동기)를 스레드에서 호출
+    """
+
+    def __init__(
+        self,
+        stock_repository: AsyncStockRepository,
+        cache: Optional[MemoryCache] = None,
+        stale_while_revalidate: Optional[bool] = None,
+        shared_cache: Optional[SharedCache] = None,
+    ):
+        """
+        생성자 주입 (Constructor Injection)
+
+        Args:
+            stock_repository: AsyncStockRepository 인터페이스 구현체
+            cache: 캐시 저장소 (기본값: 설정 기반 MemoryCache)
+            stale_while_revalidate: 만료된 값을 즉시 반환하고 백그라운드 갱신 여부
+                (기본값: settings.CACHE_STALE_WHILE_REVALIDATE)
+            shared_cache: 워커 간 공유 캐시 (None이면 워커별 캐시만 사용)
+        """
+        self._repository = stock_repository
+        self._cache = cache or MemoryCache(
+            max_entries=settings.CACHE_MAX_ENTRIES,
+            max_bytes=settings.CACHE_MAX_BYTES,
+        )
+        if stale_while_revalidate is None:
+            stale_while_revalidate = settings.CACHE_STALE_WHILE_REVALIDATE
+        self._stale_while_revalidate = stale_while_revalidate
+        self._shared = shared_cache
+
+        # 차트는 봉 단위로 병합하여 보관 (since 조회용)
+        self._candles = CandleStore(settings.CHART_BUFFER_BARS, settings.CHART_BUFFER_SERIES)
+        self._order_books = OrderBookStore(settings.ORDER_BOOK_HISTORY, settings.ORDER_BOOK_SERIES)
+
+        # 잔고 백그라운드 갱신 (주문 성공/체결통보)
+        self._background = set()
+        self._balance_refresh_pending = False
+        self._balance_generation = 0
+
+        # Single-flight: cache_key -> asyncio.Task
+        self._inflight = {}
+        self._stats = {
+            "upstream_calls": 0,
+            "coalesced_calls": 0,
+            "stale_served": 0,
+            "background_refreshes": 0,
+            "shared_hits": 0,
+            "shared_waits": 0,
+        }
+
+    async def _get_cached_data(self, cache_key, fetch_func, *args, **kwargs):
+        """
+        캐싱 로직 (비동기)
+
+        fetch_func는 coroutine function이어야 합니다.
+        같은 키의 동시 요청은 하나의 Task를 공유하며, 요청이 취소되어도
+        공유 Task는 취소되지 않습니다 (asyncio.shield).
+        """
+        with span("cache", key=cache_key):
+            cached_entry = self._cache.get(cache_key)
+
+            # 1. Return fresh from cache if within TTL
+            if cached_entry and self._cache.is_fresh(cached_entry):
+                annotate(result="hit")
+                return cached_entry.value
+            if cached_entry and not self._cache.is_servable(cached_entry):
+                # max_stale 한도 초과: stale 값으로 응답하지 않음
+                cached_entry = None
+
+            # 2. Join an in-flight fetch for the same key, or become the leader
+            task = self._inflight.get(cache_key)
+            is_leader = task is None
+            if is_leader:
+                self._stats["upstream_calls"] += 1
+                task = asyncio.ensure_future(
+                    self._fetch_and_store(cache_key, cached_entry, fetch_func, *args, **kwargs)
+                )
+                self._inflight[cache_key] = task
+                task.add_done_callback(lambda t: self._release_flight(cache_key, t))
+            else:
+                self._stats["coalesced_calls"] += 1
+
+            if cached_entry and (not is_leader or self._stale_while_revalidate):
+                annotate(result="stale")
+                self._stats["stale_served"] += 1
+                self._cache.record_stale(cached_entry)
+                if is_leader:
+                    self._stats["background_refreshes"] += 1
+                return cached_entry.value
+            annotate(result="miss" if is_leader else "joined")
+            return await asyncio.shield(task)
+
+    async def _refresh(self, cache_key, fetch_func, *args):
+        """
+        TTL과 관계없이 upstream에서 다시 조회하여 캐시 갱신
+
+        이미 진행 중인 조회는 변경 전 데이터일 수 있으므로 합류하지 않고 새로 조회하며,
+        이후 요청은 새 조회에 합류합니다.
+        """
+        if self._shared is not None:
+            # 다른 워커가 공유 캐시의 이전 값을 쓰지 않도록 먼저 삭제
+            try:
+                await self._shared.delete(SHARED_VALUE_PREFIX + cache_key)
+            except SharedCacheUnavailable:
+                pass
+        self._stats["upstream_calls"] += 1
+        task = asyncio.ensure_future(
+            self._fetch_and_store(cache_key, self._cache.peek(cache_key), fetch_func, *args)
+        )
+        self._inflight[cache_key] = task
+        task.add_done_callback(lambda t: self._release_flight(cache_key, t))
+        return await asyncio.shield(task)
+
+    def _release_flight(self, cache_key, task):
+        if self._inflight.get(cache_key) is task:
+            del self._inflight[cache_key]
+
+    async def _fetch_and_store(self, cache_key, cached_entry, fetch_func, *args, **kwargs):
+        """upstream 호출 후 캐시 갱신 (실패 시 stale 데이터로 대체)"""
+        try:
+            with span("upstream", fetch=getattr(fetch_func, "__name__", "")):
+                if self._shared is None:
+                    fresh_data, stored_at = await fetch_func(*args, **kwargs), None
+                else:
+                    fresh_data, stored_at = await self._fetch_shared(cache_key, fetch_func, *args, **kwargs)
+            if fresh_data is not None:
+                if isinstance(fresh_data, (dict, list)) and not fresh_data:
+                    if cached_entry:
+                        return cached_entry.value
+
+                return self._cache.set(cache_key, fresh_data, stored_at=stored_at).value
+        except Exception as e:
+            print(f"Cache refresh error for {cache_key}: {e}")
+            _REFRESH_ERRORS.inc(category=self._cache.category_of(cache_key))
+
+        # 3. Fallback to stale data
+        if cached_entry:
+            self._cache.record_stale(cached_entry)
+            return cached_entry.value
+        return None
+
+    async def _fetch_shared(self, cache_key, fetch_func, *args, **kwargs):
+        """
+        워커 간 single-flight 조회 -> (값, 저장 시각 또는 None)
+
+        1. 공유 캐시에 TTL 안의 값이 있으면 사용 (저장 시각을 유지하여 워커마다 TTL이 늘어나지 않음)
+        2. 없으면 잠금(SET NX)을 잡은 워커 하나만 upstream을 호출하고 결과를 공유 캐시에 저장
+        3. 잠금을 못 잡은 워커는 값이 올라올 때까지 기다리며, 잠금 만료 시간 안에 오지 않으면 직접 조회
+        공유 캐시에 연결할 수 없으면 바로 upstream을 호출합니다.
+        """
+        policy = self._cache.policy_for(cache_key)
+        value_key, lock_key = SHARED_VALUE_PREFIX + cache_key, SHARED_LOCK_PREFIX + cache_key
+        token = uuid.uuid4().hex.encode()
+        deadline = time.monotonic() + settings.SHARED_CACHE_LOCK_TIMEOUT
+        try:
+            while True:
+                raw = await self._shared.get(value_key)
+                if raw is not None:
+                    stored = decode_json(raw)
+                    if time.time() - stored["t"] < policy.ttl:
+                        self._stats["shared_hits"] += 1
+                        return stored["v"], stored["t"]
+                if await self._shared.add(lock_key, token, settings.SHARED_CACHE_LOCK_TIMEOUT):
+                    break
+                if time.monotonic() >= deadline:
+                    # 잠금을 잡은 워커가 응답하지 않음: 직접 조회 (잠금 없이)
+                    token = None
+                    break
+                self._stats["shared_waits"] += 1
+                await asyncio.sleep(SHARED_POLL_INTERVAL)
+        except SharedCacheUnavailable:
+            return await fetch_func(*args, **kwargs), None
+
+        try:
+            data = await fetch_func(*args, **kwargs)
+            stored_at = time.time()
+            if isinstance(data, (dict, list)) and data:
+                await self._shared.set(
+                    value_key, encode_json({"v": data, "t": stored_at}), max(policy.ttl + policy.max_stale, 1)
+                )
+            return data, stored_at
+        except SharedCacheUnavailable:
+            return data, stored_at
+        finally:
+            if token is not None:
+                try:
+                    # 잠금이 만료되어 다른 워커가 잡았으면 지우지 않음 (compare-and-delete)
+                    await self._shared.delete_if_equals(lock_key, token)
+                except SharedCacheUnavailable:
+                    pass
+
+    def get_cache_stats(self) -> dict:
+        """캐시/single-flight 통계 (절약된 upstream 호출 수, 카테고리별 캐시 상태 포함)"""
+        stats = dict(self._stats)
+        stats["inflight"] = len(self._inflight)
+        stats["cache"] = self._cache.stats()
+        stats["order_books"] = self._order_books.stats()
+        if self._shared is not None:
+            stats["shared_cache"] = self._shared.stats()
+        return stats
+
+    def collect_metrics(self):
+        """/metrics 출력 시점의 캐시 카테고리별 통계와 진행 중인 upstream 조회 수"""
+        categories = self._cache.stats()["categories"]
+        for name, type_, field, help in (
+            ("cache_hits_total", "counter", "hits", "Cache lookups answered within TTL"),
+            ("cache_misses_total", "counter", "misses", "Cache lookups that were absent or past TTL"),
+            ("cache_stale_served_total", "counter", "stale_served", "Responses served from entries past TTL"),
+            ("cache_evictions_total", "counter", "evictions", "Entries evicted by the LRU size limits"),
+            ("cache_entries", "gauge", "entries", "Entries currently cached"),
+            ("cache_bytes", "gauge", "bytes", "Estimated bytes currently cached"),
+        ):
+            yield name, type_, help, [({"category": c}, s[field]) for c, s in sorted(categories.items())]
+        yield "cache_inflight_fetches", "gauge", "Single-flight upstream fetches in progress", [({}, len(self._inflight))]
+
+    def get_cached_body(self, cache_key: str, value) -> Optional[Tuple[bytes, str]]:
+        """
+        value가 현재 캐시 엔트리의 값이면 (인코딩된 JSON 본문, ETag), 아니면 None
+
+        응답 직후 백그라운드 갱신으로 엔트리가 바뀌었을 수 있으므로 객체 동일성으로 확인합니다.
+        본문은 엔트리마다 한 번만 인코딩됩니다.
+        """
+        entry = self._cache.peek(cache_key)
+        if entry is None or entry.value is not value:
+            return None
+        return self._cache.encoded(cache_key, entry), self._cache.etag(entry)
+
+    async def clear_cache(self, category: Optional[str] = None) -> int:
+        """
+        캐시 비우기 (category 지정 시 해당 카테고리만), 지운 엔트리 수 반환
+
+        공유 캐시를 쓰면 공유 값도 지웁니다 (남겨두면 다음 조회가 같은 값을 다시 읽어옴).
+        다른 워커의 메모리 캐시는 각자의 TTL이 지나면 갱신됩니다.
+        """
+        cleared = self._cache.clear(category)
+        if self._shared is None or (category is not None and not re.fullmatch(r"\w+", category)):
+            return cleared
+        try:
+            if category is None:
+                cleared += await self._shared.delete_matching(SHARED_VALUE_PREFIX + "*")
+            else:
+                cleared += await self._shared.delete_matching(f"{SHARED_VALUE_PREFIX}{category}_*")
+                cleared += await self._shared.delete_matching(SHARED_VALUE_PREFIX + category)
+        except SharedCacheUnavailable as e:
+            print(f"Shared cache clear failed: {e}")
+        return cleared
+
+    async def get_stock_detail(self, code: str) -> Stock:
+        """종목 상세 정보 조회"""
+        return Stock(**await self.get_stock_detail_data(code))
+
+    async def get_stock_detail_data(self, code: str) -> Dict:
+        """
+        종목 상세 정보 조회 (캐시된 dict 그대로 반환, Stock 모델을 만들지 않음)
+
+        API 응답처럼 바로 직렬화하는 경로에서 사용합니다. 반환값은 읽기 전용입니다.
+        """
+        async def fetch_stock_data(c):
+            stock = await self._repository.get_stock_price(c)
+            if stock:
+                return stock.model_dump()
+            return None
+
+        data = await self._get_cached_data(f"stock_detail_{code}", fetch_stock_data, code)
+        if not data:
+            raise Exception("Stock not found")
+        return data
+
+    async def get_stock_details(self, codes: List[str]) -> Dict[str, Dict]:
+        """
+        여러 종목 현재가 일괄 조회
+
+        - 캐시에 fresh한 값이 있는 종목은 메모리에서 바로 반환
+        - 같은 종목을 이미 조회 중이면 그 결과를 공유 (single-flight)
+        - 나머지는 Repository 일괄 조회 한 번으로 동시에 가져옴 (호출 수는 rate limiter가 조절)
+
+        Returns:
+            종목코드 -> {"status": "ok" | "not_found" | "error", "data": Stock dict 또는 None, "source": ...}
+        """
+        codes = list(dict.fromkeys(codes))
+        results: Dict[str, Dict] = {}
+        pending: Dict[str, asyncio.Task] = {}
+        misses, stale_entries = [], {}
+
+        for code in codes:
+            cache_key = f"stock_detail_{code}"
+            cached_entry = self._cache.get(cache_key)
+            if cached_entry and self._cache.is_fresh(cached_entry):
+                results[code] = {"status": "ok", "data": cached_entry.value, "source": "cache"}
+                continue
+            if cached_entry and self._cache.is_servable(cached_entry):
+                stale_entries[code] = cached_entry
+            task = self._inflight.get(cache_key)
+            if task is not None:
+                self._stats["coalesced_calls"] += 1
+                pending[code] = task
+            else:
+                misses.append(code)
+
+        if misses:
+            self._stats["upstream_calls"] += len(misses)
+            batch = asyncio.ensure_future(self._repository.get_stock_prices(misses))
+            for code in misses:
+                cache_key = f"stock_detail_{code}"
+                task = asyncio.ensure_future(
+                    self._store_batch_item(batch, cache_key, code, stale_entries.get(code))
+                )
+                self._inflight[cache_key] = task
+                task.add_done_callback(lambda t, key=cache_key: self._release_flight(key, t))
+                pending[code] = task
+
+        if pending:
+            values = await asyncio.gather(
+                *(asyncio.shield(task) for task in pending.values()), return_exceptions=True
+            )
+            for code, value in zip(pending, values):
+                if isinstance(value, Exception):
+                    results[code] = {"status": "error", "data": None, "error": str(value)}
+                elif value is None:
+                    results[code] = {"status": "not_found", "data": None}
+                else:
+                    source = "stale" if code in stale_entries and value is stale_entries[code].value else "upstream"
+                    results[code] = {"status": "ok", "data": value, "source": source}
+
+        return {code: results[code] for code in codes}
+
+    async def _store_batch_item(self, batch, cache_key, code, cached_entry):
+        """일괄 조회 결과에서 한 종목을 꺼내 캐시 갱신 (실패 시 stale 데이터로 대체)"""
+        try:
+            stocks = await batch
+        except Exception as e:
+            print(f"Batch price error: {e}")
+            stocks = {}
+        if code in stocks:
+            stock = stocks[code]
+            if stock is None:
+                return None
+            return self._cache.set(cache_key, stock.model_dump()).value
+        if cached_entry:
+            return cached_entry.value
+        raise LookupError(f"Price lookup failed for {code}")
+
+    async def get_stock_snapshot(self, code: str, exclude: Iterable[str] = (),
+                                 chart_since: Optional[int] = None, hoga_since: Optional[int] = None) -> Dict:
+        """
+        상세 화면용 종합 조회 (현재가, 차트, 호가, 잔고를 동시에 조회)
+
+        Args:
+            code: 종목코드
+            exclude: 제외할 항목 (SNAPSHOT_PARTS 중 클라이언트가 이미 가진 것)
+            chart_since: 차트는 이 시각 이후 봉만 포함 (get_stock_chart의 since)
+            hoga_since: 있으면 호가는 이 seq 이후 변경분으로 응답 (get_order_book_delta의 since)
+
+        Returns:
+            {"code": ..., "detail": ..., "chart": ..., "hoga": ..., "balance": ...}
+            실패한 항목은 None이며 "errors"에 항목별 오류 메시지를 담습니다.
+        """
+        fetchers = {
+            "detail": lambda: self.get_stock_detail_data(code),
+            "chart": lambda: self.get_stock_chart(code, since=chart_since),
+            "hoga": (lambda: self.get_order_book(code)) if hoga_since is None
+            else (lambda: self.get_order_book_delta(code, since=hoga_since)),
+            "balance": self.get_balance,
+        }
+        excluded = set(exclude)
+        parts = [part for part in SNAPSHOT_PARTS if part not in excluded]
+        values = await asyncio.gather(*(fetchers[part]() for part in parts), return_exceptions=True)
+
+        snapshot = {"code": code}
+        errors = {}
+        for part, value in zip(parts, values):
+            if isinstance(value, Exception):
+                snapshot[part] = None
+                errors[part] = str(value)
+            else:
+                snapshot[part] = value
+        if errors:
+            snapshot["errors"] = errors
+        return snapshot
+
+    def encode_snapshot(self, code: str, snapshot: Dict) -> bytes:
+        """
+        get_stock_snapshot 결과의 JSON 본문
+
+        항목 값이 캐시 엔트리 그대로면 엔트리의 인코딩된 본문을 이어 붙이고,
+        since로 잘라낸 항목, 실패한 항목, errors만 여기서 인코딩합니다.
+        """
+        keys = {
+            "detail": f"stock_detail_{code}",
+            "chart": f"stock_chart_{code}",
+            "hoga": f"order_book_{code}",
+            "balance": self._balance_key(),
+        }
+        parts = []
+        for name, value in snapshot.items():
+            cached = self.get_cached_body(keys[name], value) if name in keys else None
+            parts.append(encode_json(name) + b":" + (cached[0] if cached else encode_json(value)))
+        return b"{" + b",".join(parts) + b"}"
+
+    async def get_order_book(self, code: str):
+        """호가 정보 조회"""
+        return await self._get_cached_data(f"order_book_{code}", self._repository.get_order_book, code)
+
+    async def get_order_book_delta(self, code: str, since: Optional[int] = None) -> Dict:
+        """
+        호가 변경분 조회
+
+        Args:
+            since: 클라이언트가 마지막으로 받은 seq (없거나 보관 범위 밖이면 전체 호가)
+
+        Returns:
+            {"seq", "changes": [[slot, price, volume], ...]} 또는 {"seq", "full": True, "asks", "bids"}
+            (형식은 app/core/order_book.py 참고)
+            호가를 받지 못하면 보관 중인 스냅샷 기준으로 응답하고, 그것도 없으면 LookupError
+        """
+        book = await self.get_order_book(code)
+        if book:
+            self._order_books.update(code, book)
+        delta = self._order_books.delta(code, since)
+        if delta is None:
+            raise LookupError(f"Order book unavailable for {code}")
+        return delta
+
+    async def get_stock_chart(self, code: str, since: Optional[int] = None):
+        """
+        차트 데이터 조회
+
+        Args:
+            since: 이 시각(YYYYMMDDHHMMSS) 이후 봉만 반환 (같은 시각 포함, 없으면 전체)
+        """
+        cache_key = f"stock_chart_{code}"
+        rows = await self._get_cached_data(
+            cache_key, self._fetch_chart, cache_key, self._repository.get_stock_chart, code
+        )
+        return self._chart_since(rows, since)
+
+    async def _fetch_chart(self, cache_key, fetch_func, *args):
+        """upstream 차트를 봉 buffer에 병합하고 병합된 전체 봉 목록 반환"""
+        rows = await fetch_func(*args)
+        if not rows:
+            return rows
+        merged = self._candles.merge(cache_key, rows)
+        return rows if merged is None else merged
+
+    @staticmethod
+    def _chart_since(rows, since: Optional[int]):
+        if since is None or not rows:
+            return rows
+        return CandleStore.since(rows, since)
+
+    async def get_daily_chart(self, code: str, start: Optional[int] = None, end: Optional[int] = None):
+        """
+        일봉 조회
+
+        Args:
+            start: 시작일 YYYYMMDD (기본값: end로부터 1년 전)
+            end: 종료일 YYYYMMDD (기본값: 오늘)
+        """
+        start, end = self.daily_chart_range(start, end)
+        return await self._get_cached_data(
+            self.daily_chart_key(code, start, end), self._repository.get_daily_chart, code, start, end
+        )
+
+    @staticmethod
+    def daily_chart_range(start: Optional[int] = None, end: Optional[int] = None) -> Tuple[int, int]:
+        """기본값을 채운 일봉 조회 기간 (start, end), start가 end보다 늦으면 ValueError"""
+        today = datetime.now()
+        end = end or int(today.strftime("%Y%m%d"))
+        start = start or int((today - timedelta(days=365)).strftime("%Y%m%d"))
+        if start > end:
+            raise ValueError(f"start ({start}) is after end ({end})")
+        return start, end
+
+    @classmethod
+    def daily_chart_key(cls, code: str, start: Optional[int] = None, end: Optional[int] = None) -> str:
+        """일봉 캐시 키 (엔드포인트가 ETag/인코딩된 본문을 찾을 때도 같은 키 사용)"""
+        start, end = cls.daily_chart_range(start, end)
+        return f"daily_chart_{code}_{start}_{end}"
+
+    def _balance_key(self) -> str:
+        key = f"balance_{self._repository.account_id()}"
+        return key if self._shared is None else f"{key}_g{self._balance_generation}"
+
+    async def get_balance(self):
+        """
+        계좌 잔고 조회 (계좌별 캐시, 주문 성공/체결통보 시 무효화)
+
+        공유 캐시를 쓰면 먼저 계좌의 세대 번호를 읽어서 캐시 키에 붙입니다. 다른 워커가 주문 후
+        세대를 올리면 이 워커의 이전 세대 엔트리는 더 이상 조회되지 않습니다 (조회마다 공유 캐시 GET 1회).
+        """
+        if self._shared is not None:
+            try:
+                raw = await self._shared.get(BALANCE_GENERATION_PREFIX + self._repository.account_id())
+                self._balance_generation = int(raw) if raw else 0
+            except SharedCacheUnavailable:
+                pass
+        return await self._get_cached_data(self._balance_key(), self._repository.get_balance)
+
+    def invalidate_balance(self, delays: Iterable[float] = (0.0,)):
+        """
+        잔고 캐시를 지우고 delays(초) 시점마다 백그라운드에서 다시 조회 (write-through)
+
+        이미 대기 중인 갱신이 있으면 합칩니다 (체결통보가 연달아 와도 잔고 조회는 한 번).
+        공유 캐시를 쓰면 갱신할 때마다 세대 번호를 올리고 이전 세대의 공유 값을 지워서,
+        다른 워커도 이전 잔고를 쓰지 않게 합니다.
+        이벤트 루프 안에서 호출해야 합니다.
+        """
+        self._cache.delete(self._balance_key())
+        if self._balance_refresh_pending:
+            return
+        self._balance_refresh_pending = True
+        task = asyncio.get_running_loop().create_task(self._refresh_balance(tuple(delays)))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _refresh_balance(self, delays: Tuple[float, ...]):
+        for i, delay in enumerate(delays):
+            await asyncio.sleep(delay)
+            if i == 0:
+                self._balance_refresh_pending = False
+            if self._shared is not None:
+                await self._next_balance_generation()
+            await self._refresh(self._balance_key(), self._repository.get_balance)
+
+    async def _next_balance_generation(self):
+        previous = self._balance_key()
+        try:
+            self._balance_generation = await self._shared.incr(
+                BALANCE_GENERATION_PREFIX + self._repository.account_id(), 1, BALANCE_GENERATION_TTL
+            )
+            await self._shared.delete(SHARED_VALUE_PREFIX + previous)
+        except SharedCacheUnavailable:
+            pass
+
+    def on_fill(self):
+        """체결통보 수신 (실시간 피드 리스너)"""
+        self.invalidate_balance()
+
+    async def execute_order(self, code: str, qty: int, price: float, order_type: str, order_dvsn: str = "00"):
+        """주문 실행"""
+        order = Order(
+            stock_code=code,
+            quantity=qty,
+            price=price,
+            order_type=order_type,
+            order_dvsn=order_dvsn
+        )
+        try:
+            result = await self._repository.place_order(order)
+        except OrderOutcomeUnknown:
+            # 접수되었을 수 있으므로 잔고는 갱신
+            self.invalidate_balance()
+            raise
+        if not (isinstance(result, dict) and result.get("error")):
+            # 주문 접수 즉시 잔고(주문가능금액) 갱신, 체결 반영을 위해 한 번 더 갱신
+            delay = settings.BALANCE_REFRESH_AFTER_ORDER
+            self.invalidate_balance((0.0, delay) if delay > 0 else (0.0,))
+        return result
+
+    async def get_today_orders(self) -> Optional[List[Dict]]:
+        """당일 주문 내역 (캐시하지 않음, 주문 파이프라인의 결과 확인용)"""
+        return await self._repository.get_today_orders()
+
+    # 종목명 검색은 KIS REST API에 없으므로 (종목 마스터 적재 전) kis_client를 스레드에서 실행
+    @staticmethod
+    async def _call_kis_client(priority: Priority, func, *args):
+        """rate limiter 토큰을 이벤트 루프에서 받은 뒤 kis_client 함수를 스레드에서 실행"""
+        with span("rate_limit.wait"):
+            await kis_rate_limiter.acquire_async(priority, timeout=wait_timeout(priority))
+        with observe_upstream(func.__name__), span(f"kis_client.{func.__name__}"):
+            return await asyncio.to_thread(func, *args)
+
+    async def get_market_indices(self):
+        """시장 지수 조회 (코스피, 코스닥, 코스피200)"""
+        return await self._get_cached_data("market_indices", self._fetch_indices)
+
+    async def _fetch_indices(self) -> Dict:
+        names = list(MARKET_INDEX_CODES)
+        prices = await asyncio.gather(
+            *(self._repository.get_index_price(MARKET_INDEX_CODES[name]) for name in names)
+        )
+        return dict(zip(names, prices))
+
+    async def get_market_top_stocks(self, market: str = "J"):
+        """거래대금 상위 종목"""
+        return await self._get_cached_data(
+            f"top_stocks_{market}", self._repository.get_trade_amount_ranking, market
+        )
+
+    async def get_index_chart(self, code: str, since: Optional[int] = None):
+        """지수 차트 (since는 get_stock_chart와 동일)"""
+        cache_key = f"index_chart_{code}"
+        rows = await self._get_cached_data(
+            cache_key, self._fetch_chart, cache_key, self._repository.get_index_chart, code
+        )
+        return self._chart_since(rows, since)
+
+    async def get_transaction_rankings(self):
+        """거래 순위 (거래대금순)"""
+        return await self._get_cached_data("transaction_rankings", self._repository.get_trade_amount_ranking)
+
+    async def find_stocks(self, query: str):
+        """종목 검색 (종목 마스터 인덱스가 적재되어 있으면 upstream 호출 없음)"""
+        from app.infrastructure.stock_master import stock_master
+        if stock_master.is_loaded:
+            return stock_master.search(query)
+        from app.infrastructure.kis_client import kis_client
+        return await self._call_kis_client(Priority.RANKING, kis_client.search_stock, query)
+
+
+# 싱글톤 인스턴스 생성 (Spring의 @Bean과 유사)
+# - 차트 이력 저장소가 켜져 있으면 분봉/일봉은 로컬 SQLite를 먼저 사용
+# - 실시간 피드가 켜져 있으면 현재가/호가는 WebSocket 최신 상태를 우선 사용
+# - SHARED_CACHE_URL이 있으면 워커 간 공유 캐시와 공유 rate limit을 함께 사용
+from app.infrastructure.persistence.async_kis_stock_repository import async_kis_stock_repository
+_repository: AsyncStockRepository = async_kis_stock_repository
+if settings.CANDLE_HISTORY_ENABLED:
+    from app.infrastructure.persistence.candle_history_store import CandleHistoryStore
+    from app.infrastructure.persistence.history_stock_repository import HistoryStockRepository
+    _repository = HistoryStockRepository(_repository, CandleHistoryStore(settings.CANDLE_HISTORY_PATH))
+if settings.KIS_REALTIME_ENABLED:
+    from app.infrastructure.kis_realtime import kis_realtime_feed
+    from app.infrastructure.persistence.realtime_stock_repository import RealtimeStockRepository
+    _repository = RealtimeStockRepository(_repository, kis_realtime_feed)
+from app.infrastructure.shared_cache import shared_cache
+async_trading_service = AsyncTradingService(stock_repository=_repository, shared_cache=shared_cache)
+if shared_cache is not None:
+    # 워커 수와 관계없이 KIS 호출 합계를 초당 한도 이하로
+    kis_rate_limiter.use_shared_window(SharedRateWindow(shared_cache, settings.KIS_RATE_LIMIT_PER_SEC))
+metrics.register_collector(async_trading_service.collect_metrics)
+if settings.KIS_REALTIME_ENABLED:
+    kis_realtime_feed.add_fill_listener(async_trading_service.on_fill)
@@ -0,0 +1,421 @@
+"""
+Order Pipeline (Application Layer)
+
+주문 요청을 바로 KIS로 보내지 않고 전용 큐에 넣은 뒤 즉시 주문번호(order_id)를 돌려줍니다.
+전용 worker Task 하나가 접수 순서대로 주문을 전송하고, 클라이언트는 상태 조회 API로 결과를 확인합니다.
+Spring Boot 비유: @Async 주문 처리기 + 멱등성 키(Idempotency-Key) 필터 + Micrometer Timer
+
+- 상태: queued(접수) -> sent(KIS 전송 중) -> acked(체결 접수) | rejected(거부/오류) | unknown -> unresolved
+- unknown: 요청을 보낸 뒤 응답을 받지 못한 주문 (timeout, 연결 끊김). KIS에 접수되었을 수 있으므로
+  거부로 알리지 않고, 당일 주문 내역과 대조하여 찾으면 acked로 바꿉니다. 주문 조회도 실패하면 unknown으로 남습니다.
+- unresolved: 마지막 대조까지 주문 내역에서 찾지 못한 unknown 주문 (완료 상태). 주문 내역 반영이 늦어
+  이미 접수되었을 수 있으므로 rejected로 알리지 않습니다 (사용자가 주문 내역을 확인한 뒤 다시 주문해야 함).
+- 같은 Idempotency-Key로 다시 요청하면 새 주문을 만들지 않고 기존 주문 상태를 돌려줍니다
+  (프론트엔드 재시도/중복 클릭으로 인한 이중 주문 방지). 내용이 다르면 IdempotencyConflict.
+- 공유 캐시(SHARED_CACHE_URL)가 있으면 멱등성 키(SET NX로 선점)와 주문 상태를 공유 캐시에 저장하여
+  다른 워커로 간 재시도/상태 조회도 같은 주문을 봅니다. 공유 캐시 없이 여러 워커로 실행하면
+  lock 파일을 먼저 잡은 워커 하나만 주문을 받고 나머지는 OrderStoreUnavailable(503)을 반환합니다.
+- KIS 호출은 rate limiter의 Priority.ORDER(최우선)로 토큰을 받으므로 시세 폴링에 밀리지 않습니다.
+- 단계별 지연 시간을 히스토그램으로 기록합니다: queue(접수->전송), ack(전송->응답), total(접수->응답)
+"""
+from collections import OrderedDict
+from typing import Dict, List, Optional
+import asyncio
+import time
+import uuid
+
+from app.core.config import settings
+from app.core.encoding import decode_json, encode_json
+from app.core.histogram import LatencyHistogram
+from app.core.shared_cache import SharedCache, SharedCacheUnavailable
+from app.domain.models import Order
+from app.domain.repositories.async_stock_repository import OrderOutcomeUnknown
+
+# 주문 내역 대조 시 전송 시각보다 이만큼(초) 이른 주문까지 후보로 봄 (서버와 KIS 시계 차이)
+RECONCILE_CLOCK_SKEW = 60.0
+
+# 공유 캐시 키 접두어 (멱등성 키 -> 주문, 주문 상태)와 보관 시간(초), 다른 워커 주문의 상태 조회 간격(초)
+ORDER_KEY_PREFIX = settings.SHARED_CACHE_KEY_PREFIX + "order_key:"
+ORDER_STATE_PREFIX = settings.SHARED_CACHE_KEY_PREFIX + "order:"
+ORDER_SHARED_TTL = 86400
+ORDER_SHARED_POLL_INTERVAL = 0.2
+
+
+class OrderState:
+    QUEUED = "queued"
+    SENT = "sent"
+    ACKED = "acked"
+    REJECTED = "rejected"
+    UNKNOWN = "unknown"
+    UNRESOLVED = "unresolved"
+
+
+FINAL_STATES = (OrderState.ACKED, OrderState.REJECTED, OrderState.UNRESOLVED)
+
+
+class IdempotencyConflict(Exception):
+    """같은 Idempotency-Key로 내용이 다른 주문을 요청함"""
+
+
+class OrderQueueFull(Exception):
+    """주문 큐가 가득 참"""
+
+
+class OrderStoreUnavailable(Exception):
+    """멱등성 키/주문 상태를 저장할 수 없음 (공유 캐시 연결 실패, 공유 캐시 없이 다른 워커가 주문을 받는 중)"""
+
+
+class OrderTicket:
+    """주문 하나의 상태와 단계별 시각"""
+
+    __slots__ = ("order_id", "order", "idempotency_key", "state", "result", "error",
+                 "created_at", "queued_at", "sent_at", "finished_at", "done")
+
+    def __init__(self, order: Order, idempotency_key: Optional[str]):
+        self.order_id = uuid.uuid4().hex
+        self.order = order
+        self.idempotency_key = idempotency_key
+        self.state = OrderState.QUEUED
+        self.result: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.queued_at = time.monotonic()
+        self.sent_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.done = asyncio.Event()
+
+    def to_dict(self) -> Dict:
+        latency = {}
+        if self.sent_at is not None:
+            latency["queue"] = round((self.sent_at - self.queued_at) * 1000, 3)
+        if self.finished_at is not None:
+            latency["ack"] = round((self.finished_at - self.sent_at) * 1000, 3)
+            latency["total"] = round((self.finished_at - self.queued_at) * 1000, 3)
+        return {
+            "order_id": self.order_id,
+            "state": self.state,
+            "order": self.order.model_dump(),
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "latency_ms": latency,
+        }
+
+
+class OrderPipeline:
+    """주문 큐 + 전용 worker + 주문 상태 저장소"""
+
+    STAGES = ("queue", "ack", "total")
+
+    def __init__(
+        self,
+        trading_service,
+        queue_size: Optional[int] = None,
+        max_tracked: Optional[int] = None,
+        shared_cache: Optional[SharedCache] = None,
+    ):
+        """
+        Args:
+            trading_service: execute_order를 제공하는 서비스 (AsyncTradingService)
+            queue_size: 대기 가능한 최대 주문 수
+            max_tracked: 상태를 보관하는 최대 주문 수 (오래된 완료 주문부터 삭제)
+            shared_cache: 워커 간 멱등성 키/주문 상태 저장소 (None이면 프로세스 메모리에만 보관)
+        """
+        self._service = trading_service
+        self._shared = shared_cache
+        self._process_lock = None
+        self._unavailable: Optional[str] = None  # 주문을 받지 않는 이유 (다른 워커가 lock을 잡음)
+        self._queue_size = queue_size or settings.ORDER_QUEUE_SIZE
+        self._max_tracked = max_tracked or settings.ORDER_TRACKING_MAX
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._tickets: "OrderedDict[str, OrderTicket]" = OrderedDict()
+        self._keys: Dict[str, str] = {}  # idempotency key -> order_id
+        self._histograms = {stage: LatencyHistogram() for stage in self.STAGES}
+        self._stats = {"submitted": 0, "duplicates": 0, "acked": 0, "rejected": 0, "unknown": 0, "reconciled": 0,
+                       "unresolved": 0}
+        self._reconciling = set()
+        # 대조로 찾은 KIS 주문번호 -> 날짜 (같은 주문을 두 번 대응시키지 않음, 당일 주문 내역에 있는 것만 유지)
+        self._claimed: Dict[str, str] = {}
+
+    # ------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------
+    def start(self, lock_path: Optional[str] = None):
+        """
+        공유 캐시가 없으면 lock 파일로 주문을 받는 프로세스를 하나로 제한 (lifespan 시작 시 호출)
+
+        멱등성 키와 주문 상태가 프로세스마다 따로 있으면 다른 워커로 간 재시도가 주문을 한 번 더 내므로,
+        lock을 얻지 못한 워커는 주문 요청을 거부합니다.
+        """
+        if self._shared is not None or self._process_lock is not None:
+            return
+        from app.infrastructure.kis_token_manager import FileLock
+        lock = FileLock(lock_path or settings.ORDER_PIPELINE_LOCK_PATH)
+        if lock.acquire(blocking=False):
+            self._process_lock = lock
+        else:
+            self._unavailable = "orders are accepted by another worker; multiple workers require SHARED_CACHE_URL"
+            print(f"Order pipeline disabled in this worker: {self._unavailable}")
+
+    async def submit(self, order: Order, idempotency_key: Optional[str] = None) -> Dict:
+        """주문 접수 (전송은 worker가 함), 주문 상태 반환"""
+        if self._unavailable:
+            raise OrderStoreUnavailable(self._unavailable)
+        if idempotency_key:
+            existing = self._tickets.get(self._keys.get(idempotency_key, ""))
+            if existing is not None:
+                return self._duplicate(existing.order, order, idempotency_key, existing.to_dict())
+
+        self._ensure_worker()
+        if self._queue.full():
+            raise OrderQueueFull("order queue is full")
+        ticket = OrderTicket(order, idempotency_key)
+        if idempotency_key and self._shared is not None:
+            claimed = await self._claim(ticket)
+            if claimed is not None:
+                return claimed
+        # worker가 상태를 갱신하기 전에 queued 상태를 먼저 저장 (저장 순서가 뒤바뀌지 않도록)
+        await self._publish(ticket)
+        try:
+            self._queue.put_nowait(ticket)
+        except asyncio.QueueFull:
+            await self._release(ticket)
+            raise OrderQueueFull("order queue is full")
+        self._tickets[ticket.order_id] = ticket
+        if idempotency_key:
+            self._keys[idempotency_key] = ticket.order_id
+        self._stats["submitted"] += 1
+        self._evict()
+        return ticket.to_dict()
+
+    async def status(self, order_id: str) -> Optional[Dict]:
+        """주문 상태 (이 워커에 없으면 공유 캐시에서 조회)"""
+        ticket = self._tickets.get(order_id)
+        if ticket is not None:
+            return ticket.to_dict()
+        if self._shared is None:
+            return None
+        try:
+            raw = await self._shared.get(ORDER_STATE_PREFIX + order_id)
+        except SharedCacheUnavailable as e:
+            raise OrderStoreUnavailable(f"order store unavailable: {e}") from e
+        return decode_json(raw) if raw is not None else None
+
+    async def wait(self, order_id: str, timeout: float) -> Optional[Dict]:
+        """주문이 완료(acked/rejected)되거나 timeout초가 지날 때까지 대기 후 상태 반환 (long polling)"""
+        ticket = self._tickets.get(order_id)
+        if ticket is None:
+            return await self._wait_shared(order_id, timeout)
+        if ticket.state not in FINAL_STATES and timeout > 0:
+            try:
+                await asyncio.wait_for(ticket.done.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return ticket.to_dict()
+
+    def stats(self) -> Dict:
+        states: Dict[str, int] = {}
+        for ticket in self._tickets.values():
+            states[ticket.state] = states.get(ticket.state, 0) + 1
+        return {
+            **self._stats,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "states": states,
+            "latency_ms": {stage: h.snapshot() for stage, h in self._histograms.items()},
+        }
+
+    async def stop(self):
+        if self._process_lock is not None:
+            self._process_lock.release()
+            self._process_lock = None
+        for task in list(self._reconciling):
+            task.cancel()
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    # ------------------------------------------------------------------
+    # Shared store
+    # ------------------------------------------------------------------
+    def _duplicate(self, existing: Order, order: Order, idempotency_key: str, status: Dict) -> Dict:
+        if existing != order:
+            raise IdempotencyConflict(f"Idempotency-Key {idempotency_key} was used for a different order")
+        self._stats["duplicates"] += 1
+        return status
+
+    @staticmethod
+    def _key_record(ticket: OrderTicket) -> bytes:
+        return encode_json({"order_id": ticket.order_id, "order": ticket.order.model_dump()})
+
+    async def _claim(self, ticket: OrderTicket) -> Optional[Dict]:
+        """
+        멱등성 키를 공유 캐시에 선점 (SET NX)
+
+        Returns:
+            None이면 이 워커가 키를 얻음 (주문 진행), 아니면 먼저 접수된 주문의 상태
+        """
+        key = ORDER_KEY_PREFIX + ticket.idempotency_key
+        try:
+            for _ in range(3):
+                if await self._shared.add(key, self._key_record(ticket), ORDER_SHARED_TTL):
+                    return None
+                raw = await self._shared.get(key)
+                if raw is not None:
+                    break  # 먼저 선점한 주문이 있음 (None이면 그 사이 키가 해제되어 다시 선점 시도)
+            else:
+                raise OrderStoreUnavailable(f"could not claim Idempotency-Key {ticket.idempotency_key}")
+        except SharedCacheUnavailable as e:
+            raise OrderStoreUnavailable(f"order store unavailable: {e}") from e
+        existing = decode_json(raw)
+        status = await self.status(existing["order_id"]) or {
+            "order_id": existing["order_id"], "state": OrderState.QUEUED, "order": existing["order"],
+            "result": None, "error": None, "created_at": None, "latency_ms": {},
+        }
+        return self._duplicate(Order(**existing["order"]), ticket.order, ticket.idempotency_key, status)
+
+    async def _release(self, ticket: OrderTicket):
+        """접수하지 못한 주문의 멱등성 키와 상태 삭제"""
+        if self._shared is None:
+            return
+        try:
+            if ticket.idempotency_key:
+                await self._shared.delete_if_equals(ORDER_KEY_PREFIX + ticket.idempotency_key, self._key_record(ticket))
+            await self._shared.delete(ORDER_STATE_PREFIX + ticket.order_id)
+        except SharedCacheUnavailable as e:
+            print(f"Order store release error for {ticket.order_id}: {e}")
+
+    async def _publish(self, ticket: OrderTicket):
+        """주문 상태를 공유 캐시에 저장 (다른 워커의 상태 조회용)"""
+        if self._shared is None:
+            return
+        try:
+            await self._shared.set(ORDER_STATE_PREFIX + ticket.order_id, encode_json(ticket.to_dict()), ORDER_SHARED_TTL)
+        except SharedCacheUnavailable as e:
+            print(f"Order store publish error for {ticket.order_id}: {e}")
+
+    async def _wait_shared(self, order_id: str, timeout: float) -> Optional[Dict]:
+        """다른 워커가 접수한 주문: 완료되거나 timeout초가 지날 때까지 공유 캐시의 상태를 주기적으로 조회"""
+        deadline = time.monotonic() + timeout
+        status = await self.status(order_id)
+        while status is not None and status["state"] not in FINAL_STATES:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(min(ORDER_SHARED_POLL_INTERVAL, remaining))
+            status = await self.status(order_id)
+        return status
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue(maxsize=self._queue_size)
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        while True:
+            ticket = await self._queue.get()
+            await self._execute(ticket)
+
+    async def _execute(self, ticket: OrderTicket):
+        order = ticket.order
+        ticket.state = OrderState.SENT
+        ticket.sent_at = time.monotonic()
+        self._histograms["queue"].observe(ticket.sent_at - ticket.queued_at)
+        await self._publish(ticket)
+        try:
+            result = await self._service.execute_order(
+                order.stock_code, order.quantity, order.price, order.order_type, order.order_dvsn
+            )
+        except OrderOutcomeUnknown as e:
+            ticket.state, ticket.error = OrderState.UNKNOWN, str(e)
+            self._stats["unknown"] += 1
+            await self._publish(ticket)
+            task = asyncio.get_running_loop().create_task(self._reconcile(ticket))
+            self._reconciling.add(task)
+            task.add_done_callback(self._reconciling.discard)
+            return
+        except Exception as e:
+            result = {"error": str(e)}
+
+        if isinstance(result, dict) and result.get("error"):
+            await self._finish(ticket, OrderState.REJECTED, error=str(result["error"]))
+        else:
+            await self._finish(ticket, OrderState.ACKED, result=result)
+
+    async def _finish(self, ticket: OrderTicket, state: str, result: Optional[Dict] = None, error: Optional[str] = None):
+        ticket.finished_at = time.monotonic()
+        self._histograms["ack"].observe(ticket.finished_at - ticket.sent_at)
+        self._histograms["total"].observe(ticket.finished_at - ticket.queued_at)
+        ticket.state, ticket.result, ticket.error = state, result, error
+        self._stats[state] += 1
+        ticket.done.set()
+        await self._publish(ticket)
+
+    async def _reconcile(self, ticket: OrderTicket):
+        """
+        unknown 주문을 당일 주문 내역과 대조 (settings.ORDER_RECONCILE_DELAYS 시점마다)
+
+        같은 종목/매수·매도/수량(지정가면 가격까지)이고 전송 시각 이후 접수된 주문 중
+        아직 다른 주문에 대응되지 않은 것을 찾습니다. 마지막 조회까지 없으면 unresolved로 끝냅니다
+        (찾지 못했다고 전송되지 않았다고 볼 수는 없음: 주문 내역 반영이 늦을 수 있음).
+        """
+        order = ticket.order
+        sent_wall = ticket.created_at + (ticket.sent_at - ticket.queued_at)
+        since = time.strftime("%H%M%S", time.localtime(sent_wall - RECONCILE_CLOCK_SKEW))
+        inquired, elapsed = False, 0.0
+        for at in settings.ORDER_RECONCILE_DELAYS:
+            await asyncio.sleep(max(at - elapsed, 0))
+            elapsed = at
+            try:
+                orders = await self._service.get_today_orders()
+            except Exception as e:
+                print(f"Order reconcile error for {ticket.order_id}: {e}")
+                continue
+            if orders is None:
+                return  # 주문 조회를 지원하지 않는 Repository: unknown 유지
+            inquired = True
+            self._prune_claimed(orders)
+            for row in orders:
+                if (row["order_no"] not in self._claimed and row["code"] == order.stock_code
+                        and row["side"] == order.order_type and row["quantity"] == order.quantity
+                        and (order.order_dvsn != "00" or int(row["price"]) == int(order.price))
+                        and row["time"] >= since):
+                    self._claimed[row["order_no"]] = time.strftime("%Y%m%d")
+                    self._stats["reconciled"] += 1
+                    await self._finish(ticket, OrderState.ACKED, result={"ODNO": row["order_no"], "reconciled": True})
+                    return
+        if inquired:
+            await self._finish(
+                ticket, OrderState.UNRESOLVED,
+                error=f"{ticket.error} (not found in today's orders yet; check the order history before ordering again)",
+            )
+
+    def _prune_claimed(self, orders: List[Dict]):
+        """대조용 주문번호 중 오늘 것이 아니거나 당일 주문 내역에 없는 것 삭제 (프로세스 수명 동안 쌓이지 않도록)"""
+        today = time.strftime("%Y%m%d")
+        listed = {row["order_no"] for row in orders}
+        self._claimed = {no: day for no, day in self._claimed.items() if day == today and no in listed}
+
+    def _evict(self):
+        """보관 한도를 넘으면 오래된 완료 주문부터 삭제 (진행 중인 주문은 유지)"""
+        excess = len(self._tickets) - self._max_tracked
+        if excess <= 0:
+            return
+        for order_id in [oid for oid, t in self._tickets.items() if t.state in FINAL_STATES][:excess]:
+            ticket = self._tickets.pop(order_id)
+            if ticket.idempotency_key:
+                self._keys.pop(ticket.idempotency_key, None)
+
+
+# 싱글톤 인스턴스 생성
+# - SHARED_CACHE_URL이 있으면 멱등성 키와 주문 상태를 워커 간에 공유
+from app.application.async_trading_service import async_trading_service
+from app.infrastructure.shared_cache import shared_cache
+order_pipeline = OrderPipeline(trading_service=async_trading_service, shared_cache=shared_cache)
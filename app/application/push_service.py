@@ -0,0 +1,208 @@
+"""
+Push Service (Application Layer)
+
+프론트엔드 폴링(setInterval)을 대체하는 서버 푸시 허브입니다.
+Spring Boot 비유: SimpMessagingTemplate + @Scheduled 발행자 (STOMP topic 구독 모델)
+
+- 클라이언트는 토픽을 구독합니다: "stock:{code}", "hoga:{code}", "chart:{code}",
+  "index_chart:{code}", "indices", "rankings", "balance"
+- 토픽마다 발행 Task 하나가 주기적으로 데이터를 한 번만 계산하고,
+  값이 바뀌었을 때만 JSON으로 한 번 인코딩하여 모든 구독자에게 전달합니다.
+- 구독자별 송신 큐는 크기가 제한되어 있으며, 큐가 가득 찬(느린) 클라이언트는 끊습니다.
+- 토픽마다 upstream 폴링 Task가 생기므로 종목/지수 코드 형식을 검사하고,
+  구독자 하나가 구독할 수 있는 토픽 수는 settings.PUSH_MAX_TOPICS로 제한합니다.
+"""
+from typing import Awaitable, Callable, Dict, Optional, Set, Tuple
+import asyncio
+import json
+import re
+
+from app.core.config import settings
+
+
+# 종목 코드 (KRX 단축코드 6자리, 신규 상장 코드는 영문 포함) / 업종 지수 코드 (4자리)
+STOCK_CODE = re.compile(r"[0-9A-Z]{6}")
+INDEX_CODE = re.compile(r"[0-9]{4}")
+
+
+class SlowConsumerError(Exception):
+    """송신 큐가 가득 차서 연결을 끊어야 하는 구독자"""
+
+
+class TopicRejected(Exception):
+    """구독할 수 없는 토픽 (알 수 없는 토픽, 잘못된 코드, 구독 수 초과)"""
+
+
+class PushSubscriber:
+    """WebSocket/SSE 연결 하나에 대응하는 구독자"""
+
+    def __init__(self, queue_size: Optional[int] = None):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size or settings.PUSH_QUEUE_SIZE)
+        self.topics: Set[str] = set()
+        self.dropped = False
+
+    def offer(self, message: str) -> bool:
+        """메시지를 큐에 넣고, 가득 찼으면 False"""
+        if self.dropped:
+            return False
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            self.dropped = True
+            return False
+
+    async def next_message(self) -> str:
+        message = await self.queue.get()
+        if message is None:
+            raise SlowConsumerError("subscriber dropped")
+        return message
+
+    def close(self):
+        """송신 루프를 깨워서 종료시킴"""
+        self.dropped = True
+        while True:
+            try:
+                self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+        self.queue.put_nowait(None)
+
+
+class PushHub:
+    """토픽별 발행 Task와 구독자 관리"""
+
+    # 토픽 종류별 발행 주기 (초)
+    INTERVALS = {
+        "stock": 1.0,
+        "hoga": 1.0,
+        "chart": 10.0,
+        "index_chart": 30.0,
+        "indices": 5.0,
+        "rankings": 10.0,
+        "balance": 5.0,
+    }
+
+    def __init__(self, trading_service):
+        self._service = trading_service
+        self._subscribers: Dict[str, Set[PushSubscriber]] = {}
+        self._publishers: Dict[str, asyncio.Task] = {}
+        self._last_payload: Dict[str, str] = {}
+        self._stats = {"published": 0, "delivered": 0, "dropped_clients": 0}
+
+    # ------------------------------------------------------------------
+    # Topics
+    # ------------------------------------------------------------------
+    def _resolve(self, topic: str) -> Optional[Tuple[Callable[[], Awaitable], float]]:
+        """토픽 -> (데이터 계산 함수, 발행 주기), 알 수 없는 토픽이면 None"""
+        kind, _, arg = topic.partition(":")
+        service = self._service
+        if kind in ("stock", "hoga", "chart") and not STOCK_CODE.fullmatch(arg):
+            return None
+        if kind == "index_chart" and not INDEX_CODE.fullmatch(arg):
+            return None
+        if kind == "stock" and arg:
+            async def fetch():
+                return (await service.get_stock_detail(arg)).model_dump()
+        elif kind == "hoga" and arg:
+            fetch = lambda: service.get_order_book(arg)
+        elif kind == "chart" and arg:
+            fetch = lambda: service.get_stock_chart(arg)
+        elif kind == "index_chart" and arg:
+            fetch = lambda: service.get_index_chart(arg)
+        elif kind == "indices" and not arg:
+            fetch = service.get_market_indices
+        elif kind == "rankings" and not arg:
+            fetch = service.get_transaction_rankings
+        elif kind == "balance" and not arg:
+            fetch = service.get_balance
+        else:
+            return None
+        return fetch, self.INTERVALS[kind]
+
+    def subscribe(self, subscriber: PushSubscriber, topic: str):
+        """토픽 구독 (구독할 수 없으면 TopicRejected)"""
+        if topic in subscriber.topics:
+            return
+        resolved = self._resolve(topic)
+        if resolved is None:
+            raise TopicRejected("unknown topic")
+        if len(subscriber.topics) >= settings.PUSH_MAX_TOPICS:
+            raise TopicRejected("too many topics")
+        subscriber.topics.add(topic)
+        subscribers = self._subscribers.setdefault(topic, set())
+        subscribers.add(subscriber)
+        if topic not in self._publishers:
+            fetch, interval = resolved
+            self._publishers[topic] = asyncio.get_running_loop().create_task(
+                self._publish_loop(topic, fetch, interval)
+            )
+        elif topic in self._last_payload:
+            # 신규 구독자에게 마지막 값을 바로 전달
+            self._deliver(subscriber, self._last_payload[topic])
+
+    def unsubscribe(self, subscriber: PushSubscriber, topic: str):
+        subscriber.topics.discard(topic)
+        subscribers = self._subscribers.get(topic)
+        if subscribers is None:
+            return
+        subscribers.discard(subscriber)
+        if not subscribers:
+            del self._subscribers[topic]
+            self._last_payload.pop(topic, None)
+            task = self._publishers.pop(topic, None)
+            if task is not None:
+                task.cancel()
+
+    def disconnect(self, subscriber: PushSubscriber):
+        for topic in list(subscriber.topics):
+            self.unsubscribe(subscriber, topic)
+        subscriber.close()
+
+    def stats(self) -> Dict:
+        return {
+            **self._stats,
+            "topics": {topic: len(subs) for topic, subs in self._subscribers.items()},
+        }
+
+    # ------------------------------------------------------------------
+    # Publishing
+    # ------------------------------------------------------------------
+    async def _publish_loop(self, topic: str, fetch, interval: float):
+        while True:
+            try:
+                data = await fetch()
+                if data is not None:
+                    self.publish(topic, data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Push publish error for {topic}: {e}")
+            await asyncio.sleep(interval)
+
+    def publish(self, topic: str, data) -> int:
+        """토픽 구독자 전체에 전달 (값이 바뀌지 않았으면 생략), 전달한 구독자 수 반환"""
+        payload = json.dumps({"topic": topic, "data": data}, ensure_ascii=False, separators=(",", ":"))
+        if self._last_payload.get(topic) == payload:
+            return 0
+        self._last_payload[topic] = payload
+        self._stats["published"] += 1
+        delivered = 0
+        for subscriber in list(self._subscribers.get(topic, ())):
+            if self._deliver(subscriber, payload):
+                delivered += 1
+        return delivered
+
+    def _deliver(self, subscriber: PushSubscriber, payload: str) -> bool:
+        if subscriber.offer(payload):
+            self._stats["delivered"] += 1
+            return True
+        # backpressure: 느린 클라이언트는 끊음
+        self._stats["dropped_clients"] += 1
+        self.disconnect(subscriber)
+        return False
+
+
+# 싱글톤 인스턴스 생성
+from app.application.async_trading_service import async_trading_service
+push_hub = PushHub(trading_service=async_trading_service)
@@ -11,7 +11,25 @@ Application Layer는:
 """
 from app.domain.repositories.stock_repository import StockRepository
 from app.domain.models import Stock
-import time
+from app.core.cache import MemoryCache
+from app.core.config import settings
+from app.core.rate_limiter import Priority, rate_limited
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+import threading
+
+
+class _InFlight:
+    """
+    진행 중인 upstream 호출 (single-flight)
+
+    같은 cache_key에 대해 동시에 들어온 요청들은 이 객체를 공유하고,
+    첫 번째 요청(leader)만 실제로 fetch_func를 호출합니다.
+    """
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
 
 
 class TradingService:
@@ -24,12 +42,20 @@ class TradingService:
     - 캐싱 등의 부가 기능 제공
     """
     
-    def __init__(self, stock_repository: StockRepository):
+    def __init__(
+        self,
+        stock_repository: StockRepository,
+        cache: Optional[MemoryCache] = None,
+        stale_while_revalidate: Optional[bool] = None,
+    ):
         """
         생성자 주입 (Constructor Injection)
         
         Args:
             stock_repository: StockRepository 인터페이스 구현체
+            cache: 캐시 저장소 (기본값: 설정 기반 MemoryCache)
+            stale_while_revalidate: 만료된 값을 즉시 반환하고 백그라운드 갱신 여부
+                (기본값: settings.CACHE_STALE_WHILE_REVALIDATE)
             
         Spring Boot 비유:
         @Autowired
@@ -38,42 +64,136 @@ class TradingService:
         }
         """
         self._repository = stock_repository
-        self._cache = {}
-        self._cache_ttl = 30  # 30 seconds
+        self._cache = cache or MemoryCache(
+            max_entries=settings.CACHE_MAX_ENTRIES,
+            max_bytes=settings.CACHE_MAX_BYTES,
+        )
+        
+        # Single-flight: cache_key -> _InFlight
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        self._inflight_timeout = 10  # seconds
+        self._stats = {
+            "upstream_calls": 0,   # 실제 fetch_func 호출 수
+            "coalesced_calls": 0,  # 중복 제거로 절약된 upstream 호출 수
+            "stale_served": 0,     # 갱신 중 stale 데이터로 응답한 수
+            "background_refreshes": 0,  # stale-while-revalidate 백그라운드 갱신 수
+        }
+        
+        # Stale-while-revalidate
+        if stale_while_revalidate is None:
+            stale_while_revalidate = settings.CACHE_STALE_WHILE_REVALIDATE
+        self._stale_while_revalidate = stale_while_revalidate
+        self._refresh_executor = ThreadPoolExecutor(
+            max_workers=settings.CACHE_REFRESH_WORKERS,
+            thread_name_prefix="cache-refresh",
+        )
     
     def _get_cached_data(self, cache_key, fetch_func, *args, **kwargs):
         """
         캐싱 로직
         
-        Note: 실제 프로덕션에서는 Redis 등 외부 캐시 사용 권장
+        TTL은 cache_key의 카테고리별로 다릅니다 (app.core.cache.DEFAULT_POLICIES).
+        TTL이 만료된 키에 동시 요청이 몰리면 첫 번째 요청만 upstream을 호출하고,
+        나머지는 stale 데이터가 있으면 즉시 반환, 없으면 첫 요청의 결과를 기다립니다.
+        
+        Stale-while-revalidate 모드에서는 첫 번째 요청도 기다리지 않고
+        stale 데이터를 즉시 반환하며, 갱신은 백그라운드 스레드에서 수행합니다.
+        카테고리별 max_stale 한도를 넘은 데이터는 응답에 사용하지 않습니다.
+        
+        Note: 캐시와 single-flight는 프로세스 안에서만 동작합니다. API 라우트는 모두
+        AsyncTradingService를 사용하며, 워커 간 공유 캐시(SHARED_CACHE_URL)도 그쪽에만 연결됩니다.
         """
-        now = time.time()
         cached_entry = self._cache.get(cache_key)
         
         # 1. Return fresh from cache if within TTL
-        if cached_entry:
-            data, timestamp = cached_entry
-            if now - timestamp < self._cache_ttl:
-                return data
+        if cached_entry and self._cache.is_fresh(cached_entry):
+            return cached_entry.value
+        
+        # 2. Join an in-flight fetch for the same key, or become the leader
+        with self._inflight_lock:
+            cached_entry = self._cache.peek(cache_key)
+            if cached_entry and self._cache.is_fresh(cached_entry):
+                # 다른 leader가 방금 갱신을 끝낸 경우
+                return cached_entry.value
+            if cached_entry and not self._cache.is_servable(cached_entry):
+                # max_stale 한도 초과: stale 값으로 응답하지 않음
+                cached_entry = None
+            
+            flight = self._inflight.get(cache_key)
+            is_leader = flight is None
+            if is_leader:
+                flight = _InFlight()
+                self._inflight[cache_key] = flight
+                self._stats["upstream_calls"] += 1
+            else:
+                self._stats["coalesced_calls"] += 1
+            
+            serve_stale = cached_entry is not None and (
+                not is_leader or self._stale_while_revalidate
+            )
+            if serve_stale:
+                self._stats["stale_served"] += 1
+                self._cache.record_stale(cached_entry)
+                if is_leader:
+                    self._stats["background_refreshes"] += 1
         
-        # 2. Try to fetch fresh data
+        if is_leader:
+            if serve_stale:
+                self._refresh_executor.submit(
+                    self._run_flight, flight, cache_key, cached_entry, fetch_func, *args, **kwargs
+                )
+                return cached_entry.value
+            return self._run_flight(flight, cache_key, cached_entry, fetch_func, *args, **kwargs)
+        
+        if serve_stale:
+            return cached_entry.value
+        flight.event.wait(self._inflight_timeout)
+        return flight.result
+    
+    def _run_flight(self, flight, cache_key, cached_entry, fetch_func, *args, **kwargs):
+        """leader의 upstream 호출 (완료 후 대기 중인 요청들에게 결과 전달)"""
+        result = None
+        try:
+            result = self._fetch_and_store(cache_key, cached_entry, fetch_func, *args, **kwargs)
+        finally:
+            flight.result = result
+            with self._inflight_lock:
+                self._inflight.pop(cache_key, None)
+            flight.event.set()
+        return result
+    
+    def _fetch_and_store(self, cache_key, cached_entry, fetch_func, *args, **kwargs):
+        """upstream 호출 후 캐시 갱신 (실패 시 stale 데이터로 대체)"""
         try:
             fresh_data = fetch_func(*args, **kwargs)
             if fresh_data is not None:
                 if isinstance(fresh_data, (dict, list)) and not fresh_data:
                     if cached_entry: 
-                        return cached_entry[0]
+                        return cached_entry.value
                 
-                self._cache[cache_key] = (fresh_data, now)
-                return fresh_data
+                return self._cache.set(cache_key, fresh_data).value
         except Exception as e:
             print(f"Cache refresh error for {cache_key}: {e}")
         
         # 3. Fallback to stale data
         if cached_entry:
-            return cached_entry[0]
+            self._cache.record_stale(cached_entry)
+            return cached_entry.value
         return None
     
+    def get_cache_stats(self) -> dict:
+        """캐시/single-flight 통계 (절약된 upstream 호출 수, 카테고리별 캐시 상태 포함)"""
+        with self._inflight_lock:
+            stats = dict(self._stats)
+            stats["inflight"] = len(self._inflight)
+        stats["cache"] = self._cache.stats()
+        return stats
+    
+    def clear_cache(self, category: Optional[str] = None) -> int:
+        """캐시 비우기 (category 지정 시 해당 카테고리만)"""
+        return self._cache.clear(category)
+    
     def get_stock_detail(self, code: str) -> Stock:
         """
         종목 상세 정보 조회
@@ -114,8 +234,8 @@ class TradingService:
         )
     
     def get_balance(self):
-        """계좌 잔고 조회"""
-        return self._repository.get_balance()
+        """계좌 잔고 조회 (주문 성공 시 캐시 무효화)"""
+        return self._get_cached_data("balance", self._repository.get_balance)
     
     def execute_order(self, code: str, qty: int, price: float, order_type: str, order_dvsn: str = "00"):
         """
@@ -132,39 +252,65 @@ class TradingService:
             order_type=order_type,
             order_dvsn=order_dvsn
         )
-        return self._repository.place_order(order)
+        result = self._repository.place_order(order)
+        if not (isinstance(result, dict) and result.get("error")):
+            self._cache.delete("balance")
+        return result
     
     # 기존 메서드들 (kis_client 직접 호출하던 부분들)
     # 이들도 Repository 패턴으로 리팩토링 가능하지만, 
     # 우선 핵심 기능만 리팩토링하고 점진적으로 개선
+    # (kis_client 호출도 rate_limited로 감싸 전역 KIS rate limiter를 거침)
     def get_market_indices(self):
         """시장 지수 조회 (TODO: Repository 패턴 적용)"""
         from app.infrastructure.kis_client import kis_client
-        return self._get_cached_data("market_indices", kis_client.get_indices)
+        return self._get_cached_data(
+            "market_indices", rate_limited(Priority.QUOTE, kis_client.get_indices)
+        )
     
     def get_market_top_stocks(self, market: str = "J"):
         """거래대금 상위 종목 (TODO: Repository 패턴 적용)"""
         from app.infrastructure.kis_client import kis_client
-        return self._get_cached_data(f"top_stocks_{market}", kis_client.get_top_stocks, market)
+        return self._get_cached_data(
+            f"top_stocks_{market}", rate_limited(Priority.RANKING, kis_client.get_top_stocks), market
+        )
     
     def get_index_chart(self, code: str):
         """지수 차트 (TODO: Repository 패턴 적용)"""
         from app.infrastructure.kis_client import kis_client
-        return self._get_cached_data(f"index_chart_{code}", kis_client.get_index_chart, code)
+        return self._get_cached_data(
+            f"index_chart_{code}", rate_limited(Priority.CHART, kis_client.get_index_chart), code
+        )
     
     def get_transaction_rankings(self):
         """거래 순위 (TODO: Repository 패턴 적용)"""
         from app.infrastructure.kis_client import kis_client
-        return self._get_cached_data("transaction_rankings", kis_client.get_transaction_rankings)
+        return self._get_cached_data(
+            "transaction_rankings", rate_limited(Priority.RANKING, kis_client.get_transaction_rankings)
+        )
     
     def find_stocks(self, query: str):
         """종목 검색 (TODO: Repository 패턴 적용)"""
         from app.infrastructure.kis_client import kis_client
-        return kis_client.search_stock(query)
+        return rate_limited(Priority.RANKING, kis_client.search_stock)(query)
+
+
+# 싱글톤 인스턴스 (Spring의 @Bean + @Lazy와 유사)
+# 실제 구현체는 trading_service를 처음 사용할 때 import하여 주입하므로,
+# TradingService 클래스만 쓰는 코드(테스트 등)는 KIS 구현체 없이 import할 수 있음
+# (모든 Repository 호출은 전역 KIS rate limiter를 거침)
+_singleton_lock = threading.Lock()
 
 
-# 싱글톤 인스턴스 생성 (Spring의 @Bean과 유사)
-# 실제 구현체를 주입
-from app.infrastructure.persistence.kis_stock_repository import kis_stock_repository
-trading_service = TradingService(stock_repository=kis_stock_repository)
+def __getattr__(name: str):
+    if name != "trading_service":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    with _singleton_lock:
+        if "trading_service" not in globals():
+            from app.infrastructure.persistence.kis_stock_repository import kis_stock_repository
+            from app.infrastructure.persistence.rate_limited_stock_repository import RateLimitedStockRepository
+            globals()["trading_service"] = TradingService(
+                stock_repository=RateLimitedStockRepository(kis_stock_repository)
+            )
+    return globals()["trading_service"]
 
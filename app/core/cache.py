@@ -0,0 +1,334 @@
+"""
+In-Memory Cache (Core)
+
+이 파일은 Spring Boot의 CacheManager (예: Caffeine)에 해당합니다.
+예: @Cacheable(cacheNames = "orderBook") + Caffeine.newBuilder().maximumSize(...)
+
+TradingService._get_cached_data 뒤에서 동작하는 캐시 저장소:
+- 카테고리별 TTL (cache_key 접두어로 카테고리 결정, 예: "order_book_005930" -> "order_book")
+- 카테고리별 최대 stale 허용 시간 (stale-while-revalidate 한도)
+- 엔트리 수 / 추정 메모리(bytes) 상한
+- LRU eviction
+- 엔트리 버전 (값이 바뀔 때만 증가, HTTP ETag 생성용)
+- 엔트리별 JSON 본문 (처음 응답할 때 한 번만 인코딩)
+- 통계 조회 (stats)
+
+엔트리 값은 여러 요청이 공유하므로 저장할 때 읽기 전용 복사본(FrozenDict/FrozenList)으로 바꿉니다.
+수정하려 하면 TypeError가 나므로 인코딩된 본문/ETag와 값이 어긋나지 않습니다 (수정이 필요하면 dict(value)로 복사).
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+import itertools
+import sys
+import threading
+import time
+import uuid
+
+from app.core.encoding import encode_json
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """
+    카테고리별 캐시 정책
+
+    - ttl: 이 시간 동안은 fresh (upstream 호출 없음)
+    - max_stale: TTL 만료 후 추가로 stale 값을 응답에 쓸 수 있는 시간.
+      이 한도를 넘은 엔트리는 어떤 경우에도 응답에 사용하지 않습니다.
+    """
+    ttl: float  # seconds
+    max_stale: float = 0  # seconds
+
+
+# 카테고리별 기본 정책
+DEFAULT_POLICIES: Dict[str, CachePolicy] = {
+    "order_book": CachePolicy(ttl=1, max_stale=2),
+    "stock_detail": CachePolicy(ttl=2, max_stale=5),
+    "market_indices": CachePolicy(ttl=5, max_stale=30),
+    "top_stocks": CachePolicy(ttl=10, max_stale=60),
+    "transaction_rankings": CachePolicy(ttl=10, max_stale=60),
+    "stock_chart": CachePolicy(ttl=60, max_stale=300),
+    "index_chart": CachePolicy(ttl=60, max_stale=300),
+    "daily_chart": CachePolicy(ttl=300, max_stale=3600),
+    # 잔고는 주문 성공/체결통보 시 무효화되므로 TTL은 외부(HTS/MTS) 거래를 반영하는 주기
+    "balance": CachePolicy(ttl=30, max_stale=60),
+}
+DEFAULT_CATEGORY = "default"
+DEFAULT_POLICY = CachePolicy(ttl=30, max_stale=60)
+
+
+class FrozenDict(dict):
+    """
+    읽기 전용 dict (캐시 엔트리 값)
+
+    dict의 하위 클래스이므로 JSON 인코더(orjson/json), pydantic, FastAPI가 그대로 dict로 다룹니다.
+    dict(value), value.copy(), copy.copy/deepcopy는 수정 가능한 복사본을 만듭니다.
+    """
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("cached value is read-only; copy it with dict(value) first")
+
+    __setitem__ = __delitem__ = __ior__ = clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+class FrozenList(list):
+    """읽기 전용 list (캐시 엔트리 값, list(value)로 수정 가능한 복사본)"""
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("cached value is read-only; copy it with list(value) first")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+def freeze(value: Any) -> Any:
+    """dict/list/tuple을 재귀적으로 읽기 전용 복사본으로 변환 (그 외 값은 그대로)"""
+    if isinstance(value, (FrozenDict, FrozenList)):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(v) for v in value)
+    if isinstance(value, tuple):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+@dataclass
+class CacheEntry:
+    """캐시 엔트리 (값 + 저장 시각 + 추정 크기 + 버전 + 인코딩된 JSON)"""
+    value: Any
+    stored_at: float
+    category: str
+    size: int
+    version: int = 0
+    encoded: Optional[bytes] = None
+
+
+@dataclass
+class _CategoryStats:
+    hits: int = 0
+    misses: int = 0
+    stale_served: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """
+    값의 대략적인 메모리 크기 (bytes)
+
+    dict/list/tuple은 내부 원소까지 재귀적으로 합산합니다 (깊이 제한 있음).
+    """
+    size = sys.getsizeof(value)
+    if _depth >= 4:
+        return size
+    if isinstance(value, dict):
+        for k, v in value.items():
+            size += estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            size += estimate_size(item, _depth + 1)
+    elif hasattr(value, "model_dump"):
+        size += estimate_size(value.model_dump(), _depth + 1)
+    return size
+
+
+class MemoryCache:
+    """
+    카테고리별 TTL을 지원하는 LRU 캐시
+
+    get()은 TTL이 지난 엔트리도 반환합니다 (stale fallback 용도).
+    신선도 판단은 is_fresh()로 합니다.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 5000,
+        max_bytes: int = 64 * 1024 * 1024,
+        policies: Optional[Dict[str, CachePolicy]] = None,
+    ):
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._policies = dict(DEFAULT_POLICIES if policies is None else policies)
+        # 긴 접두어부터 매칭 (예: "stock_detail" 보다 구체적인 카테고리가 우선)
+        self._prefixes = sorted(self._policies, key=len, reverse=True)
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._stats: Dict[str, _CategoryStats] = {}
+        self._total_bytes = 0
+        self._lock = threading.RLock()
+        # 버전은 프로세스마다 새로 시작하므로 epoch로 재시작 전후 ETag를 구분
+        self._epoch = uuid.uuid4().hex[:8]
+        self._versions = itertools.count(1)
+
+    def category_of(self, key: str) -> str:
+        """cache_key -> 카테고리 이름"""
+        for prefix in self._prefixes:
+            if key == prefix or key.startswith(prefix + "_"):
+                return prefix
+        return DEFAULT_CATEGORY
+
+    def policy_for(self, key: str) -> CachePolicy:
+        return self._policies.get(self.category_of(key), DEFAULT_POLICY)
+
+    def is_fresh(self, entry: CacheEntry, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        policy = self._policies.get(entry.category, DEFAULT_POLICY)
+        return now - entry.stored_at < policy.ttl
+
+    def is_servable(self, entry: CacheEntry, now: Optional[float] = None) -> bool:
+        """TTL이 지났더라도 max_stale 한도 안이면 응답에 사용 가능"""
+        now = time.time() if now is None else now
+        policy = self._policies.get(entry.category, DEFAULT_POLICY)
+        return now - entry.stored_at < policy.ttl + policy.max_stale
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """엔트리 조회 (LRU 갱신, fresh면 hit / 없거나 만료면 miss로 집계)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats_for(self.category_of(key)).misses += 1
+                return None
+            self._entries.move_to_end(key)
+            stats = self._stats_for(entry.category)
+            if self.is_fresh(entry):
+                stats.hits += 1
+            else:
+                stats.misses += 1
+            return entry
+
+    def record_stale(self, entry: CacheEntry):
+        """TTL이 지난 엔트리로 응답한 횟수 집계 (stale-while-revalidate, 갱신 실패 대체)"""
+        with self._lock:
+            self._stats_for(entry.category).stale_served += 1
+
+    def peek(self, key: str) -> Optional[CacheEntry]:
+        """통계/LRU 순서에 영향 없이 엔트리 조회"""
+        with self._lock:
+            return self._entries.get(key)
+
+    def etag(self, entry: CacheEntry) -> str:
+        """엔트리 버전 기반 ETag (값이 같으면 갱신되어도 동일)"""
+        return f'"{self._epoch}-{entry.version}"'
+
+    def encoded(self, key: str, entry: CacheEntry) -> bytes:
+        """엔트리 값의 JSON 본문 (최초 1회 인코딩 후 엔트리에 보관, 크기도 상한에 포함)"""
+        if entry.encoded is None:
+            body = encode_json(entry.value)
+            with self._lock:
+                if entry.encoded is None:
+                    entry.encoded = body
+                    if self._entries.get(key) is entry:
+                        entry.size += len(body)
+                        self._stats_for(entry.category).bytes += len(body)
+                        self._total_bytes += len(body)
+                        self._evict()
+        return entry.encoded
+
+    def set(self, key: str, value: Any, stored_at: Optional[float] = None) -> CacheEntry:
+        """
+        엔트리 저장 후 상한을 넘으면 LRU 순으로 제거
+
+        값은 읽기 전용 복사본(freeze)으로 저장하므로, 호출자는 반환된 entry.value를 응답에 사용해야
+        인코딩된 본문을 재사용할 수 있습니다 (get_cached_body의 동일성 확인).
+        이전 값과 같은 값으로 갱신하면 버전을 유지합니다 (클라이언트 ETag가 계속 유효).
+        """
+        value = freeze(value)
+        entry = CacheEntry(
+            value=value,
+            stored_at=time.time() if stored_at is None else stored_at,
+            category=self.category_of(key),
+            size=estimate_size(value),
+        )
+        with self._lock:
+            previous = self._remove(key)
+            if previous is not None and previous.value == value:
+                entry.version = previous.version
+            else:
+                entry.version = next(self._versions)
+            self._entries[key] = entry
+            stats = self._stats_for(entry.category)
+            stats.entries += 1
+            stats.bytes += entry.size
+            self._total_bytes += entry.size
+            self._evict()
+        return entry
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            return self._remove(key) is not None
+
+    def clear(self, category: Optional[str] = None) -> int:
+        """전체 또는 특정 카테고리 엔트리 삭제, 삭제된 개수 반환"""
+        with self._lock:
+            keys = [
+                k for k, e in self._entries.items()
+                if category is None or e.category == category
+            ]
+            for k in keys:
+                self._remove(k)
+            return len(keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict:
+        """캐시 상태 조회 (카테고리별 hit/miss/stale/eviction, 엔트리 수, 추정 bytes)"""
+        with self._lock:
+            categories = {}
+            for name, s in self._stats.items():
+                policy = self._policies.get(name, DEFAULT_POLICY)
+                categories[name] = {
+                    "ttl": policy.ttl,
+                    "max_stale": policy.max_stale,
+                    "entries": s.entries,
+                    "bytes": s.bytes,
+                    "hits": s.hits,
+                    "misses": s.misses,
+                    "stale_served": s.stale_served,
+                    "evictions": s.evictions,
+                }
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_entries": self._max_entries,
+                "max_bytes": self._max_bytes,
+                "categories": categories,
+            }
+
+    def _stats_for(self, category: str) -> _CategoryStats:
+        stats = self._stats.get(category)
+        if stats is None:
+            stats = self._stats[category] = _CategoryStats()
+        return stats
+
+    def _remove(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            stats = self._stats_for(entry.category)
+            stats.entries -= 1
+            stats.bytes -= entry.size
+            self._total_bytes -= entry.size
+        return entry
+
+    def _evict(self):
+        # 방금 넣은 엔트리(마지막)는 남겨둠
+        while len(self._entries) > 1 and (
+            len(self._entries) > self._max_entries or self._total_bytes > self._max_bytes
+        ):
+            key = next(iter(self._entries))
+            entry = self._remove(key)
+            self._stats_for(entry.category).evictions += 1
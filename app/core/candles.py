@@ -0,0 +1,159 @@
+"""
+Candle Buffer (Core)
+
+종목/지수별 차트 봉을 고정 크기 ring buffer에 보관하고, upstream 응답은 새로 생기거나 바뀐 봉만 병합합니다.
+Spring Boot 비유: 시계열 전용 in-memory 저장소 (@Component)
+
+- 봉은 (시각, 가격, 거래량) 세 개의 array에 저장합니다 (dict 목록 대비 메모리 약 1/10).
+- 시각은 date + time 문자열을 정수로 만든 값입니다 (예: 20250102093000, 일봉은 20250102).
+- 분봉은 날짜가 바뀌면 이전 날짜의 봉을 비웁니다.
+- since 조회는 해당 시각 이후(같은 시각 포함) 봉만 반환합니다. 마지막 봉은 진행 중에 갱신되므로
+  클라이언트는 받은 봉을 시각 기준으로 덮어써서 병합합니다.
+"""
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+import threading
+
+Bar = Tuple[int, float, int]  # (시각, 가격, 거래량)
+
+_MINUTE_KEY_DIGITS = 14  # YYYYMMDDHHMMSS
+
+
+def bar_key(row: Dict) -> Optional[int]:
+    """차트 행 -> 봉 시각 (date/time이 없으면 None)"""
+    key = f"{row.get('date') or ''}{row.get('time') or ''}"
+    return int(key) if key.isdigit() else None
+
+
+def row_of(ts: int, price: float, volume: int) -> Dict:
+    """봉 -> API 응답 행 ({date, time, price, volume})"""
+    key = str(ts)
+    if len(key) == _MINUTE_KEY_DIGITS:
+        return {"date": key[:8], "time": key[8:], "price": price, "volume": volume}
+    return {"date": key, "time": "", "price": price, "volume": volume}
+
+
+class CandleBuffer:
+    """시각 오름차순으로 최근 capacity개 봉만 보관하는 ring buffer"""
+
+    __slots__ = ("_capacity", "_ts", "_price", "_volume", "_start", "_size")
+
+    def __init__(self, capacity: int):
+        self._capacity = capacity
+        self._ts = array("q", bytes(8 * capacity))
+        self._price = array("d", bytes(8 * capacity))
+        self._volume = array("q", bytes(8 * capacity))
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def last_ts(self) -> Optional[int]:
+        return self._ts[self._slot(self._size - 1)] if self._size else None
+
+    def clear(self):
+        self._start = 0
+        self._size = 0
+
+    def _slot(self, i: int) -> int:
+        return (self._start + i) % self._capacity
+
+    def _index_of(self, ts: int) -> int:
+        """ts 이상인 첫 봉의 논리 인덱스 (이진 탐색)"""
+        lo, hi = 0, self._size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._ts[self._slot(mid)] < ts:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def merge(self, bars: Iterable[Bar]) -> int:
+        """
+        봉 병합 (시각 오름차순 입력)
+
+        - 마지막 봉보다 새로운 봉은 뒤에 추가 (가득 차면 가장 오래된 봉 제거)
+        - 이미 있는 시각의 봉은 값이 바뀐 경우만 갱신
+        - 보관 범위보다 오래된 봉, 중간에 빠진 봉은 무시
+
+        Returns:
+            추가/갱신된 봉 수
+        """
+        changed = 0
+        for ts, price, volume in bars:
+            last = self.last_ts
+            if last is None or ts > last:
+                if self._size == self._capacity:
+                    slot = self._start
+                    self._start = (self._start + 1) % self._capacity
+                else:
+                    slot = self._slot(self._size)
+                    self._size += 1
+                self._ts[slot], self._price[slot], self._volume[slot] = ts, price, volume
+                changed += 1
+                continue
+            i = self._index_of(ts)
+            if i < self._size:
+                slot = self._slot(i)
+                if self._ts[slot] == ts and (self._price[slot] != price or self._volume[slot] != volume):
+                    self._price[slot], self._volume[slot] = price, volume
+                    changed += 1
+        return changed
+
+    def rows(self, since: Optional[int] = None) -> List[Dict]:
+        """봉 목록 (since가 있으면 그 시각 이후, 같은 시각 포함)"""
+        start = 0 if since is None else self._index_of(since)
+        return [
+            row_of(self._ts[slot], self._price[slot], self._volume[slot])
+            for slot in (self._slot(i) for i in range(start, self._size))
+        ]
+
+
+class CandleStore:
+    """차트 키(예: "stock_chart_005930")별 CandleBuffer, 최근 사용 순으로 max_series개까지 유지"""
+
+    def __init__(self, capacity: int, max_series: int):
+        self._capacity = capacity
+        self._max_series = max_series
+        self._buffers: "OrderedDict[str, CandleBuffer]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def merge(self, key: str, rows: List[Dict]) -> Optional[List[Dict]]:
+        """
+        upstream 차트 행을 병합하고 전체 봉 목록 반환
+
+        봉 시각을 만들 수 없는 행(date/time 없음)이 있으면 병합하지 않고 None을 반환합니다.
+        """
+        bars = []
+        for row in rows:
+            ts = bar_key(row)
+            if ts is None:
+                return None
+            bars.append((ts, float(row.get("price") or 0), int(row.get("volume") or 0)))
+        bars.sort(key=lambda bar: bar[0])
+
+        with self._lock:
+            buffer = self._buffers.get(key)
+            if buffer is None:
+                buffer = self._buffers[key] = CandleBuffer(self._capacity)
+                while len(self._buffers) > self._max_series:
+                    self._buffers.popitem(last=False)
+            self._buffers.move_to_end(key)
+            last = buffer.last_ts
+            if bars and last is not None and len(str(last)) == _MINUTE_KEY_DIGITS \
+                    and bars[-1][0] // 1_000_000 != last // 1_000_000:
+                # 분봉: 새 거래일이 시작되면 이전 날짜 봉은 버림
+                buffer.clear()
+            buffer.merge(bars)
+            return buffer.rows()
+
+    @staticmethod
+    def since(rows: List[Dict], since: int) -> List[Dict]:
+        """merge() 결과 목록에서 since 이후(같은 시각 포함) 봉만 잘라냄"""
+        keys = [bar_key(row) or 0 for row in rows]
+        return rows[bisect_left(keys, since):]
@@ -1,4 +1,5 @@
 from pydantic_settings import BaseSettings
+from typing import Dict, Tuple
 import os
 
 class Settings(BaseSettings):
@@ -7,6 +8,105 @@ class Settings(BaseSettings):
     
     # KIS Config Path
     KIS_CONFIG_PATH: str = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "kis_devlp.yaml")
+    # "vps": 모의투자, "prod": 실전투자
+    KIS_SERVER: str = "vps"
+    KIS_HTTP_TIMEOUT: float = 5.0
+    # API별 timeout (경로 접두어 -> 초, 가장 긴 접두어 적용): 토큰 발급, 주문/잔고, 일봉(최대 100봉)은 더 길게
+    KIS_HTTP_TIMEOUTS: Dict[str, float] = {
+        "/oauth2/": 10.0,
+        "/uapi/domestic-stock/v1/trading/": 10.0,
+        "/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice": 10.0,
+    }
+    # 프로세스 공유 HTTP 커넥션 풀: 최대 연결 수, 유휴 연결 수, 유휴 연결 유지 시간(초), 연결 timeout(초), HTTP/2 (h2 설치 시)
+    HTTP_POOL_MAX_CONNECTIONS: int = 20
+    HTTP_POOL_MAX_KEEPALIVE: int = 10
+    HTTP_POOL_KEEPALIVE_EXPIRY: float = 60.0
+    HTTP_POOL_CONNECT_TIMEOUT: float = 3.0
+    HTTP_POOL_HTTP2: bool = False
+    # KIS REST 주소 (비어 있으면 kis_devlp.yaml의 KIS_SERVER 주소), 로컬 stand-in 사용 시 예: http://127.0.0.1:9443
+    KIS_BASE_URL: str = ""
+    KIS_STANDIN_CASSETTE: str = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), ".cache", "kis_cassette.jsonl")
+    # KIS 초당 호출 제한 (모의투자 기준, 실전투자는 더 높게 설정)
+    KIS_RATE_LIMIT_PER_SEC: float = 2.0
+    KIS_RATE_LIMIT_BURST: float = 2.0
+    KIS_RATE_LIMIT_TIMEOUT: float = 10.0  # 주문 외 요청의 최대 대기 시간 (초)
+    
+    # KIS 실시간 WebSocket (체결가/호가)
+    KIS_REALTIME_ENABLED: bool = True
+    KIS_REALTIME_MAX_SUBSCRIPTIONS: int = 41  # 세션당 구독 한도 (종목당 체결+호가 2건)
+    KIS_REALTIME_IDLE_TIMEOUT: float = 60.0   # 조회가 없으면 구독 해제 (초)
+    KIS_REALTIME_MAX_AGE: float = 10.0        # 실시간 데이터 유효 시간 (초)
+    
+    # 종목 마스터 (로컬 종목 검색 인덱스): 시작 시 적재, 하루 한 번 갱신
+    STOCK_MASTER_ENABLED: bool = True
+    STOCK_MASTER_URL: str = "https://new.real.download.dws.co.kr/common/master"
+    STOCK_MASTER_DIR: str = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), ".cache", "stock_master")
+    STOCK_MASTER_REFRESH_INTERVAL: float = 24 * 60 * 60
+    
+    # 차트 봉 ring buffer: 시리즈당 최대 봉 수 (분봉 기준 하루 390개), 최대 시리즈 수
+    CHART_BUFFER_BARS: int = 390
+    CHART_BUFFER_SERIES: int = 1000
+    
+    # 호가 변경분 조회: 종목당 보관하는 최근 스냅샷 수, 최대 종목 수
+    ORDER_BOOK_HISTORY: int = 30
+    ORDER_BOOK_SERIES: int = 1000
+    
+    # 주문 파이프라인: 대기 가능한 최대 주문 수, 상태를 보관하는 최대 주문 수, 상태 조회 최대 대기 시간(초)
+    ORDER_QUEUE_SIZE: int = 100
+    ORDER_TRACKING_MAX: int = 1000
+    ORDER_STATUS_MAX_WAIT: float = 30.0
+    
+    # 전송 후 응답을 받지 못한(unknown) 주문을 당일 주문 내역과 대조하는 시각 (응답 실패 후 경과 초)
+    ORDER_RECONCILE_DELAYS: Tuple[float, ...] = (1.0, 3.0, 10.0)
+    
+    # 공유 캐시(SHARED_CACHE_URL) 없이 실행할 때 주문을 받는 프로세스를 하나로 제한하는 lock 파일
+    # (멱등성 키와 주문 상태가 프로세스 메모리에만 있으므로 다른 워커는 주문 요청에 503 반환)
+    ORDER_PIPELINE_LOCK_PATH: str = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), ".cache", "order_pipeline.lock")
+    
+    # 주문 성공 후 잔고를 한 번 더 갱신하는 시각(초): 체결통보가 없을 때 체결 반영용 (0이면 사용 안 함)
+    BALANCE_REFRESH_AFTER_ORDER: float = 3.0
+    
+    # 차트 이력 저장소 (SQLite): 분봉/일봉을 디스크에 보관하고 빠진 구간만 KIS에 요청
+    CANDLE_HISTORY_ENABLED: bool = True
+    CANDLE_HISTORY_PATH: str = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), ".cache", "candles.sqlite3")
+    CANDLE_HISTORY_MAX_PAGES: int = 10  # 일봉 조회 한 번에 KIS에 요청하는 최대 페이지 수 (페이지당 100봉)
+    
+    # 일괄 현재가 조회(/stocks?codes=) 한 번에 허용하는 최대 종목 수
+    QUOTE_BATCH_MAX_CODES: int = 50
+    
+    # 이 크기(bytes) 이상의 응답만 gzip/brotli 압축
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    
+    # 서버 푸시 (WebSocket/SSE): 구독자별 송신 큐 크기(가득 차면 연결 종료), 구독자별 최대 토픽 수
+    PUSH_QUEUE_SIZE: int = 64
+    PUSH_MAX_TOPICS: int = 20
+    
+    # 요청 추적(tracing): 기록할 요청 비율(0~1, X-Trace: 1 헤더가 있으면 항상 기록), 보관하는 최근 trace 수
+    TRACE_SAMPLE_RATE: float = 0.01
+    TRACE_BUFFER_SIZE: int = 200
+    
+    # 샘플링 프로파일러 (POST /api/v1/debug/profile): 운영에서 켤 때만 True, 한 번에 실행 가능한 최대 시간(초)
+    PROFILER_ENABLED: bool = False
+    PROFILER_MAX_SECONDS: float = 30.0
+    
+    # KIS 접근 토큰 파일 (워커/재시작 간 공유, 비어 있으면 프로세스 메모리에만 보관), 만료 몇 초 전부터 백그라운드 재발급
+    KIS_TOKEN_CACHE_PATH: str = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), ".cache", "kis_token.json")
+    KIS_TOKEN_REFRESH_AHEAD: float = 3600.0
+    
+    # 워커 간 공유 캐시 (Redis 프로토콜, 예: redis://127.0.0.1:6390/0): 비어 있으면 워커별 메모리 캐시만 사용
+    SHARED_CACHE_URL: str = ""
+    # 다른 워커의 upstream 조회를 기다리는 최대 시간(초), 조회 잠금의 만료 시간
+    SHARED_CACHE_LOCK_TIMEOUT: float = 10.0
+    # 이 앱이 공유 캐시에 쓰는 모든 키의 접두어 (캐시 값, 조회 잠금, rate limit 카운터, 잔고 세대, 주문 상태)
+    # 한 Redis를 여러 배포(모의/실전 등)가 함께 쓰면 배포마다 다르게 지정 (glob 특수문자 *?[] 사용 불가)
+    SHARED_CACHE_KEY_PREFIX: str = "alpha:"
+    
+    # In-Memory Cache 상한 (LRU eviction 기준)
+    CACHE_MAX_ENTRIES: int = 5000
+    CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    # TTL 만료 시 stale 값을 즉시 응답하고 백그라운드에서 갱신
+    CACHE_STALE_WHILE_REVALIDATE: bool = True
+    CACHE_REFRESH_WORKERS: int = 4
     
     class Config:
         case_sensitive = True
@@ -0,0 +1,30 @@
+"""
+JSON Encoding (Core)
+
+응답/캐시/푸시에서 공통으로 쓰는 JSON 인코더입니다 (공유 캐시 값은 디코딩도 여기서).
+Spring Boot 비유: 전역 ObjectMapper 빈
+
+orjson(pyproject 의존성)을 사용하며, 설치되지 않은 환경(직접 만든 가상환경 등)에서는 표준 json으로
+같은 형식(UTF-8, 공백 없음)을 만듭니다.
+"""
+from typing import Any
+import json
+
+try:
+    import orjson
+except ImportError:  # 의존성 설치 전 환경: 표준 json 사용
+    orjson = None
+
+
+def encode_json(data: Any) -> bytes:
+    """JSON 직렬화 (orjson 우선)"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def decode_json(data: bytes) -> Any:
+    """JSON 역직렬화 (orjson 우선)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,76 @@
+"""
+Latency Histogram (Core)
+
+구간(bucket)별 누적 개수로 지연 시간 분포를 기록합니다. 값 하나하나를 보관하지 않으므로
+관측 횟수와 관계없이 메모리가 일정합니다.
+Spring Boot 비유: Micrometer Timer (publishPercentileHistogram)
+
+- 구간 경계는 밀리초 단위 상한값이며, 각 구간 개수는 "상한 이하" 누적값입니다 (Prometheus histogram과 같음).
+- 백분위수는 해당 백분위가 속한 구간의 상한값으로 추정합니다.
+"""
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+import threading
+
+# 밀리초 상한값 (마지막 구간은 +Inf)
+DEFAULT_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class LatencyHistogram:
+    """초 단위로 관측하고 밀리초 단위로 요약하는 고정 구간 히스토그램 (스레드 안전)"""
+
+    def __init__(self, buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS):
+        self._bounds = tuple(buckets_ms)
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._count = 0
+        self._sum_ms = 0.0
+        self._max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        ms = seconds * 1000
+        with self._lock:
+            self._counts[bisect_left(self._bounds, ms)] += 1
+            self._count += 1
+            self._sum_ms += ms
+            self._max_ms = max(self._max_ms, ms)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """q(0~1) 백분위가 속한 구간의 상한값 (ms), +Inf 구간이면 최댓값, 관측이 없으면 None"""
+        with self._lock:
+            if not self._count:
+                return None
+            rank, seen = q * self._count, 0
+            for i, count in enumerate(self._counts):
+                seen += count
+                if seen >= rank and count:
+                    return self._bounds[i] if i < len(self._bounds) else self._max_ms
+            return self._max_ms
+
+    def cumulative(self) -> Tuple[List[Tuple[float, int]], int, float]:
+        """([(상한 ms, 누적 개수), ..., (inf, 전체)], 전체 개수, 합계 ms) - Prometheus 출력용"""
+        with self._lock:
+            counts, count, sum_ms = list(self._counts), self._count, self._sum_ms
+        buckets, total = [], 0
+        for bound, n in zip(list(self._bounds) + [float("inf")], counts):
+            total += n
+            buckets.append((bound, total))
+        return buckets, count, sum_ms
+
+    def snapshot(self) -> Dict:
+        """{"count", "sum_ms", "max_ms", "p50", "p95", "p99", "buckets": {"상한(ms)": 누적 개수, ..., "+Inf": 전체}}"""
+        with self._lock:
+            counts, count, sum_ms, max_ms = list(self._counts), self._count, self._sum_ms, self._max_ms
+        buckets, cumulative = {}, 0
+        for bound, n in zip(list(self._bounds) + ["+Inf"], counts):
+            cumulative += n
+            buckets[str(bound)] = cumulative
+        return {
+            "count": count,
+            "sum_ms": round(sum_ms, 3),
+            "max_ms": round(max_ms, 3),
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "buckets": buckets,
+        }
@@ -0,0 +1,238 @@
+"""
+Metrics Registry (Core)
+
+프로세스 안에서 집계한 지표를 Prometheus text format(0.0.4)으로 출력합니다 (GET /metrics).
+Spring Boot 비유: Micrometer MeterRegistry + Actuator /actuator/prometheus
+
+- Counter/Gauge/Histogram은 레이블 값 조합마다 값을 따로 보관합니다.
+- Histogram은 LatencyHistogram(ms 구간)을 사용하며, 출력은 Prometheus 관례대로 초 단위입니다.
+- 캐시 통계처럼 이미 다른 곳에서 집계하는 값은 collector 함수로 등록하여 출력 시점에 읽습니다.
+- KIS 호출은 observe_upstream, HTTP 요청은 MetricsMiddleware(라우트 템플릿 기준)로 측정합니다.
+"""
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import threading
+import time
+
+from app.core.histogram import LatencyHistogram
+
+# collector가 반환하는 지표: (이름, 타입, 설명, [(레이블 dict, 값), ...])
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> Tuple:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_labels(self.labelnames, key)} {_number(value)}" for key, value in values
+        ]
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._histograms: Dict[Tuple, LatencyHistogram] = {}
+
+    def observe(self, seconds: float, **labels):
+        key = self._key(labels)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, LatencyHistogram())
+        histogram.observe(seconds)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+        lines = self.header()
+        for key, histogram in histograms:
+            buckets, count, sum_ms = histogram.cumulative()
+            for bound_ms, cumulative in buckets:
+                le = "+Inf" if bound_ms == float("inf") else _number(bound_ms / 1000)
+                labels = _labels(self.labelnames, key, 'le="' + le + '"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(round(sum_ms / 1000, 6))}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """지표 등록/출력 (이름이 같으면 같은 지표를 반환)"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[Family]]] = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, help: str, labelnames: Sequence[str]):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help, labelnames)
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Histogram:
+        return self._get_or_create(Histogram, name, help, labelnames)
+
+    def register_collector(self, collector: Callable[[], Iterable[Family]]):
+        """출력 시점에 값을 읽는 collector 등록"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            for name, type_, help, samples in collector():
+                lines += [f"# HELP {name} {help}", f"# TYPE {name} {type_}"]
+                for labels, value in samples:
+                    lines.append(f"{name}{_labels(list(labels), list(labels.values()))} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# 싱글톤 인스턴스
+metrics = MetricsRegistry()
+
+UPSTREAM_SECONDS = metrics.histogram(
+    "kis_upstream_request_duration_seconds", "KIS API call latency (excluding rate limiter wait)", ("api",))
+UPSTREAM_ERRORS = metrics.counter(
+    "kis_upstream_errors_total", "KIS API calls that failed, by error code", ("api", "reason"))
+UPSTREAM_INFLIGHT = metrics.gauge(
+    "kis_upstream_inflight_requests", "KIS API calls in progress")
+HTTP_SECONDS = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route"))
+HTTP_REQUESTS = metrics.counter(
+    "http_requests_total", "HTTP requests by route template and status", ("method", "route", "status"))
+HTTP_INFLIGHT = metrics.gauge(
+    "http_inflight_requests", "HTTP requests in progress")
+
+
+@contextmanager
+def observe_upstream(api: str):
+    """
+    KIS 호출 한 번의 지연 시간/오류/진행 중 개수 측정
+
+    오류 사유는 예외의 code 속성(KIS msg_cd, HTTP 상태), 없으면 예외 클래스 이름입니다.
+    """
+    UPSTREAM_INFLIGHT.inc()
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        UPSTREAM_ERRORS.inc(api=api, reason=getattr(e, "code", "") or type(e).__name__)
+        raise
+    finally:
+        UPSTREAM_SECONDS.observe(time.perf_counter() - start, api=api)
+        UPSTREAM_INFLIGHT.dec()
+
+
+def route_template(scope) -> Optional[str]:
+    """
+    요청이 매칭된 라우트 템플릿 (/api/v1/stock/{code}), 매칭되지 않았으면 None
+
+    include_router로 등록된 라우트는 prefix 없는 템플릿을 가지므로 실제 경로에서 prefix를 되살립니다.
+    """
+    template = getattr(scope.get("route"), "path", None)
+    if not template:
+        return None
+    parts = scope["path"].split("/")
+    return "/".join(parts[:len(parts) - template.count("/")]) + template
+
+
+class MetricsMiddleware:
+    """
+    HTTP 요청 지연 시간/개수/진행 중 개수 측정 (ASGI 미들웨어)
+
+    경로 대신 라우트 템플릿(/api/v1/stock/{code})을 레이블로 사용하여 종목 코드마다 시계열이 늘지 않게 하며,
+    어떤 라우트에도 맞지 않는 요청은 "unmatched"로 묶습니다.
+    WebSocket/SSE처럼 오래 유지되는 연결도 응답이 끝날 때 한 번 기록됩니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_INFLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            labels = {"method": scope["method"], "route": route_template(scope) or "unmatched"}
+            HTTP_SECONDS.observe(time.perf_counter() - start, **labels)
+            HTTP_REQUESTS.inc(status=status, **labels)
+            HTTP_INFLIGHT.dec()
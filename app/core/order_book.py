@@ -0,0 +1,98 @@
+"""
+Order Book Store (Core)
+
+종목별 호가(매도/매수 10호가)를 고정 크기 array로 보관하고, 스냅샷마다 순번(seq)을 붙입니다.
+클라이언트는 마지막으로 받은 seq를 보내고, 서버는 그 이후 바뀐 호가 칸만 응답합니다.
+Spring Boot 비유: 버전 번호 기반 변경분 조회를 제공하는 in-memory 저장소 (@Component)
+
+- 호가 한 건은 array('d', 40): 칸(slot) 0~9는 매도 1~10호가, 10~19는 매수 1~10호가이며
+  칸마다 (가격, 잔량) 두 값을 나란히 저장합니다 (dict 20개 대비 메모리 약 1/20).
+- 값이 바뀐 경우에만 seq가 증가하고, 종목별로 최근 history개 스냅샷을 보관합니다.
+- seq는 저장소마다 임의로 정한 nonce(상위 20비트)와 저장소 안에서 증가하는 번호(하위 32비트)로 만듭니다.
+  여러 워커가 동시에 시작해도 seq가 겹치지 않으므로, 다른 워커나 재시작 전에 받은 seq,
+  보관 범위보다 오래된 seq를 보내면 엉뚱한 스냅샷과 비교하지 않고 전체 호가를 응답합니다.
+  (최대 2^52이므로 JavaScript number로 그대로 주고받을 수 있음)
+
+변경분 응답 형식:
+    {"seq": 12, "changes": [[slot, price, volume], ...]}      # since 이후 바뀐 칸만
+    {"seq": 12, "full": true, "asks": [...], "bids": [...]}   # 전체 (since를 모르는 경우)
+"""
+from array import array
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Tuple
+import itertools
+import secrets
+import threading
+
+LEVELS = 10
+SLOTS = LEVELS * 2  # 0~9: 매도, 10~19: 매수
+SEQ_BITS = 32  # seq 하위 비트 (저장소 안 순번), 상위 20비트는 저장소 nonce
+
+
+def compact(book: Dict) -> array:
+    """{"asks": [...], "bids": [...]} -> array('d', 40)"""
+    values = array("d", bytes(8 * SLOTS * 2))
+    for offset, side in ((0, "asks"), (LEVELS, "bids")):
+        for level, row in enumerate((book.get(side) or [])[:LEVELS]):
+            slot = (offset + level) * 2
+            values[slot] = float(row.get("price") or 0)
+            values[slot + 1] = float(row.get("volume") or 0)
+    return values
+
+
+def expand(values: array) -> Dict:
+    """array('d', 40) -> {"asks": [...], "bids": [...]}"""
+    rows = [{"price": values[i * 2], "volume": int(values[i * 2 + 1])} for i in range(SLOTS)]
+    return {"asks": rows[:LEVELS], "bids": rows[LEVELS:]}
+
+
+def diff(old: array, new: array) -> List[List]:
+    """두 스냅샷 사이에 바뀐 칸 [[slot, price, volume], ...]"""
+    return [
+        [slot, new[slot * 2], int(new[slot * 2 + 1])]
+        for slot in range(SLOTS)
+        if old[slot * 2] != new[slot * 2] or old[slot * 2 + 1] != new[slot * 2 + 1]
+    ]
+
+
+class OrderBookStore:
+    """종목별 최근 호가 스냅샷 (최근 사용 순으로 max_series개 종목까지 유지)"""
+
+    def __init__(self, history: int, max_series: int):
+        self._history = history
+        self._max_series = max_series
+        self._books: "OrderedDict[str, Deque[Tuple[int, array]]]" = OrderedDict()
+        self._seq = itertools.count((secrets.randbits(20) << SEQ_BITS) + 1)
+        self._lock = threading.Lock()
+
+    def update(self, code: str, book: Dict) -> int:
+        """호가 저장 (이전 스냅샷과 같으면 저장하지 않음), 현재 seq 반환"""
+        values = compact(book)
+        with self._lock:
+            snapshots = self._books.get(code)
+            if snapshots is None:
+                snapshots = self._books[code] = deque(maxlen=self._history)
+                while len(self._books) > self._max_series:
+                    self._books.popitem(last=False)
+            self._books.move_to_end(code)
+            if snapshots and snapshots[-1][1] == values:
+                return snapshots[-1][0]
+            seq = next(self._seq)
+            snapshots.append((seq, values))
+            return seq
+
+    def delta(self, code: str, since: Optional[int] = None) -> Optional[Dict]:
+        """since 이후 바뀐 칸 (since를 보관하고 있지 않으면 전체), 종목이 없으면 None"""
+        with self._lock:
+            snapshots = self._books.get(code)
+            if not snapshots:
+                return None
+            seq, current = snapshots[-1]
+            base = next((values for s, values in snapshots if s == since), None) if since else None
+        if base is None:
+            return {"seq": seq, "full": True, **expand(current)}
+        return {"seq": seq, "changes": diff(base, current)}
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"series": len(self._books), "snapshots": sum(len(s) for s in self._books.values())}
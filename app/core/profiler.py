@@ -0,0 +1,98 @@
+"""
+Sampling Profiler (Core)
+
+정해진 시간 동안 일정 간격으로 모든 스레드의 호출 스택을 채취(sys._current_frames)하여
+어느 함수에서 시간을 쓰는지 집계합니다. 코드에 계측을 넣지 않으므로 운영 중에도 몇 초간 켤 수 있습니다.
+Spring Boot 비유: async-profiler / JFR을 잠깐 켜는 것
+
+- 결과의 stacks는 flame graph 도구가 읽는 collapsed 형식("바깥;...;안쪽" 샘플 수)과 같습니다.
+- 채취 간격마다 전체 스레드 스택을 복사하므로 간격이 짧을수록 부하가 커집니다 (기본 5ms).
+- 한 번에 하나만 실행됩니다.
+"""
+from collections import Counter
+from typing import Dict, List
+import os
+import sys
+import threading
+import time
+
+
+class ProfilerBusy(Exception):
+    """이미 프로파일링 중"""
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class SamplingProfiler:
+    """주기적 스택 채취 프로파일러"""
+
+    def __init__(self, max_depth: int = 64):
+        self._max_depth = max_depth
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    def run(self, seconds: float, interval: float = 0.005, top: int = 30) -> Dict:
+        """
+        seconds 동안 프로파일링 (호출한 스레드를 막으므로 이벤트 루프에서는 asyncio.to_thread로 실행)
+
+        Returns:
+            {"seconds", "interval", "samples", "top_functions": [{"function", "self", "total"}],
+             "stacks": {"바깥;...;안쪽": 샘플 수}}
+        """
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusy("profiler is already running")
+        try:
+            return self._sample(seconds, interval, top)
+        finally:
+            self._lock.release()
+
+    def _sample(self, seconds: float, interval: float, top: int) -> Dict:
+        me = threading.get_ident()
+        stacks: Counter = Counter()
+        samples = 0
+        started = time.perf_counter()
+        deadline = started + seconds
+        while time.perf_counter() < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == me:
+                    continue
+                stack: List[str] = []
+                while frame is not None and len(stack) < self._max_depth:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stacks[";".join(reversed(stack))] += 1
+            samples += 1
+            time.sleep(interval)
+
+        self_counts: Counter = Counter()
+        total_counts: Counter = Counter()
+        for stack, count in stacks.items():
+            frames = stack.split(";")
+            self_counts[frames[-1]] += count
+            for label in set(frames):
+                total_counts[label] += count
+        return {
+            "seconds": round(time.perf_counter() - started, 3),
+            "interval": interval,
+            "samples": samples,
+            "top_functions": [
+                {"function": label, "self": count, "total": total_counts[label]}
+                for label, count in self_counts.most_common(top)
+            ],
+            "stacks": dict(stacks.most_common()),
+        }
+
+    @staticmethod
+    def collapsed(result: Dict) -> str:
+        """run() 결과를 collapsed 텍스트로 변환 (flamegraph.pl, speedscope 입력용)"""
+        return "".join(f"{stack} {count}\n" for stack, count in result["stacks"].items())
+
+
+# 싱글톤 인스턴스
+profiler = SamplingProfiler()
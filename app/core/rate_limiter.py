@@ -0,0 +1,308 @@
+"""
+KIS API Rate Limiter (Core)
+
+KIS는 초당 거래건수(TPS)를 제한합니다 ("초당 거래건수를 초과하였습니다", EGW00201).
+모든 KIS 호출은 이 모듈의 전역 token bucket(kis_rate_limiter)을 통과합니다.
+
+Spring Boot 비유: Resilience4j RateLimiter + 우선순위 큐
+
+- 우선순위: 주문 > 잔고 > 시세/호가 > 차트 > 랭킹/검색
+- 토큰이 부족하면 우선순위가 높은 요청부터 토큰을 받습니다.
+- 낮은 우선순위는 버킷에 여유(reserve)가 있을 때만 토큰을 사용하므로,
+  대시보드 폴링이 주문에 필요한 초당 예산을 다 써버리지 않습니다.
+- 동기(스레드) 호출자와 async 호출자가 같은 버킷을 공유합니다.
+- 버킷은 프로세스마다 있으므로, 워커가 여러 개면 SharedRateWindow(공유 캐시)로 모든 워커의
+  async 호출 합계를 초당 rate 이하로 제한합니다.
+"""
+from enum import IntEnum
+from typing import Callable, Dict, Optional
+import asyncio
+import functools
+import heapq
+import itertools
+import threading
+import time
+
+from app.core.config import settings
+from app.core.shared_cache import SharedCache, SharedCacheUnavailable
+
+
+class Priority(IntEnum):
+    """KIS 호출 우선순위 (값이 작을수록 높음)"""
+    ORDER = 0
+    BALANCE = 1
+    QUOTE = 2    # 현재가, 호가, 지수
+    CHART = 3
+    RANKING = 4  # 랭킹, 검색
+
+
+# 우선순위별로 버킷에 남겨둬야 하는 토큰 비율 (burst 대비)
+DEFAULT_RESERVE_RATIO: Dict[Priority, float] = {
+    Priority.ORDER: 0.0,
+    Priority.BALANCE: 0.0,
+    Priority.QUOTE: 0.0,
+    Priority.CHART: 0.25,
+    Priority.RANKING: 0.5,
+}
+
+
+class RateLimitTimeout(Exception):
+    """제한 시간 안에 토큰을 받지 못함"""
+
+
+class _Waiter:
+    __slots__ = ("priority", "seq", "enqueued_at", "granted", "event", "loop")
+
+    def __init__(self, priority: Priority, seq: int, loop=None):
+        self.priority = priority
+        self.seq = seq
+        self.enqueued_at = time.monotonic()
+        self.granted = False
+        self.loop = loop
+        self.event = asyncio.Event() if loop else threading.Event()
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+    def wake(self):
+        self.granted = True
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.event.set)
+        else:
+            self.event.set()
+
+
+class _PriorityStats:
+    __slots__ = ("acquired", "timeouts", "total_wait", "max_wait")
+
+    def __init__(self):
+        self.acquired = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+
+class SharedRateWindow:
+    """
+    워커 간 공유하는 초당 호출 수 한도 (공유 캐시의 초 단위 카운터)
+
+    - 우선순위별 reserve 비율은 RateLimiter와 같고, 한도를 넘은 시도는 카운터를 되돌립니다
+      (낮은 우선순위의 재시도가 주문 몫을 쓰지 않도록).
+    - 초 경계로 세므로(fixed window) 경계 앞뒤로 잠깐 한도의 2배까지 몰릴 수 있습니다.
+    - 공유 캐시에 연결할 수 없으면 기다리지 않고 통과합니다 (프로세스 버킷만 적용).
+    """
+
+    def __init__(self, cache: SharedCache, rate: float,
+                 reserve_ratio: Optional[Dict[Priority, float]] = None, key_prefix: Optional[str] = None):
+        ratios = reserve_ratio if reserve_ratio is not None else DEFAULT_RESERVE_RATIO
+        self._cache = cache
+        self._limits = {p: max(int(rate * (1 - ratios.get(p, 0.0))), 1) for p in Priority}
+        self._prefix = key_prefix if key_prefix is not None else settings.SHARED_CACHE_KEY_PREFIX + "rate:"
+        self._stats = {"waits": 0, "unavailable": 0}
+
+    async def acquire(self, priority: Priority, deadline: Optional[float] = None):
+        """이번 초의 예산이 남아 있으면 바로 반환, 없으면 다음 초까지 대기 (deadline은 time.monotonic 기준)"""
+        while True:
+            now = time.time()
+            key = f"{self._prefix}{int(now)}"
+            try:
+                if await self._cache.incr(key, 1, 2.0) <= self._limits[priority]:
+                    return
+                await self._cache.incr(key, -1, 2.0)
+            except SharedCacheUnavailable:
+                self._stats["unavailable"] += 1
+                return
+            delay = int(now) + 1 - now
+            if deadline is not None and time.monotonic() + delay > deadline:
+                raise RateLimitTimeout(f"shared rate limit wait timed out ({priority.name})")
+            self._stats["waits"] += 1
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict:
+        return {**self._stats, "limits": {p.name.lower(): limit for p, limit in self._limits.items()}}
+
+
+class RateLimiter:
+    """
+    우선순위 기반 token bucket
+
+    Args:
+        rate: 초당 토큰 충전 수
+        burst: 버킷 최대 토큰 수
+        reserve_ratio: 우선순위별 예약 비율 (DEFAULT_RESERVE_RATIO)
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None,
+                 reserve_ratio: Optional[Dict[Priority, float]] = None):
+        self._rate = rate
+        self._burst = burst if burst is not None else max(rate, 1.0)
+        ratios = reserve_ratio if reserve_ratio is not None else DEFAULT_RESERVE_RATIO
+        self._reserve = {p: self._burst * ratios.get(p, 0.0) for p in Priority}
+        self._tokens = self._burst
+        self._last_refill = time.monotonic()
+        self._queue = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._stats = {p: _PriorityStats() for p in Priority}
+        self._shared: Optional[SharedRateWindow] = None
+
+    def use_shared_window(self, window: Optional[SharedRateWindow]):
+        """워커 간 한도 적용 (async 호출만, 동기 호출자는 프로세스 버킷만 사용)"""
+        self._shared = window
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def acquire(self, priority: Priority, timeout: Optional[float] = None):
+        """토큰 1개를 받을 때까지 대기 (스레드용)"""
+        waiter = self._enqueue(priority, loop=None)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not waiter.granted:
+            delay = self._dispatch()
+            if waiter.granted:
+                break
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    if self._cancel(waiter):
+                        break
+                    raise RateLimitTimeout(f"rate limit wait timed out ({priority.name})")
+                delay = min(delay, remaining)
+            waiter.event.wait(delay)
+        self._record(waiter)
+
+    async def acquire_async(self, priority: Priority, timeout: Optional[float] = None):
+        """토큰 1개를 받을 때까지 대기 (async용, 스레드를 점유하지 않음)"""
+        waiter = self._enqueue(priority, loop=asyncio.get_running_loop())
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            while not waiter.granted:
+                delay = self._dispatch()
+                if waiter.granted:
+                    break
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        if self._cancel(waiter):
+                            break
+                        raise RateLimitTimeout(f"rate limit wait timed out ({priority.name})")
+                    delay = min(delay, remaining)
+                try:
+                    await asyncio.wait_for(waiter.event.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+        except asyncio.CancelledError:
+            if self._cancel(waiter):
+                self._refund()
+            raise
+        self._record(waiter)
+        if self._shared is not None:
+            await self._shared.acquire(priority, deadline)
+
+    def stats(self) -> Dict:
+        """큐 깊이 / 대기 시간 통계"""
+        with self._lock:
+            self._refill()
+            depth = {p: 0 for p in Priority}
+            for w in self._queue:
+                depth[w.priority] += 1
+            priorities = {}
+            for p in Priority:
+                s = self._stats[p]
+                priorities[p.name.lower()] = {
+                    "queue_depth": depth[p],
+                    "acquired": s.acquired,
+                    "timeouts": s.timeouts,
+                    "avg_wait_ms": round(s.total_wait / s.acquired * 1000, 2) if s.acquired else 0.0,
+                    "max_wait_ms": round(s.max_wait * 1000, 2),
+                }
+            stats = {
+                "rate": self._rate,
+                "burst": self._burst,
+                "tokens": round(self._tokens, 3),
+                "queue_depth": len(self._queue),
+                "priorities": priorities,
+            }
+        if self._shared is not None:
+            stats["shared"] = self._shared.stats()
+        return stats
+
+    # ------------------------------------------------------------------
+    # Internals (모두 self._lock 안에서 상태 변경)
+    # ------------------------------------------------------------------
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self._burst, self._tokens + (now - self._last_refill) * self._rate)
+        self._last_refill = now
+
+    def _eligible(self, priority: Priority) -> bool:
+        return self._tokens - 1 >= self._reserve[priority] - 1e-9
+
+    def _enqueue(self, priority: Priority, loop) -> _Waiter:
+        waiter = _Waiter(priority, next(self._seq), loop)
+        with self._lock:
+            self._refill()
+            if not self._queue and self._eligible(priority):
+                self._tokens -= 1
+                waiter.granted = True
+            else:
+                heapq.heappush(self._queue, waiter)
+        return waiter
+
+    def _dispatch(self) -> float:
+        """가능한 만큼 토큰 배분 후, 다음 토큰까지 남은 시간 반환"""
+        with self._lock:
+            self._refill()
+            while self._queue and self._eligible(self._queue[0].priority):
+                waiter = heapq.heappop(self._queue)
+                self._tokens -= 1
+                waiter.wake()
+            if not self._queue:
+                return 1.0 / self._rate
+            needed = 1 + self._reserve[self._queue[0].priority] - self._tokens
+            return max(needed / self._rate, 0.001)
+
+    def _cancel(self, waiter: _Waiter) -> bool:
+        """대기 취소. 이미 토큰을 받은 상태면 True 반환"""
+        with self._lock:
+            if waiter.granted:
+                return True
+            self._queue.remove(waiter)
+            heapq.heapify(self._queue)
+            self._stats[waiter.priority].timeouts += 1
+            return False
+
+    def _refund(self):
+        with self._lock:
+            self._tokens = min(self._burst, self._tokens + 1)
+
+    def _record(self, waiter: _Waiter):
+        wait = time.monotonic() - waiter.enqueued_at
+        with self._lock:
+            s = self._stats[waiter.priority]
+            s.acquired += 1
+            s.total_wait += wait
+            s.max_wait = max(s.max_wait, wait)
+
+
+def wait_timeout(priority: Priority) -> Optional[float]:
+    """우선순위별 최대 대기 시간 (주문은 포기하지 않고 끝까지 대기)"""
+    if priority == Priority.ORDER:
+        return None
+    return settings.KIS_RATE_LIMIT_TIMEOUT
+
+
+def rate_limited(priority: Priority, func: Callable, limiter: Optional[RateLimiter] = None) -> Callable:
+    """동기 함수 호출 전에 토큰을 받도록 감싸는 헬퍼"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        (limiter or kis_rate_limiter).acquire(priority, timeout=wait_timeout(priority))
+        return func(*args, **kwargs)
+    return wrapper
+
+
+# 프로세스 전역 KIS rate limiter
+kis_rate_limiter = RateLimiter(
+    rate=settings.KIS_RATE_LIMIT_PER_SEC,
+    burst=settings.KIS_RATE_LIMIT_BURST,
+)
@@ -0,0 +1,63 @@
+"""
+Shared Cache Interface (Core)
+
+여러 uvicorn 워커(프로세스)가 함께 쓰는 캐시 저장소의 인터페이스입니다.
+Spring Boot 비유: RedisCacheManager 뒤의 RedisConnection (워커별 Caffeine 앞에 두는 2단 캐시)
+
+- 값은 bytes이며 만료 시간(초)을 함께 저장합니다.
+- add()는 키가 없을 때만 저장하며(SET NX), 워커 간 single-flight 잠금에 사용합니다.
+  잠금 해제는 delete_if_equals()로 자기 토큰일 때만 지웁니다 (만료 후 다른 워커가 잡은 잠금을 지우지 않음).
+- incr()는 워커 간 카운터(초당 호출 수, 잔고 세대 번호)에 사용합니다.
+- 저장소에 연결할 수 없으면 SharedCacheUnavailable을 발생시키고, 호출하는 쪽은 워커별 캐시만으로 동작합니다.
+"""
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+
+class SharedCacheUnavailable(Exception):
+    """공유 캐시 연결/응답 실패"""
+
+
+class SharedCache(ABC):
+    """워커 간 공유 캐시 (구현: app/infrastructure/shared_cache.py)"""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """값 조회 (없거나 만료되었으면 None)"""
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float):
+        """값 저장 (ttl초 후 만료)"""
+        pass
+
+    @abstractmethod
+    async def add(self, key: str, value: bytes, ttl: float) -> bool:
+        """키가 없을 때만 저장, 저장했으면 True"""
+        pass
+
+    @abstractmethod
+    async def delete(self, key: str):
+        pass
+
+    @abstractmethod
+    async def delete_if_equals(self, key: str, value: bytes) -> bool:
+        """값이 value와 같을 때만 삭제 (원자적 compare-and-delete), 삭제했으면 True"""
+        pass
+
+    @abstractmethod
+    async def delete_matching(self, pattern: str) -> int:
+        """glob 패턴(예: "prefix:*")에 맞는 키 모두 삭제, 삭제한 키 수 반환"""
+        pass
+
+    @abstractmethod
+    async def incr(self, key: str, amount: int, ttl: float) -> int:
+        """정수 값에 amount를 더한 결과 (키가 없으면 0에서 시작하며, 새로 만들 때 ttl초 후 만료)"""
+        pass
+
+    async def aclose(self):
+        """연결 정리"""
+        pass
+
+    def stats(self) -> Dict:
+        return {}
@@ -0,0 +1,215 @@
+"""
+Request Tracing (Core)
+
+요청 하나가 어느 단계(캐시 조회, rate limiter 대기, KIS 호출, 응답 변환, 직렬화)에서 시간을 썼는지
+span 단위로 기록합니다. 표본(sample)으로 뽑힌 요청만 기록하고 최근 trace를 ring buffer에 보관합니다.
+Spring Boot 비유: Micrometer Tracing (Observation) + 메모리 span exporter
+
+- 현재 span은 contextvars로 전달되므로 asyncio Task(ensure_future)와 asyncio.to_thread 안에서도 부모가 유지됩니다.
+- 표본이 아닌 요청에서 span()은 contextvar 조회 한 번 후 공유 no-op 객체를 반환합니다.
+- trace가 끝난 뒤 도착한 span(예: stale-while-revalidate 백그라운드 갱신)은 기록하지 않습니다.
+"""
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+import itertools
+import random
+import threading
+import time
+
+from app.core.config import settings
+from app.core.metrics import route_template
+
+
+class Trace:
+    """요청 하나의 span 목록 (span은 부모 index와 trace 시작 기준 시각으로 기록)"""
+
+    __slots__ = ("trace_id", "name", "status", "started_at", "duration_ms", "spans", "finished", "_t0")
+
+    def __init__(self, trace_id: str, name: str):
+        self.trace_id = trace_id
+        self.name = name
+        self.status: Optional[int] = None
+        self.started_at = time.time()
+        self.duration_ms: Optional[float] = None
+        self.spans: List[Dict] = []
+        self.finished = False
+        self._t0 = time.perf_counter()
+
+    def offset_ms(self) -> float:
+        return (time.perf_counter() - self._t0) * 1000
+
+    def to_dict(self) -> Dict:
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "status": self.status,
+            "started_at": self.started_at,
+            "duration_ms": self.duration_ms,
+            "spans": list(self.spans),
+        }
+
+
+# (진행 중인 trace, 현재 span index) - 표본이 아니면 None
+_current: ContextVar[Optional[Tuple[Trace, int]]] = ContextVar("trace_span", default=None)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ("trace", "record", "token")
+
+    def __init__(self, trace: Trace, parent: int, name: str, attrs: Dict):
+        self.trace = trace
+        self.record = {"name": name, "parent": parent, "start_ms": None, "duration_ms": None}
+        if attrs:
+            self.record["attrs"] = attrs
+
+    def __enter__(self):
+        self.record["start_ms"] = round(self.trace.offset_ms(), 3)
+        self.trace.spans.append(self.record)
+        self.token = _current.set((self.trace, len(self.trace.spans) - 1))
+        return None
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.record.setdefault("attrs", {})["error"] = exc_type.__name__
+        self.record["duration_ms"] = round(self.trace.offset_ms() - self.record["start_ms"], 3)
+        _current.reset(self.token)
+        return False
+
+
+def span(name: str, **attrs):
+    """현재 trace에 하위 span 기록 (with 문으로 사용, trace가 없으면 아무것도 하지 않는 객체 반환)"""
+    current = _current.get()
+    if current is None or current[0].finished:
+        return _NOOP
+    return _Span(current[0], current[1], name, attrs)
+
+
+def annotate(**attrs):
+    """현재 span에 속성 추가 (예: 캐시 조회 결과), trace가 없으면 무시"""
+    current = _current.get()
+    if current is not None and current[1] >= 0:
+        current[0].spans[current[1]].setdefault("attrs", {}).update(attrs)
+
+
+class Tracer:
+    """표본 추출과 최근 trace 보관 (ring buffer)"""
+
+    def __init__(self, sample_rate: float = 0.0, capacity: int = 200, seed: Optional[int] = None):
+        """
+        Args:
+            sample_rate: 기록할 요청 비율 (0~1)
+            capacity: 보관하는 최근 trace 수
+        """
+        self.sample_rate = sample_rate
+        self._traces: Deque[Trace] = deque(maxlen=capacity)
+        self._ids = itertools.count(1)
+        self._prefix = f"{int(time.time()):x}"
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats = {"started": 0, "sampled": 0}
+
+    def should_sample(self, force: bool = False) -> bool:
+        self._stats["started"] += 1
+        return force or (self.sample_rate > 0 and self._random.random() < self.sample_rate)
+
+    @contextmanager
+    def trace(self, name: str, force: bool = False):
+        """
+        요청 하나를 trace로 기록 (표본이면 Trace, 아니면 None을 yield)
+
+        끝나면 ring buffer에 추가합니다. 이름은 with 블록 안에서 바꿀 수 있습니다 (라우트 템플릿 확정 후).
+        """
+        if not self.should_sample(force):
+            yield None
+            return
+        trace = Trace(f"{self._prefix}-{next(self._ids)}", name)
+        token = _current.set((trace, -1))
+        try:
+            yield trace
+        finally:
+            _current.reset(token)
+            trace.duration_ms = round(trace.offset_ms(), 3)
+            trace.finished = True
+            with self._lock:
+                self._stats["sampled"] += 1
+                self._traces.append(trace)
+
+    def recent(self, limit: int = 20, min_ms: float = 0.0) -> List[Dict]:
+        """최근 trace (최신순), min_ms 이상 걸린 것만"""
+        with self._lock:
+            traces = list(self._traces)
+        return [t.to_dict() for t in reversed(traces) if t.duration_ms >= min_ms][:limit]
+
+    def get(self, trace_id: str) -> Optional[Dict]:
+        with self._lock:
+            for t in self._traces:
+                if t.trace_id == trace_id:
+                    return t.to_dict()
+        return None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**self._stats, "sample_rate": self.sample_rate, "buffered": len(self._traces)}
+
+
+class TracingMiddleware:
+    """
+    HTTP 요청을 root span으로 기록하는 ASGI 미들웨어
+
+    X-Trace: 1 헤더가 있으면 표본 비율과 관계없이 기록하며, 기록한 요청은 응답에 X-Trace-Id를 붙입니다.
+    trace 이름은 라우트 템플릿 기준입니다 (GET /api/v1/stock/{code}).
+    """
+
+    def __init__(self, app, tracer: Tracer, exclude: Sequence[str] = ()):
+        """
+        Args:
+            tracer: trace를 보관할 Tracer
+            exclude: 기록하지 않는 경로 접두어 (정적 파일, 지표/디버그 엔드포인트 등)
+        """
+        self.app = app
+        self.tracer = tracer
+        self.exclude = tuple(exclude)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(self.exclude):
+            await self.app(scope, receive, send)
+            return
+        force = (b"x-trace", b"1") in scope.get("headers", ())
+        with self.tracer.trace(f"{scope['method']} {scope['path']}", force=force) as trace:
+            if trace is None:
+                await self.app(scope, receive, send)
+                return
+
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"x-trace-id", trace.trace_id.encode())
+                    ]
+                    trace.status = message["status"]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                template = route_template(scope)
+                if template:
+                    trace.name = f"{scope['method']} {template}"
+
+
+# 싱글톤 인스턴스
+tracer = Tracer(sample_rate=settings.TRACE_SAMPLE_RATE, capacity=settings.TRACE_BUFFER_SIZE)
@@ -0,0 +1,191 @@
+"""
+Async Stock Repository Interface (Domain Layer)
+
+StockRepository의 비동기 버전입니다.
+Spring Boot 비유: Spring WebFlux의 ReactiveCrudRepository (Mono/Flux 반환)
+
+FastAPI의 async 엔드포인트에서 사용하며, upstream I/O를 기다리는 동안
+스레드풀 워커를 점유하지 않습니다. 동기 StockRepository는 스크립트 용도로 유지됩니다.
+"""
+from abc import ABC, abstractmethod
+from typing import Optional, Dict, List
+import asyncio
+from app.domain.models import Stock, Order
+
+
+class OrderOutcomeUnknown(Exception):
+    """
+    주문 요청을 보낸 뒤 응답을 받지 못함 (read timeout, 연결 끊김 등)
+
+    KIS에 접수되었을 수도 있으므로 거부로 처리하면 안 되고, 당일 주문 내역으로 확인해야 합니다.
+    """
+
+
+class AsyncStockRepository(ABC):
+    """
+    주식 데이터 접근을 위한 비동기 Repository Interface
+
+    메서드 의미는 StockRepository와 동일하며 모두 coroutine입니다.
+    """
+
+    @abstractmethod
+    async def get_stock_price(self, code: str) -> Optional[Stock]:
+        """
+        종목 현재가 조회
+
+        Args:
+            code: 종목코드 (예: "005930")
+
+        Returns:
+            Stock 엔티티 또는 None
+        """
+        pass
+
+    async def get_stock_prices(self, codes: List[str]) -> Dict[str, Optional[Stock]]:
+        """
+        여러 종목 현재가 일괄 조회
+
+        기본 구현은 get_stock_price를 동시에 실행합니다 (호출 수는 rate limiter가 조절).
+
+        Args:
+            codes: 종목코드 목록
+
+        Returns:
+            종목코드 -> Stock 엔티티 (없는 종목은 None, 조회에 실패한 종목은 키 없음)
+        """
+        stocks = await asyncio.gather(
+            *(self.get_stock_price(code) for code in codes), return_exceptions=True
+        )
+        results = {}
+        for code, stock in zip(codes, stocks):
+            if isinstance(stock, Exception):
+                print(f"Batch price error for {code}: {stock}")
+            else:
+                results[code] = stock
+        return results
+
+    @abstractmethod
+    async def get_order_book(self, code: str) -> Dict:
+        """
+        호가 정보 조회
+
+        Args:
+            code: 종목코드
+
+        Returns:
+            호가 데이터 (asks, bids)
+        """
+        pass
+
+    @abstractmethod
+    async def get_stock_chart(self, code: str) -> List[Dict]:
+        """
+        차트 데이터 조회
+
+        Args:
+            code: 종목코드
+
+        Returns:
+            시계열 차트 데이터
+        """
+        pass
+
+    async def get_daily_chart(self, code: str, start: int, end: int) -> List[Dict]:
+        """
+        일봉 조회
+
+        기본 구현은 빈 목록을 반환합니다 (일봉을 지원하지 않는 구현체).
+
+        Args:
+            code: 종목코드
+            start: 시작일 (YYYYMMDD, 포함)
+            end: 종료일 (YYYYMMDD, 포함)
+
+        Returns:
+            시간순 일봉 (한 번에 최대 건수는 구현체마다 다르며, end에 가까운 봉부터 채움)
+        """
+        return []
+
+    async def get_index_price(self, code: str) -> Optional[Dict]:
+        """
+        업종 지수 현재가 조회
+
+        기본 구현은 None을 반환합니다 (지수를 지원하지 않는 구현체).
+
+        Args:
+            code: 업종코드 (예: "0001" 코스피, "1001" 코스닥, "2001" 코스피200)
+
+        Returns:
+            {"price", "change", "rate"} 또는 None
+        """
+        return None
+
+    async def get_index_chart(self, code: str) -> List[Dict]:
+        """
+        업종 지수 분봉 조회
+
+        기본 구현은 빈 목록을 반환합니다 (지수를 지원하지 않는 구현체).
+
+        Args:
+            code: 업종코드
+
+        Returns:
+            시간순 분봉 (get_stock_chart와 같은 형식)
+        """
+        return []
+
+    async def get_trade_amount_ranking(self, market: str = "J") -> List[Dict]:
+        """
+        거래대금 상위 종목 조회
+
+        기본 구현은 빈 목록을 반환합니다 (순위를 지원하지 않는 구현체).
+
+        Args:
+            market: 시장 구분 코드 (예: "J" 주식)
+
+        Returns:
+            [{"code", "name", "price", "change_rate", "amount"}, ...]
+        """
+        return []
+
+    @abstractmethod
+    async def place_order(self, order: Order) -> Dict:
+        """
+        주문 실행
+
+        Args:
+            order: 주문 엔티티
+
+        Returns:
+            주문 결과
+        """
+        pass
+
+    async def get_today_orders(self) -> Optional[List[Dict]]:
+        """
+        당일 주문 내역 (전송 결과를 모르는 주문의 접수 여부 확인용)
+
+        기본 구현은 None을 반환합니다 (주문 조회를 지원하지 않는 구현체).
+
+        Returns:
+            [{"order_no", "code", "side": "buy" | "sell", "quantity", "price", "time": "HHMMSS", "filled"}, ...]
+        """
+        return None
+
+    def account_id(self) -> str:
+        """
+        잔고/주문 대상 계좌 식별자 (잔고 캐시 키에 사용)
+
+        기본 구현은 계좌가 하나인 구현체를 위한 고정값입니다.
+        """
+        return "default"
+
+    @abstractmethod
+    async def get_balance(self) -> Dict:
+        """
+        계좌 잔고 조회
+
+        Returns:
+            잔고 정보
+        """
+        pass
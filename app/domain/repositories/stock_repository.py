@@ -34,6 +34,27 @@ class StockRepository(ABC):
         """
         pass
     
+    def get_stock_prices(self, codes: List[str]) -> Dict[str, Optional[Stock]]:
+        """
+        여러 종목 현재가 일괄 조회
+        
+        기본 구현은 get_stock_price를 종목별로 호출합니다.
+        일괄 조회 API가 있는 구현체는 재정의할 수 있습니다.
+        
+        Args:
+            codes: 종목코드 목록
+            
+        Returns:
+            종목코드 -> Stock 엔티티 (없는 종목은 None, 조회에 실패한 종목은 키 없음)
+        """
+        results = {}
+        for code in codes:
+            try:
+                results[code] = self.get_stock_price(code)
+            except Exception as e:
+                print(f"Batch price error for {code}: {e}")
+        return results
+    
     @abstractmethod
     def get_order_book(self, code: str) -> Dict:
         """
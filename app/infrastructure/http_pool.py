@@ -0,0 +1,156 @@
+"""
+Shared HTTP Connection Pool (Infrastructure Layer)
+
+프로세스당 하나의 비동기 httpx 커넥션 풀을 두고 KIS 호출(Repository, 종목 마스터 다운로드)이 함께 사용합니다.
+연결을 keep-alive로 재사용하므로 호출마다 TCP/TLS handshake를 하지 않습니다.
+Spring Boot 비유: 공유 ConnectionProvider(Reactor Netty) / PoolingHttpClientConnectionManager 빈
+
+- 풀 크기, keep-alive 유지 시간은 settings.HTTP_POOL_* 로 설정합니다.
+- HTTP/2는 settings.HTTP_POOL_HTTP2가 켜져 있고 h2 패키지가 설치되어 있을 때만 사용합니다 (선택 의존성).
+- API별 timeout은 settings.KIS_HTTP_TIMEOUTS(경로 접두어 -> 초)로 정하며, 없으면 KIS_HTTP_TIMEOUT입니다.
+- 각 클라이언트는 client()로 만들며, 클라이언트를 닫아도 공유 풀은 닫히지 않습니다
+  (풀은 애플리케이션 종료 시 http_pool.aclose()로 정리).
+- 요청마다 새 연결을 열었는지(connect_tcp) httpcore trace로 확인하여 재사용 통계를 냅니다.
+"""
+from typing import Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+try:
+    import h2  # noqa: F401  (httpx의 HTTP/2 지원에 필요)
+except ImportError:  # 선택 의존성
+    h2 = None
+
+
+def timeout_for(path: str) -> httpx.Timeout:
+    """요청 경로의 timeout (settings.KIS_HTTP_TIMEOUTS에서 가장 긴 접두어, 없으면 KIS_HTTP_TIMEOUT)"""
+    seconds = settings.KIS_HTTP_TIMEOUT
+    matched = ""
+    for prefix, value in settings.KIS_HTTP_TIMEOUTS.items():
+        if path.startswith(prefix) and len(prefix) > len(matched):
+            matched, seconds = prefix, value
+    return httpx.Timeout(seconds, connect=min(seconds, settings.HTTP_POOL_CONNECT_TIMEOUT))
+
+
+class _ConnectionStats:
+    """요청 수, 새 연결 수, TLS handshake 수 (재사용 = 요청 - 새 연결)"""
+
+    def __init__(self):
+        self.requests = 0
+        self.connections_opened = 0
+        self.tls_handshakes = 0
+
+    def on_event(self, event_name: str):
+        if event_name == "connection.connect_tcp.started":
+            self.connections_opened += 1
+        elif event_name == "connection.start_tls.started":
+            self.tls_handshakes += 1
+
+    def on_request(self):
+        self.requests += 1
+
+    def snapshot(self) -> Dict:
+        requests, opened, tls = self.requests, self.connections_opened, self.tls_handshakes
+        reused = max(requests - opened, 0)
+        return {
+            "requests": requests,
+            "connections_opened": opened,
+            "tls_handshakes": tls,
+            "reused": reused,
+            "reuse_ratio": round(reused / requests, 4) if requests else None,
+        }
+
+
+class _SharedAsyncTransport(httpx.AsyncBaseTransport):
+    """공유 풀로 요청을 보내는 transport (클라이언트의 aclose는 풀을 닫지 않음)"""
+
+    def __init__(self, pool: "HttpPool"):
+        self._pool = pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        stats = self._pool.connection_stats
+
+        async def trace(event_name, info):
+            stats.on_event(event_name)
+
+        stats.on_request()
+        request.extensions["trace"] = trace
+        return await self._pool.async_transport().handle_async_request(request)
+
+    async def aclose(self):
+        pass
+
+
+class HttpPool:
+    """프로세스 공유 커넥션 풀 (최초 사용 시 생성)"""
+
+    def __init__(self, max_connections: int = 20, max_keepalive: int = 10,
+                 keepalive_expiry: float = 60.0, http2: bool = False):
+        """
+        Args:
+            max_connections: 동시에 열 수 있는 최대 연결 수 (넘으면 연결이 반납될 때까지 대기)
+            max_keepalive: 유휴 상태로 유지하는 최대 연결 수
+            keepalive_expiry: 유휴 연결을 닫기까지의 시간 (초)
+            http2: HTTP/2 사용 여부 (h2 패키지가 없으면 무시)
+        """
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = bool(http2 and h2 is not None)
+        self._async_transport: Optional[httpx.AsyncHTTPTransport] = None
+        self.connection_stats = _ConnectionStats()
+
+    def async_transport(self) -> httpx.AsyncHTTPTransport:
+        if self._async_transport is None:
+            self._async_transport = httpx.AsyncHTTPTransport(limits=self._limits, http2=self.http2)
+        return self._async_transport
+
+    def client(self, **kwargs) -> httpx.AsyncClient:
+        """공유 풀을 쓰는 AsyncClient (base_url, headers, timeout 등은 클라이언트별로 지정)"""
+        return httpx.AsyncClient(transport=_SharedAsyncTransport(self), **kwargs)
+
+    async def aclose(self):
+        """풀의 모든 연결 정리 (애플리케이션 종료 시 호출)"""
+        transport, self._async_transport = self._async_transport, None
+        if transport is not None:
+            await transport.aclose()
+
+    @staticmethod
+    def _open_connections(transport) -> Optional[int]:
+        pool = getattr(transport, "_pool", None)
+        return len(pool.connections) if pool is not None and hasattr(pool, "connections") else None
+
+    def stats(self) -> Dict:
+        """연결 재사용 통계 (Repository/종목 마스터 다운로드 합계)"""
+        return {
+            "http2": self.http2,
+            "max_connections": self._limits.max_connections,
+            "max_keepalive_connections": self._limits.max_keepalive_connections,
+            **self.connection_stats.snapshot(),
+            "open_connections": self._open_connections(self._async_transport),
+        }
+
+    def collect_metrics(self):
+        """/metrics 출력 시점의 요청/새 연결/TLS handshake 수"""
+        snapshot = self.connection_stats.snapshot()
+        for name, field, help in (
+            ("kis_http_requests_total", "requests", "Requests sent through the shared HTTP pool"),
+            ("kis_http_connections_opened_total", "connections_opened", "New TCP connections opened by the pool"),
+            ("kis_http_tls_handshakes_total", "tls_handshakes", "TLS handshakes performed by the pool"),
+        ):
+            yield name, "counter", help, [({}, snapshot[field])]
+
+
+# 싱글톤 인스턴스
+http_pool = HttpPool(
+    max_connections=settings.HTTP_POOL_MAX_CONNECTIONS,
+    max_keepalive=settings.HTTP_POOL_MAX_KEEPALIVE,
+    keepalive_expiry=settings.HTTP_POOL_KEEPALIVE_EXPIRY,
+    http2=settings.HTTP_POOL_HTTP2,
+)
+metrics.register_collector(http_pool.collect_metrics)
@@ -0,0 +1,152 @@
+"""
+KIS Response Decoders (Infrastructure Layer)
+
+KIS REST 응답(JSON의 output/output1/output2)을 DataFrame을 거치지 않고
+도메인 객체/응답용 dict로 바로 변환합니다.
+Spring Boot 비유: RestTemplate 응답을 DTO로 매핑하는 Converter
+
+KIS 샘플 헬퍼(inquire_price, volume_rank, inquire_balance 등)는 응답마다 pandas DataFrame을 만들고
+호출자는 다시 한 행을 꺼내 씁니다 (df['stck_prpr'].values[0]). 자주 호출되는 경로는 이 모듈을 사용하세요.
+pandas를 import하지 않으므로 서버 시작 비용에도 영향이 없습니다.
+벤치마크: scripts/benchmarks/bench_decoding.py
+"""
+from typing import Dict, List, Optional
+
+from app.domain.models import Stock
+
+
+def to_float(value, default: float = 0.0) -> float:
+    """KIS 숫자 문자열 -> float (빈 값/형식 오류는 default, 실시간 체결 파싱에서도 사용)"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def to_int(value, default: int = 0) -> int:
+    """KIS 숫자 문자열 -> int ("10.0" 같은 소수 표기 허용)"""
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return default
+
+
+def decode_stock(code: str, name: str, output: Optional[Dict]) -> Optional[Stock]:
+    """주식현재가 시세 (FHKST01010100) output -> Stock"""
+    if not output:
+        return None
+    return Stock(
+        code=code,
+        name=name,
+        price=to_float(output.get("stck_prpr")),
+        change_amount=to_float(output.get("prdy_vrss")),
+        change_rate=to_float(output.get("prdy_ctrt")),
+    )
+
+
+def decode_order_book(output1: Optional[Dict]) -> Dict:
+    """호가 (FHKST01010200) output1 -> {"asks": [...], "bids": [...]} (1~10호가)"""
+    output = output1 or {}
+    asks, bids = [], []
+    for i in range(1, 11):
+        asks.append({
+            "price": to_float(output.get(f"askp{i}")),
+            "volume": to_int(output.get(f"askp_rsqn{i}")),
+        })
+        bids.append({
+            "price": to_float(output.get(f"bidp{i}")),
+            "volume": to_int(output.get(f"bidp_rsqn{i}")),
+        })
+    return {"asks": asks, "bids": bids}
+
+
+def decode_chart(output2: Optional[List[Dict]]) -> List[Dict]:
+    """분봉 (FHKST03010200) output2 -> 시간순 [{date, time, price, volume}]"""
+    # KIS는 최신 데이터부터 반환하므로 시간순으로 뒤집음
+    return [
+        {
+            "date": row.get("stck_bsop_date", ""),
+            "time": row.get("stck_cntg_hour", ""),
+            "price": to_float(row.get("stck_prpr")),
+            "volume": to_int(row.get("cntg_vol")),
+        }
+        for row in reversed(output2 or [])
+        if row.get("stck_prpr")
+    ]
+
+
+def decode_daily_chart(output2: Optional[List[Dict]]) -> List[Dict]:
+    """일봉 (FHKST03010100) output2 -> 시간순 [{date, time, price(종가), volume}]"""
+    return [
+        {
+            "date": row.get("stck_bsop_date", ""),
+            "time": "",
+            "price": to_float(row.get("stck_clpr")),
+            "volume": to_int(row.get("acml_vol")),
+        }
+        for row in reversed(output2 or [])
+        if row.get("stck_bsop_date") and row.get("stck_clpr")
+    ]
+
+
+def decode_index(output: Optional[Dict]) -> Optional[Dict]:
+    """업종 지수 현재가 (FHPUP02100000) output -> {price, change, rate}"""
+    if not output:
+        return None
+    return {
+        "price": to_float(output.get("bstp_nmix_prpr")),
+        "change": to_float(output.get("bstp_nmix_prdy_vrss")),
+        "rate": to_float(output.get("bstp_nmix_prdy_ctrt")),
+    }
+
+
+def decode_index_chart(output2: Optional[List[Dict]]) -> List[Dict]:
+    """업종 분봉 (FHKUP03500200) output2 -> 시간순 [{date, time, price, volume}]"""
+    return [
+        {
+            "date": row.get("stck_bsop_date", ""),
+            "time": row.get("stck_cntg_hour", ""),
+            "price": to_float(row.get("bstp_nmix_prpr")),
+            "volume": to_int(row.get("cntg_vol")),
+        }
+        for row in reversed(output2 or [])
+        if row.get("bstp_nmix_prpr")
+    ]
+
+
+def decode_rankings(output: Optional[List[Dict]]) -> List[Dict]:
+    """거래량/거래대금 순위 (FHPST01710000) output -> [{code, name, price, change_rate, amount}]"""
+    return [
+        {
+            "code": row.get("mksc_shrn_iscd", ""),
+            "name": row.get("hts_kor_isnm", ""),
+            "price": to_float(row.get("stck_prpr")),
+            "change_rate": to_float(row.get("prdy_ctrt")),
+            "amount": to_float(row.get("acml_tr_pbmn")),
+        }
+        for row in output or []
+    ]
+
+
+def decode_balance(output1: Optional[List[Dict]], output2: Optional[List[Dict]]) -> Dict:
+    """주식잔고조회 (TTTC8434R) -> {"summary": output2[0], "holdings": 보유수량 > 0 인 output1}"""
+    summary = (output2 or [{}])[0]
+    holdings = [h for h in (output1 or []) if to_int(h.get("hldg_qty")) > 0]
+    return {"summary": summary, "holdings": holdings}
+
+
+def decode_orders(output1: Optional[List[Dict]]) -> List[Dict]:
+    """주식일별주문체결조회 (TTTC8001R) output1 -> [{order_no, code, side, quantity, price, time, filled}]"""
+    return [
+        {
+            "order_no": row.get("odno", ""),
+            "code": row.get("pdno", ""),
+            "side": "sell" if row.get("sll_buy_dvsn_cd") == "01" else "buy",
+            "quantity": to_int(row.get("ord_qty")),
+            "price": to_float(row.get("ord_unpr")),
+            "time": row.get("ord_tmd", ""),
+            "filled": to_int(row.get("tot_ccld_qty")),
+        }
+        for row in output1 or []
+        if row.get("odno")
+    ]
@@ -0,0 +1,284 @@
+"""
+KIS Real-time Feed (Infrastructure Layer)
+
+KIS 실시간 WebSocket으로 체결가(H0STCNT0)와 호가(H0STASP0)를 수신하여
+메모리의 최신 상태 테이블(RealtimeQuoteStore)에 반영합니다.
+HTS ID가 설정되어 있으면 계좌 체결통보(H0STCNI0)도 구독하여 체결 리스너(잔고 갱신 등)에 알립니다.
+
+Spring Boot 비유: @Component + WebSocketClient + ConcurrentHashMap 기반 상태 저장소
+
+- 사용자가 보고 있는 종목(watch)만 구독합니다.
+- KIS 세션당 구독 한도(기본 41건) 안에서, 최근에 조회된 종목을 우선 구독합니다.
+- 일정 시간 조회가 없는 종목은 구독을 해제합니다.
+"""
+from typing import Callable, Dict, List, Optional, Set
+import asyncio
+import json
+import threading
+import time
+
+from app.core.config import settings
+from app.infrastructure.kis_decoders import to_float, to_int
+
+TR_EXECUTION = "H0STCNT0"   # 국내주식 실시간 체결가
+TR_ORDER_BOOK = "H0STASP0"  # 국내주식 실시간 호가
+TR_FILL_NOTICES = ("H0STCNI0", "H0STCNI9")  # 실시간 체결통보 (실전, 모의)
+TRS_PER_SYMBOL = 2
+
+
+def parse_execution(fields: List[str]) -> Dict:
+    """H0STCNT0 레코드 -> 체결 상태 (MKSC_SHRN_ISCD, STCK_CNTG_HOUR, STCK_PRPR, PRDY_VRSS_SIGN, PRDY_VRSS, PRDY_CTRT, ...)"""
+    return {
+        "code": fields[0],
+        "time": fields[1],
+        "price": to_float(fields[2]),
+        "change_amount": to_float(fields[4]),
+        "change_rate": to_float(fields[5]),
+    }
+
+
+def parse_order_book(fields: List[str]) -> Dict:
+    """H0STASP0 레코드 -> 호가 (ASKP1~10, BIDP1~10, ASKP_RSQN1~10, BIDP_RSQN1~10 순)"""
+    return {
+        "code": fields[0],
+        "time": fields[1],
+        "asks": [
+            {"price": to_float(fields[3 + i]), "volume": to_int(fields[23 + i])}
+            for i in range(10)
+        ],
+        "bids": [
+            {"price": to_float(fields[13 + i]), "volume": to_int(fields[33 + i])}
+            for i in range(10)
+        ],
+    }
+
+
+class RealtimeQuoteStore:
+    """종목별 최신 체결가/호가 테이블 (스레드 안전)"""
+
+    def __init__(self):
+        self._prices: Dict[str, Dict] = {}
+        self._books: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def update_price(self, tick: Dict):
+        tick["updated_at"] = time.time()
+        with self._lock:
+            self._prices[tick["code"]] = tick
+
+    def update_order_book(self, book: Dict):
+        book["updated_at"] = time.time()
+        with self._lock:
+            self._books[book["code"]] = book
+
+    def get_price(self, code: str, max_age: float) -> Optional[Dict]:
+        """max_age초 이내에 갱신된 체결 정보만 반환"""
+        with self._lock:
+            tick = self._prices.get(code)
+        if tick and time.time() - tick["updated_at"] <= max_age:
+            return tick
+        return None
+
+    def get_order_book(self, code: str, max_age: float) -> Optional[Dict]:
+        """max_age초 이내에 갱신된 호가만 반환"""
+        with self._lock:
+            book = self._books.get(code)
+        if book and time.time() - book["updated_at"] <= max_age:
+            return book
+        return None
+
+    def discard(self, code: str):
+        with self._lock:
+            self._prices.pop(code, None)
+            self._books.pop(code, None)
+
+
+class KisRealtimeFeed:
+    """
+    KIS 실시간 시세 수신기
+
+    watch(code)가 호출된 종목을 구독하고, 수신한 데이터를 store에 기록합니다.
+    start()/stop()은 애플리케이션 lifespan에서 호출합니다.
+    """
+
+    def __init__(self, repository, store: Optional[RealtimeQuoteStore] = None,
+                 max_subscriptions: Optional[int] = None, idle_timeout: Optional[float] = None):
+        """
+        Args:
+            repository: AsyncKisStockRepository (접속키 발급, WebSocket 주소 제공)
+            store: 최신 상태 테이블
+            max_subscriptions: 세션당 구독 한도 (tr_id x 종목 수)
+            idle_timeout: 이 시간 동안 조회가 없으면 구독 해제 (초)
+        """
+        self._repository = repository
+        self.store = store or RealtimeQuoteStore()
+        limit = max_subscriptions or settings.KIS_REALTIME_MAX_SUBSCRIPTIONS
+        self._max_symbols = max(limit // TRS_PER_SYMBOL, 1)
+        self._idle_timeout = idle_timeout or settings.KIS_REALTIME_IDLE_TIMEOUT
+        self._watched: Dict[str, float] = {}  # code -> 마지막 조회 시각
+        self._subscribed: Set[str] = set()
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._fill_listeners: List[Callable[[], None]] = []
+        self._stats = {"messages": 0, "fills": 0, "reconnects": 0, "subscribe": 0, "unsubscribe": 0}
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def watch(self, code: str):
+        """사용자가 종목을 보고 있음을 알림 (구독 대상 갱신)"""
+        with self._lock:
+            self._watched[code] = time.time()
+
+    def add_fill_listener(self, listener: Callable[[], None]):
+        """체결통보 수신 시 호출할 함수 등록 (이벤트 루프에서 호출되므로 오래 걸리는 작업은 Task로 넘길 것)"""
+        self._fill_listeners.append(listener)
+
+    def is_subscribed(self, code: str) -> bool:
+        return code in self._subscribed
+
+    def desired_symbols(self) -> Set[str]:
+        """구독해야 할 종목: idle_timeout 안에 조회된 종목 중 최근 순으로 한도까지"""
+        now = time.time()
+        with self._lock:
+            for code in [c for c, t in self._watched.items() if now - t > self._idle_timeout]:
+                del self._watched[code]
+            recent = sorted(self._watched.items(), key=lambda item: item[1], reverse=True)
+        return {code for code, _ in recent[: self._max_symbols]}
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._subscribed.clear()
+
+    def stats(self) -> Dict:
+        return {
+            **self._stats,
+            "watched": len(self._watched),
+            "subscribed": sorted(self._subscribed),
+            "max_symbols": self._max_symbols,
+        }
+
+    # ------------------------------------------------------------------
+    # Message handling
+    # ------------------------------------------------------------------
+    def handle_message(self, raw: str) -> Optional[str]:
+        """
+        수신 메시지 처리
+
+        Returns:
+            서버에 그대로 돌려보내야 하는 메시지 (PINGPONG) 또는 None
+        """
+        if raw[:1] in ("0", "1"):
+            # "0|H0STCNT0|001|005930^093000^70000^..." (1: 암호화 - 체결통보 전용)
+            parts = raw.split("|", 3)
+            if len(parts) < 4:
+                return None
+            if parts[1] in TR_FILL_NOTICES:
+                # 본문은 복호화하지 않음: 체결이 있었다는 사실만 알림
+                self._stats["fills"] += 1
+                for listener in self._fill_listeners:
+                    listener()
+                return None
+            if raw[0] == "1":
+                return None
+            tr_id, count, payload = parts[1], to_int(parts[2], 1), parts[3]
+            fields = payload.split("^")
+            width = len(fields) // count if count else len(fields)
+            for i in range(count):
+                record = fields[i * width:(i + 1) * width]
+                if tr_id == TR_EXECUTION:
+                    self.store.update_price(parse_execution(record))
+                elif tr_id == TR_ORDER_BOOK:
+                    self.store.update_order_book(parse_order_book(record))
+            self._stats["messages"] += 1
+            return None
+
+        try:
+            message = json.loads(raw)
+        except ValueError:
+            return None
+        if message.get("header", {}).get("tr_id") == "PINGPONG":
+            return raw
+        return None
+
+    # ------------------------------------------------------------------
+    # Connection loop
+    # ------------------------------------------------------------------
+    async def _run(self):
+        import websockets
+
+        backoff = 1.0
+        while True:
+            # 구독할 종목이 없으면 접속하지 않음
+            if not self.desired_symbols():
+                await asyncio.sleep(1.0)
+                continue
+            try:
+                approval_key = await self._repository.get_approval_key()
+                url = self._repository.websocket_url() + "/tryitout"
+                async with websockets.connect(url, ping_interval=None) as ws:
+                    backoff = 1.0
+                    await asyncio.gather(self._reader(ws), self._subscriber(ws, approval_key))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Realtime feed error: {e}")
+            self._subscribed.clear()
+            self._stats["reconnects"] += 1
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    async def _reader(self, ws):
+        async for raw in ws:
+            reply = self.handle_message(raw)
+            if reply is not None:
+                await ws.send(reply)
+
+    async def _subscriber(self, ws, approval_key: str):
+        fill_notice = self._repository.fill_notice_subscription()
+        if fill_notice is not None:
+            await self._send(ws, approval_key, *fill_notice, register=True)
+        while True:
+            desired = self.desired_symbols()
+            for code in sorted(self._subscribed - desired):
+                await self._send_subscription(ws, approval_key, code, register=False)
+                self._subscribed.discard(code)
+                self.store.discard(code)
+                self._stats["unsubscribe"] += 1
+            for code in sorted(desired - self._subscribed):
+                await self._send_subscription(ws, approval_key, code, register=True)
+                self._subscribed.add(code)
+                self._stats["subscribe"] += 1
+            await asyncio.sleep(0.5)
+
+    @classmethod
+    async def _send_subscription(cls, ws, approval_key: str, code: str, register: bool):
+        for tr_id in (TR_EXECUTION, TR_ORDER_BOOK):
+            await cls._send(ws, approval_key, tr_id, code, register)
+
+    @staticmethod
+    async def _send(ws, approval_key: str, tr_id: str, tr_key: str, register: bool):
+        await ws.send(json.dumps({
+            "header": {
+                "approval_key": approval_key,
+                "custtype": "P",
+                "tr_type": "1" if register else "2",
+                "content-type": "utf-8",
+            },
+            "body": {"input": {"tr_id": tr_id, "tr_key": tr_key}},
+        }))
+
+
+# 싱글톤 인스턴스
+from app.infrastructure.persistence.async_kis_stock_repository import async_kis_stock_repository
+kis_realtime_feed = KisRealtimeFeed(repository=async_kis_stock_repository)
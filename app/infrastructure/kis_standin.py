@@ -0,0 +1,243 @@
+"""
+KIS Stand-in Server (Infrastructure Layer, 개발/부하 테스트용)
+
+KIS REST API를 흉내 내는 로컬 서버입니다. 실제 응답을 한 번 녹화(record)해 두면
+이후에는 인증 정보나 KIS 서버 없이 같은 응답을 결정적으로 재생(replay)합니다.
+Spring Boot 비유: WireMock (record & playback) + 장애 주입(fault injection)
+
+- record: 요청을 실제 KIS(upstream)로 전달하고 응답을 cassette 파일(JSON Lines)에 추가
+- replay: cassette에서 응답을 찾아 반환. 같은 요청이 여러 번 녹화되어 있으면 녹화 순서대로 돌아가며 반환
+  (정확히 같은 요청이 없으면 같은 API/종목의 녹화를 사용, 그래도 없으면 KIS 형식의 오류 응답)
+- 인증(/oauth2/tokenP, /oauth2/Approval)은 녹화하지 않으며 replay에서는 가짜 토큰/접속키를 발급
+- 장애 주입: 고정 지연 + 무작위 jitter, 일정 비율의 HTTP 500, 초당 호출 한도 초과 시 EGW00201 (KIS와 같은 응답)
+- cassette에는 응답 본문만 저장합니다 (appkey/appsecret/토큰 등 요청 헤더와 계좌번호는 저장하지 않음)
+
+실행:
+    python -m app.infrastructure.kis_standin --mode record --cassette .cache/kis_cassette.jsonl
+    python -m app.infrastructure.kis_standin --mode replay --latency 0.05 --jitter 0.05 --rate-limit 2
+그리고 앱은 KIS_BASE_URL=http://127.0.0.1:9443 으로 실행합니다 (settings.KIS_BASE_URL).
+"""
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, List, Optional, Tuple
+import argparse
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+RECORD = "record"
+REPLAY = "replay"
+
+# 요청마다 바뀌어서 재생 키에서 제외하는 값 (분봉 기준 시각, 계좌번호)
+IGNORED_FIELDS = {"FID_INPUT_HOUR_1", "CANO", "ACNT_PRDT_CD"}
+# upstream으로 전달하는 요청 헤더
+FORWARDED_HEADERS = ("content-type", "authorization", "appkey", "appsecret", "tr_id", "tr_cont", "custtype")
+
+RATE_LIMIT_BODY = {"rt_cd": "1", "msg_cd": "EGW00201", "msg1": "초당 거래건수를 초과하였습니다."}
+SERVER_ERROR_BODY = {"rt_cd": "1", "msg_cd": "STANDIN500", "msg1": "injected server error"}
+NOT_RECORDED_BODY = {"rt_cd": "1", "msg_cd": "STANDIN404", "msg1": "no recorded response for this request"}
+
+
+def request_keys(method: str, path: str, tr_id: str, params: Dict, body: Optional[Dict]) -> Tuple[str, str]:
+    """(정확한 재생 키, 같은 API/종목 재생 키)"""
+    fields = {k: v for k, v in {**params, **(body or {})}.items() if k not in IGNORED_FIELDS}
+    code = fields.get("FID_INPUT_ISCD") or fields.get("PDNO") or ""
+    exact = json.dumps([method, path, tr_id, fields], sort_keys=True, ensure_ascii=False)
+    loose = json.dumps([method, path, tr_id, code], ensure_ascii=False)
+    return exact, loose
+
+
+class Cassette:
+    """녹화된 응답 저장소 (JSON Lines 파일, 한 줄에 요청 하나)"""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: cassette 파일 경로 (None이면 메모리에만 보관)
+        """
+        self._path = path
+        self._entries: Dict[str, List[Tuple[int, Dict]]] = {}
+        self._cursors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        self._add(record["keys"], record["status"], record["body"])
+
+    def __len__(self) -> int:
+        return sum(len(v) for k, v in self._entries.items() if k.startswith("exact:"))
+
+    def _add(self, keys: List[str], status: int, body: Dict):
+        for prefix, key in zip(("exact:", "loose:"), keys):
+            self._entries.setdefault(prefix + key, []).append((status, body))
+
+    def record(self, keys: Tuple[str, str], status: int, body: Dict):
+        with self._lock:
+            self._add(list(keys), status, body)
+            if self._path:
+                os.makedirs(os.path.dirname(os.path.abspath(self._path)), exist_ok=True)
+                with open(self._path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps({"keys": list(keys), "status": status, "body": body}, ensure_ascii=False) + "\n")
+
+    def replay(self, keys: Tuple[str, str]) -> Optional[Tuple[int, Dict]]:
+        """녹화된 응답 (같은 키가 여러 개면 녹화 순서대로 순환)"""
+        with self._lock:
+            for key in ("exact:" + keys[0], "loose:" + keys[1]):
+                responses = self._entries.get(key)
+                if responses:
+                    cursor = self._cursors.get(key, 0)
+                    self._cursors[key] = cursor + 1
+                    return responses[cursor % len(responses)]
+        return None
+
+
+class FaultInjector:
+    """지연, 오류, 초당 호출 한도 주입 (seed가 같으면 같은 순서로 발생)"""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 rate_limit: float = 0.0, seed: Optional[int] = 0):
+        """
+        Args:
+            latency: 응답마다 기다리는 시간 (초)
+            jitter: latency에 더하는 0~jitter초 무작위 시간
+            error_rate: HTTP 500을 반환하는 비율 (0~1)
+            rate_limit: 초당 허용 호출 수 (0이면 제한 없음), 넘으면 EGW00201
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self._random = random.Random(seed)
+        self._recent: Deque[float] = deque()
+
+    def check(self) -> Optional[Tuple[int, Dict]]:
+        """주입할 오류 응답 (없으면 None), 요청 도착 시점에 호출"""
+        if self.rate_limit:
+            now = time.monotonic()
+            while self._recent and now - self._recent[0] >= 1.0:
+                self._recent.popleft()
+            if len(self._recent) >= self.rate_limit:
+                return 500, RATE_LIMIT_BODY
+            self._recent.append(now)
+        if self.error_rate and self._random.random() < self.error_rate:
+            return 500, SERVER_ERROR_BODY
+        return None
+
+    def delay(self) -> float:
+        return self.latency + (self._random.random() * self.jitter if self.jitter else 0.0)
+
+
+def create_app(cassette: Cassette, mode: str = REPLAY, upstream: Optional[str] = None,
+               faults: Optional[FaultInjector] = None,
+               upstream_transport: Optional[httpx.AsyncBaseTransport] = None) -> FastAPI:
+    """
+    Stand-in 서버 앱 생성
+
+    Args:
+        cassette: 녹화 저장소
+        mode: RECORD 또는 REPLAY
+        upstream: record 모드에서 요청을 전달할 KIS 주소
+        faults: 장애 주입 설정 (None이면 없음)
+        upstream_transport: upstream httpx transport (테스트에서 MockTransport 주입용)
+    """
+    if mode not in (RECORD, REPLAY):
+        raise ValueError(f"unknown mode: {mode}")
+    if mode == RECORD and not upstream:
+        raise ValueError("record mode requires an upstream URL")
+    faults = faults or FaultInjector()
+    stats = {"requests": 0, "replayed": 0, "recorded": 0, "not_recorded": 0, "rate_limited": 0, "errors": 0}
+    client = httpx.AsyncClient(base_url=upstream or "http://upstream", transport=upstream_transport, timeout=30.0)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        yield
+        await client.aclose()
+
+    app = FastAPI(title="KIS stand-in", lifespan=lifespan)
+
+    @app.get("/standin/stats")
+    async def get_stats():
+        return {**stats, "mode": mode, "recordings": len(cassette)}
+
+    @app.api_route("/{path:path}", methods=["GET", "POST"])
+    async def handle(request: Request, path: str):
+        stats["requests"] += 1
+        path = "/" + path
+        if not path.startswith("/oauth2/"):
+            # 인증 요청에는 장애를 주입하지 않음
+            injected = faults.check()
+            await asyncio.sleep(faults.delay())
+            if injected is not None:
+                stats["rate_limited" if injected[1] is RATE_LIMIT_BODY else "errors"] += 1
+                return JSONResponse(injected[1], status_code=injected[0])
+
+        body = await request.json() if await request.body() else None
+        if mode == REPLAY and path == "/oauth2/tokenP":
+            return {"access_token": "standin-token", "token_type": "Bearer", "expires_in": 86400}
+        if mode == REPLAY and path == "/oauth2/Approval":
+            return {"approval_key": "standin-approval-key"}
+
+        tr_id = request.headers.get("tr_id", "")
+        keys = request_keys(request.method, path, tr_id, dict(request.query_params), body)
+        if mode == REPLAY:
+            recorded = cassette.replay(keys)
+            if recorded is None:
+                stats["not_recorded"] += 1
+                return JSONResponse(NOT_RECORDED_BODY, status_code=404)
+            stats["replayed"] += 1
+            return JSONResponse(recorded[1], status_code=recorded[0])
+
+        res = await client.request(
+            request.method, path, params=dict(request.query_params), json=body,
+            headers={k: v for k, v in request.headers.items() if k.lower() in FORWARDED_HEADERS},
+        )
+        data = res.json()
+        if not path.startswith("/oauth2/"):
+            cassette.record(keys, res.status_code, data)
+            stats["recorded"] += 1
+        return JSONResponse(data, status_code=res.status_code)
+
+    return app
+
+
+def main():
+    from app.core.config import settings
+
+    parser = argparse.ArgumentParser(description="KIS stand-in server (record/replay)")
+    parser.add_argument("--mode", choices=(RECORD, REPLAY), default=REPLAY)
+    parser.add_argument("--cassette", default=settings.KIS_STANDIN_CASSETTE)
+    parser.add_argument("--upstream", default=None, help="record 모드의 KIS 주소 (기본값: kis_devlp.yaml의 KIS_SERVER 주소)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9443)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="초당 허용 호출 수 (0이면 제한 없음)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    upstream = args.upstream
+    if args.mode == RECORD and not upstream:
+        import yaml
+        with open(settings.KIS_CONFIG_PATH, encoding="utf-8") as f:
+            upstream = yaml.safe_load(f)[settings.KIS_SERVER]
+
+    import uvicorn
+    app = create_app(
+        Cassette(args.cassette), mode=args.mode, upstream=upstream,
+        faults=FaultInjector(args.latency, args.jitter, args.error_rate, args.rate_limit, args.seed),
+    )
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
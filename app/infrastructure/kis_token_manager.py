@@ -0,0 +1,190 @@
+"""
+KIS Access Token Manager (Infrastructure Layer)
+
+KIS 접근 토큰을 파일에 보관하여 워커 프로세스와 재시작 사이에 공유하고, 만료 전에 백그라운드에서 재발급합니다.
+Spring Boot 비유: OAuth2AuthorizedClientManager + 파일 기반 OAuth2AuthorizedClientService
+
+- 토큰 발급은 KIS에서도 호출 제한이 있고 느리므로, 파일 잠금(flock)을 잡은 프로세스 하나만 발급하고
+  나머지는 잠금이 풀린 뒤 파일에서 읽습니다.
+- 만료 refresh_ahead초 전부터는 요청은 기존 토큰으로 바로 처리하고, 재발급은 백그라운드 Task 하나가 합니다.
+  요청이 발급을 기다리는 경우는 유효한 토큰이 하나도 없을 때(최초 기동, 만료/거부)뿐입니다.
+- 파일에는 토큰, 만료 시각, 발급한 앱/서버 식별값(앱키 해시)만 저장하며 권한은 0600입니다.
+"""
+from typing import Awaitable, Callable, Optional, Set, Tuple
+import asyncio
+import json
+import os
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# 이 시간(초) 안에 만료되는 토큰은 쓰지 않음 (요청 도중 만료 방지)
+EXPIRY_MARGIN = 60.0
+
+
+class FileLock:
+    """프로세스 간 배타 잠금 (lock 파일에 flock, Windows는 msvcrt.locking)"""
+
+    def __init__(self, path: str):
+        self._path = path
+        self._fd: Optional[int] = None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """
+        잠금을 얻을 때까지 대기 (이벤트 루프에서는 asyncio.to_thread로 호출)
+
+        blocking=False면 기다리지 않고, 다른 프로세스가 잡고 있으면 False를 반환합니다.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self._path)), exist_ok=True)
+        fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+        except OSError:
+            os.close(fd)
+            if blocking:
+                raise
+            return False
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+        return True
+
+    async def acquire_async(self):
+        """스레드에서 잠금 대기 (대기 중 취소되면 잠금을 얻는 즉시 해제)"""
+        acquiring = asyncio.ensure_future(asyncio.to_thread(self.acquire))
+        try:
+            await asyncio.shield(acquiring)
+        except asyncio.CancelledError:
+            acquiring.add_done_callback(lambda f: None if f.cancelled() or f.exception() else self.release())
+            raise
+
+    def release(self):
+        fd, self._fd = self._fd, None
+        if fd is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)
+
+
+class TokenManager:
+    """접근 토큰 캐시 (메모리 -> 파일 -> 발급 순서로 조회)"""
+
+    def __init__(self, issue: Callable[[], Awaitable[Tuple[str, float]]], path: Optional[str] = None,
+                 key: str = "", refresh_ahead: float = 3600.0, retry_interval: float = 60.0):
+        """
+        Args:
+            issue: 토큰 발급 coroutine function -> (토큰, 유효 시간 초)
+            path: 토큰 파일 경로 (None이면 프로세스 메모리에만 보관)
+            key: 앱/서버 식별값 (파일의 key가 다르면 다른 앱의 토큰이므로 사용하지 않음)
+            refresh_ahead: 만료 몇 초 전부터 백그라운드 재발급을 시작할지
+            retry_interval: 백그라운드 재발급 실패 후 다시 시도하기까지의 시간 (초)
+        """
+        self._issue = issue
+        self._path = path
+        self._key = key
+        self._refresh_ahead = refresh_ahead
+        self._retry_interval = retry_interval
+        self._token: Optional[Tuple[str, float]] = None  # (토큰, 만료 시각)
+        self._rejected: Set[str] = set()
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._next_refresh_at = 0.0
+
+    async def get(self) -> str:
+        """유효한 토큰 (만료가 가까우면 기존 토큰을 반환하고 백그라운드 재발급 시작)"""
+        now = time.time()
+        if self._token and now < self._token[1] - EXPIRY_MARGIN:
+            if now >= self._token[1] - self._refresh_ahead:
+                self._schedule_refresh(now)
+            return self._token[0]
+        return await self._renew(now + EXPIRY_MARGIN)
+
+    def invalidate(self, token: str):
+        """KIS가 거부한 토큰 폐기 (파일에 남아 있어도 다시 쓰지 않음)"""
+        self._rejected.add(token)
+        if self._token and self._token[0] == token:
+            self._token = None
+
+    async def aclose(self):
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+    def _schedule_refresh(self, now: float):
+        if (self._refresh_task is not None and not self._refresh_task.done()) or now < self._next_refresh_at:
+            return
+        self._next_refresh_at = now + self._retry_interval
+        self._refresh_task = asyncio.get_running_loop().create_task(self._background_refresh())
+
+    async def _background_refresh(self):
+        try:
+            await self._renew(time.time() + self._refresh_ahead)
+        except Exception as e:
+            # 기존 토큰이 아직 유효하므로 retry_interval 후 다음 요청에서 다시 시도
+            print(f"KIS token refresh failed: {e}")
+
+    async def _renew(self, valid_until: float) -> str:
+        """
+        valid_until 이후까지 유효한 토큰 확보
+
+        같은 프로세스의 코루틴은 asyncio.Lock, 다른 프로세스는 파일 잠금으로 한 번만 발급합니다.
+        잠금을 기다리는 동안 다른 쪽이 발급했으면 그 토큰을 사용합니다.
+        """
+        async with self._lock:
+            if self._token and self._token[1] > valid_until:
+                return self._token[0]
+            file_lock = FileLock(self._path + ".lock") if self._path else None
+            if file_lock is not None:
+                await file_lock.acquire_async()
+            try:
+                stored = self._read()
+                if stored and stored[1] > valid_until:
+                    self._token = stored
+                    return stored[0]
+                token, expires_in = await self._issue()
+                self._token = (token, time.time() + expires_in)
+                self._write(self._token)
+                return token
+            finally:
+                if file_lock is not None:
+                    file_lock.release()
+
+    def _read(self) -> Optional[Tuple[str, float]]:
+        if not self._path or not os.path.exists(self._path):
+            return None
+        try:
+            with open(self._path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("key") != self._key or data["access_token"] in self._rejected:
+                return None
+            return data["access_token"], float(data["expires_at"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write(self, token: Tuple[str, float]):
+        if not self._path:
+            return
+        tmp = f"{self._path}.{os.getpid()}.tmp"
+        try:
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"key": self._key, "access_token": token[0], "expires_at": token[1],
+                           "issued_at": time.time()}, f)
+            os.replace(tmp, self._path)
+        except OSError as e:
+            # 파일 저장 실패는 다음 프로세스가 다시 발급하는 것일 뿐, 현재 요청은 계속 진행
+            print(f"KIS token cache write failed: {e}")
@@ -0,0 +1,422 @@
+"""
+Async KIS Stock Repository (Infrastructure Layer)
+
+AsyncStockRepository 인터페이스의 KIS Open API 구현체입니다.
+Spring Boot 비유: WebClient를 사용하는 @Repository 구현체
+
+kis_client(동기, requests 기반)와 달리 httpx.AsyncClient로 KIS REST API를 직접 호출하므로
+응답을 기다리는 동안 이벤트 루프가 다른 요청을 처리할 수 있습니다.
+응답은 kis_decoders로 DataFrame 없이 바로 도메인 객체로 변환합니다.
+"""
+from typing import Callable, Dict, List, Optional, Tuple
+import asyncio
+import hashlib
+import time
+
+import httpx
+import yaml
+
+from app.core.config import settings
+from app.core.metrics import observe_upstream
+from app.core.rate_limiter import Priority, RateLimiter, kis_rate_limiter, wait_timeout
+from app.core.tracing import span
+from app.domain.models import Order, Stock
+from app.domain.repositories.async_stock_repository import AsyncStockRepository, OrderOutcomeUnknown
+from app.infrastructure.http_pool import http_pool, timeout_for
+from app.infrastructure.kis_token_manager import TokenManager
+from app.infrastructure.stock_master import stock_master
+from app.infrastructure.kis_decoders import (
+    to_int, decode_balance, decode_chart, decode_daily_chart, decode_index, decode_index_chart, decode_order_book,
+    decode_orders, decode_rankings, decode_stock,
+)
+
+
+# 만료/무효 토큰 오류 코드 (받으면 토큰을 폐기하고 다음 요청에서 재발급)
+INVALID_TOKEN_CODES = {"EGW00121", "EGW00123"}
+
+
+class KisApiError(Exception):
+    """KIS API 오류 응답 (rt_cd != "0" 또는 HTTP 오류), code는 KIS msg_cd 또는 HTTP_<상태 코드>"""
+
+    def __init__(self, message: str, code: str = ""):
+        super().__init__(message)
+        self.code = code
+
+
+class AsyncKisStockRepository(AsyncStockRepository):
+    """
+    KIS Open API 기반 비동기 Repository
+
+    - 설정은 kis_devlp.yaml (settings.KIS_CONFIG_PATH)에서 읽습니다.
+    - 접근 토큰은 TokenManager가 관리합니다 (token_cache_path를 주면 파일로 워커/재시작 간 공유).
+    """
+
+    # (모의투자 tr_id, 실전투자 tr_id)
+    _ORDER_TR_IDS = {
+        "buy": ("VTTC0012U", "TTTC0012U"),
+        "sell": ("VTTC0011U", "TTTC0011U"),
+    }
+    _BALANCE_TR_IDS = ("VTTC8434R", "TTTC8434R")
+    _ORDER_INQUIRY_TR_IDS = ("VTTC8001R", "TTTC8001R")
+
+    def __init__(
+        self,
+        config: Optional[Dict] = None,
+        server: Optional[str] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        token_cache_path: Optional[str] = None,
+        name_lookup: Optional[Callable[[str], Optional[str]]] = None,
+    ):
+        """
+        Args:
+            config: kis_devlp.yaml 내용 (None이면 최초 호출 시 파일에서 로드)
+            server: "vps"(모의투자) 또는 "prod"(실전투자), 기본값 settings.KIS_SERVER
+            transport: httpx transport (테스트에서 MockTransport 주입용)
+            rate_limiter: KIS 호출 제한기 (기본값: 전역 kis_rate_limiter)
+            token_cache_path: 접근 토큰 파일 경로 (None이면 프로세스 메모리에만 보관)
+            name_lookup: 종목코드 -> 종목명 (예: 종목 마스터), None을 돌려주면 CTPF1002R로 조회
+        """
+        self._config = config
+        self._server = server or settings.KIS_SERVER
+        self._transport = transport
+        self._rate_limiter = rate_limiter or kis_rate_limiter
+        self._client: Optional[httpx.AsyncClient] = None
+        self._token_cache_path = token_cache_path
+        self._tokens: Optional[TokenManager] = None
+        self._warm_up_task: Optional[asyncio.Task] = None
+        self._name_lookup = name_lookup
+        self._names: Dict[str, str] = {}
+
+    # ------------------------------------------------------------------
+    # Connection / Auth
+    # ------------------------------------------------------------------
+    @property
+    def is_demo(self) -> bool:
+        return self._server == "vps"
+
+    def _get_config(self) -> Dict:
+        if self._config is None:
+            with open(settings.KIS_CONFIG_PATH, encoding="utf-8") as f:
+                self._config = yaml.safe_load(f)
+        return self._config
+
+    def _credentials(self):
+        cfg = self._get_config()
+        if self.is_demo:
+            return cfg["paper_app"], cfg["paper_sec"], cfg["my_paper_stock"], cfg["my_prod"]
+        return cfg["my_app"], cfg["my_sec"], cfg["my_acct_stock"], cfg["my_prod"]
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            cfg = self._get_config()
+            options = dict(
+                base_url=settings.KIS_BASE_URL or cfg[self._server],
+                timeout=settings.KIS_HTTP_TIMEOUT,
+                headers={"User-Agent": cfg.get("my_agent", "")},
+            )
+            # transport를 주입하지 않으면 프로세스 공유 커넥션 풀 사용
+            if self._transport is None:
+                self._client = http_pool.client(**options)
+            else:
+                self._client = httpx.AsyncClient(transport=self._transport, **options)
+        return self._client
+
+    def start(self):
+        """접근 토큰을 백그라운드에서 미리 확보 (애플리케이션 시작 시 호출, 첫 요청이 발급을 기다리지 않도록)"""
+        self._warm_up_task = asyncio.get_running_loop().create_task(self._warm_up())
+
+    async def _warm_up(self):
+        try:
+            await self._get_token()
+        except Exception as e:
+            print(f"KIS token warm-up failed: {e}")
+
+    async def aclose(self):
+        """HTTP 클라이언트, 토큰 갱신 작업 정리 (애플리케이션 종료 시 호출, 공유 풀의 연결은 http_pool.aclose()가 정리)"""
+        if self._warm_up_task is not None:
+            self._warm_up_task.cancel()
+            self._warm_up_task = None
+        if self._tokens is not None:
+            await self._tokens.aclose()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _token_manager(self) -> TokenManager:
+        if self._tokens is None:
+            app_key, _, _, _ = self._credentials()
+            # 파일의 토큰이 같은 앱키/서버(stand-in 포함)로 발급된 것인지 확인하는 값 (앱키 원문은 저장하지 않음)
+            base_url = settings.KIS_BASE_URL or self._get_config()[self._server]
+            key = f"{self._server}:{hashlib.sha256(f'{base_url} {app_key}'.encode()).hexdigest()[:16]}"
+            self._tokens = TokenManager(
+                self._issue_token, path=self._token_cache_path, key=key,
+                refresh_ahead=settings.KIS_TOKEN_REFRESH_AHEAD,
+            )
+        return self._tokens
+
+    async def _get_token(self) -> str:
+        return await self._token_manager().get()
+
+    async def _issue_token(self) -> Tuple[str, float]:
+        app_key, app_secret, _, _ = self._credentials()
+        res = await self._get_client().post(
+            "/oauth2/tokenP",
+            json={"grant_type": "client_credentials", "appkey": app_key, "appsecret": app_secret},
+            timeout=timeout_for("/oauth2/tokenP"),
+        )
+        if res.status_code != 200:
+            raise KisApiError(f"Token issue failed: {res.status_code} {res.text}")
+        body = res.json()
+        return body["access_token"], to_int(body.get("expires_in"), 86400)
+
+    def websocket_url(self) -> str:
+        """실시간 시세 WebSocket 주소 (kis_devlp.yaml의 vops/ops)"""
+        cfg = self._get_config()
+        return cfg["vops"] if self.is_demo else cfg["ops"]
+
+    def fill_notice_subscription(self) -> Optional[Tuple[str, str]]:
+        """실시간 체결통보 구독 정보 (tr_id, HTS ID), kis_devlp.yaml에 my_htsid가 없으면 None"""
+        hts_id = self._get_config().get("my_htsid")
+        if not hts_id:
+            return None
+        return ("H0STCNI9" if self.is_demo else "H0STCNI0"), hts_id
+
+    def account_id(self) -> str:
+        _, _, account, product = self._credentials()
+        return f"{account}-{product}"
+
+    async def get_approval_key(self) -> str:
+        """실시간(WebSocket) 접속키 발급"""
+        app_key, app_secret, _, _ = self._credentials()
+        res = await self._get_client().post(
+            "/oauth2/Approval",
+            json={"grant_type": "client_credentials", "appkey": app_key, "secretkey": app_secret},
+            timeout=timeout_for("/oauth2/Approval"),
+        )
+        if res.status_code != 200:
+            raise KisApiError(f"Approval key issue failed: {res.status_code} {res.text}")
+        return res.json()["approval_key"]
+
+    async def _request(self, method: str, path: str, tr_id: str, priority: Priority,
+                       params: Optional[Dict] = None, body: Optional[Dict] = None) -> Dict:
+        with span("rate_limit.wait"):
+            await self._rate_limiter.acquire_async(priority, timeout=wait_timeout(priority))
+        app_key, app_secret, _, _ = self._credentials()
+        token = await self._get_token()
+        headers = {
+            "content-type": "application/json; charset=utf-8",
+            "authorization": f"Bearer {token}",
+            "appkey": app_key,
+            "appsecret": app_secret,
+            "tr_id": tr_id,
+            "custtype": "P",
+        }
+        with observe_upstream(tr_id), span("kis.request", tr_id=tr_id):
+            res = await self._get_client().request(
+                method, path, headers=headers, params=params, json=body, timeout=timeout_for(path),
+            )
+            if res.status_code != 200:
+                raise KisApiError(f"{tr_id} HTTP {res.status_code}: {res.text}", code=f"HTTP_{res.status_code}")
+            data = res.json()
+            if data.get("rt_cd") != "0":
+                if data.get("msg_cd") in INVALID_TOKEN_CODES:
+                    self._token_manager().invalidate(token)
+                raise KisApiError(f"{tr_id} {data.get('msg_cd', '')}: {data.get('msg1', '')}", code=data.get("msg_cd", ""))
+        return data
+
+    # ------------------------------------------------------------------
+    # Quotations
+    # ------------------------------------------------------------------
+    async def _get_stock_name(self, code: str) -> str:
+        """종목명 조회 (name_lookup에 없으면 CTPF1002R 결과를 프로세스 내 메모)"""
+        name = self._name_lookup(code) if self._name_lookup is not None else None
+        if name:
+            return name
+        if code not in self._names:
+            try:
+                data = await self._request(
+                    "GET", "/uapi/domestic-stock/v1/quotations/search-stock-info", "CTPF1002R", Priority.QUOTE,
+                    params={"PRDT_TYPE_CD": "300", "PDNO": code},
+                )
+                self._names[code] = (data.get("output") or {}).get("prdt_abrv_name") or code
+            except (KisApiError, httpx.HTTPError):
+                return code
+        return self._names[code]
+
+    async def get_stock_price(self, code: str) -> Optional[Stock]:
+        data, name = await asyncio.gather(
+            self._request(
+                "GET", "/uapi/domestic-stock/v1/quotations/inquire-price", "FHKST01010100", Priority.QUOTE,
+                params={"FID_COND_MRKT_DIV_CODE": "J", "FID_INPUT_ISCD": code},
+            ),
+            self._get_stock_name(code),
+        )
+        with span("decode"):
+            return decode_stock(code, name, data.get("output"))
+
+    async def get_order_book(self, code: str) -> Dict:
+        data = await self._request(
+            "GET", "/uapi/domestic-stock/v1/quotations/inquire-asking-price-exp-ccn", "FHKST01010200", Priority.QUOTE,
+            params={"FID_COND_MRKT_DIV_CODE": "J", "FID_INPUT_ISCD": code},
+        )
+        with span("decode"):
+            return decode_order_book(data.get("output1"))
+
+    async def get_stock_chart(self, code: str) -> List[Dict]:
+        data = await self._request(
+            "GET", "/uapi/domestic-stock/v1/quotations/inquire-time-itemchartprice", "FHKST03010200", Priority.CHART,
+            params={
+                "FID_ETC_CLS_CODE": "",
+                "FID_COND_MRKT_DIV_CODE": "J",
+                "FID_INPUT_ISCD": code,
+                "FID_INPUT_HOUR_1": time.strftime("%H%M%S"),
+                "FID_PW_DATA_INCU_YN": "Y",
+            },
+        )
+        with span("decode"):
+            return decode_chart(data.get("output2"))
+
+    async def get_daily_chart(self, code: str, start: int, end: int) -> List[Dict]:
+        # 한 번에 최대 100봉 (end에 가까운 봉부터)
+        data = await self._request(
+            "GET", "/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice", "FHKST03010100", Priority.CHART,
+            params={
+                "FID_COND_MRKT_DIV_CODE": "J",
+                "FID_INPUT_ISCD": code,
+                "FID_INPUT_DATE_1": str(start),
+                "FID_INPUT_DATE_2": str(end),
+                "FID_PERIOD_DIV_CODE": "D",
+                "FID_ORG_ADJ_PRC": "0",
+            },
+        )
+        with span("decode"):
+            return decode_daily_chart(data.get("output2"))
+
+    async def get_index_price(self, code: str) -> Optional[Dict]:
+        data = await self._request(
+            "GET", "/uapi/domestic-stock/v1/quotations/inquire-index-price", "FHPUP02100000", Priority.QUOTE,
+            params={"FID_COND_MRKT_DIV_CODE": "U", "FID_INPUT_ISCD": code},
+        )
+        with span("decode"):
+            return decode_index(data.get("output"))
+
+    async def get_index_chart(self, code: str) -> List[Dict]:
+        data = await self._request(
+            "GET", "/uapi/domestic-stock/v1/quotations/inquire-time-indexchartprice", "FHKUP03500200", Priority.CHART,
+            params={
+                "FID_COND_MRKT_DIV_CODE": "U",
+                "FID_ETC_CLS_CODE": "0",
+                "FID_INPUT_ISCD": code,
+                "FID_INPUT_HOUR_1": "60",  # 봉 간격(초)
+                "FID_PW_DATA_INCU_YN": "Y",
+            },
+        )
+        with span("decode"):
+            return decode_index_chart(data.get("output2"))
+
+    async def get_trade_amount_ranking(self, market: str = "J") -> List[Dict]:
+        # 거래량순위 API의 소속 구분 3 = 거래금액순 (최대 30건)
+        data = await self._request(
+            "GET", "/uapi/domestic-stock/v1/quotations/volume-rank", "FHPST01710000", Priority.RANKING,
+            params={
+                "FID_COND_MRKT_DIV_CODE": market,
+                "FID_COND_SCR_DIV_CODE": "20171",
+                "FID_INPUT_ISCD": "0000",
+                "FID_DIV_CLS_CODE": "0",
+                "FID_BLNG_CLS_CODE": "3",
+                "FID_TRGT_CLS_CODE": "111111111",
+                "FID_TRGT_EXLS_CLS_CODE": "0000000000",
+                "FID_INPUT_PRICE_1": "",
+                "FID_INPUT_PRICE_2": "",
+                "FID_VOL_CNT": "",
+                "FID_INPUT_DATE_1": "",
+            },
+        )
+        with span("decode"):
+            return decode_rankings(data.get("output"))
+
+    # ------------------------------------------------------------------
+    # Trading
+    # ------------------------------------------------------------------
+    async def place_order(self, order: Order) -> Dict:
+        tr_ids = self._ORDER_TR_IDS.get(order.order_type)
+        if tr_ids is None:
+            return {"error": f"Unknown order type: {order.order_type}"}
+        _, _, account, product = self._credentials()
+        body = {
+            "CANO": account,
+            "ACNT_PRDT_CD": product,
+            "PDNO": order.stock_code,
+            "ORD_DVSN": order.order_dvsn,
+            "ORD_QTY": str(order.quantity),
+            # 시장가(01)/장전·장후 시간외(05, 06)는 가격 0
+            "ORD_UNPR": "0" if order.order_dvsn in ("01", "05", "06") else str(int(order.price)),
+        }
+        try:
+            data = await self._request(
+                "POST", "/uapi/domestic-stock/v1/trading/order-cash",
+                tr_ids[0] if self.is_demo else tr_ids[1], Priority.ORDER, body=body,
+            )
+        except KisApiError as e:
+            return {"error": str(e)}
+        except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+            # 연결 전 실패: 주문이 전송되지 않음
+            return {"error": f"Order not sent: {e!r}"}
+        except httpx.TransportError as e:
+            # 요청을 보낸 뒤 실패: KIS에 접수되었을 수 있음
+            raise OrderOutcomeUnknown(f"Order outcome unknown: {e!r}") from e
+        return {**(data.get("output") or {}), "msg1": data.get("msg1", "")}
+
+    async def get_today_orders(self) -> Optional[List[Dict]]:
+        """당일 주문 내역 (첫 페이지 최대 100건, 최근 주문 확인용)"""
+        _, _, account, product = self._credentials()
+        today = time.strftime("%Y%m%d")
+        data = await self._request(
+            "GET", "/uapi/domestic-stock/v1/trading/inquire-daily-ccld",
+            self._ORDER_INQUIRY_TR_IDS[0] if self.is_demo else self._ORDER_INQUIRY_TR_IDS[1], Priority.BALANCE,
+            params={
+                "CANO": account,
+                "ACNT_PRDT_CD": product,
+                "INQR_STRT_DT": today,
+                "INQR_END_DT": today,
+                "SLL_BUY_DVSN_CD": "00",
+                "INQR_DVSN": "00",
+                "PDNO": "",
+                "CCLD_DVSN": "00",
+                "ORD_GNO_BRNO": "",
+                "ODNO": "",
+                "INQR_DVSN_3": "00",
+                "INQR_DVSN_1": "",
+                "CTX_AREA_FK100": "",
+                "CTX_AREA_NK100": "",
+            },
+        )
+        return decode_orders(data.get("output1"))
+
+    async def get_balance(self) -> Dict:
+        _, _, account, product = self._credentials()
+        data = await self._request(
+            "GET", "/uapi/domestic-stock/v1/trading/inquire-balance",
+            self._BALANCE_TR_IDS[0] if self.is_demo else self._BALANCE_TR_IDS[1], Priority.BALANCE,
+            params={
+                "CANO": account,
+                "ACNT_PRDT_CD": product,
+                "AFHR_FLPR_YN": "N",
+                "OFL_YN": "",
+                "INQR_DVSN": "02",
+                "UNPR_DVSN": "01",
+                "FUND_STTL_ICLD_YN": "N",
+                "FNCG_AMT_AUTO_RDPT_YN": "N",
+                "PRCS_DVSN": "00",
+                "CTX_AREA_FK100": "",
+                "CTX_AREA_NK100": "",
+            },
+        )
+        return decode_balance(data.get("output1"), data.get("output2"))
+
+
+# 싱글톤 인스턴스 (종목명은 종목 마스터가 적재되어 있으면 upstream 호출 없이 사용)
+async_kis_stock_repository = AsyncKisStockRepository(
+    token_cache_path=settings.KIS_TOKEN_CACHE_PATH or None, name_lookup=stock_master.name_of,
+)
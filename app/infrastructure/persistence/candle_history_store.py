@@ -0,0 +1,135 @@
+"""
+Candle History Store (Infrastructure Layer)
+
+일봉/분봉을 종목별로 SQLite 파일에 보관합니다. 재시작 후에도 차트를 KIS 호출 없이 다시 만들 수 있고,
+여러 해의 일봉 범위 조회도 로컬에서 처리합니다.
+Spring Boot 비유: 임베디드 DB(H2/SQLite)를 쓰는 JdbcTemplate 기반 저장소
+
+- 테이블 candles: (series, interval, ts) 기본키, WITHOUT ROWID (기본키 순서로 저장되어 범위 조회가 빠름)
+- 테이블 coverage: 시리즈별로 upstream에서 받아온 구간 (어디까지 받았는지 기록, 빈 날짜 재조회 방지)
+- ts는 CandleBuffer와 같은 정수 시각 (일봉 YYYYMMDD, 분봉 YYYYMMDDHHMMSS)
+"""
+from typing import Dict, List, Optional, Tuple
+import os
+import sqlite3
+import threading
+
+from app.core.candles import bar_key, row_of
+
+DAILY = "1d"
+MINUTE = "1m"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS candles (
+    series TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    price REAL NOT NULL,
+    volume INTEGER NOT NULL,
+    PRIMARY KEY (series, interval, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS coverage (
+    series TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    start_ts INTEGER NOT NULL,
+    end_ts INTEGER NOT NULL,
+    PRIMARY KEY (series, interval)
+) WITHOUT ROWID;
+"""
+
+
+class CandleHistoryStore:
+    """
+    SQLite 기반 봉 저장소 (스레드 안전)
+
+    메서드는 모두 동기이며, async 코드에서는 asyncio.to_thread로 호출합니다.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: SQLite 파일 경로 (":memory:"면 메모리 DB), 파일은 처음 사용할 때 만듦
+        """
+        self._path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _db(self) -> sqlite3.Connection:
+        """연결 (없으면 파일/스키마 생성, self._lock을 잡은 상태에서 호출)"""
+        if self._conn is None:
+            if self._path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self._path)), exist_ok=True)
+            conn = sqlite3.connect(self._path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def upsert(self, series: str, interval: str, rows: List[Dict]) -> int:
+        """차트 행 저장 (같은 시각은 덮어씀), 저장한 행 수 반환"""
+        values = [
+            (series, interval, ts, float(row.get("price") or 0), int(row.get("volume") or 0))
+            for row, ts in ((row, bar_key(row)) for row in rows)
+            if ts is not None
+        ]
+        if not values:
+            return 0
+        with self._lock:
+            conn = self._db()
+            conn.execute("BEGIN")
+            conn.executemany(
+                "INSERT OR REPLACE INTO candles (series, interval, ts, price, volume) VALUES (?, ?, ?, ?, ?)",
+                values,
+            )
+            conn.execute("COMMIT")
+        return len(values)
+
+    def range(self, series: str, interval: str, start: Optional[int] = None,
+              end: Optional[int] = None) -> List[Dict]:
+        """[start, end] 구간의 봉 (시각 오름차순, 경계 포함)"""
+        with self._lock:
+            cursor = self._db().execute(
+                "SELECT ts, price, volume FROM candles WHERE series = ? AND interval = ? AND ts BETWEEN ? AND ? "
+                "ORDER BY ts",
+                (series, interval, start if start is not None else 0, end if end is not None else 2 ** 62),
+            )
+            return [row_of(ts, price, volume) for ts, price, volume in cursor]
+
+    def last_ts(self, series: str, interval: str) -> Optional[int]:
+        with self._lock:
+            row = self._db().execute(
+                "SELECT MAX(ts) FROM candles WHERE series = ? AND interval = ?", (series, interval)
+            ).fetchone()
+        return row[0]
+
+    def coverage(self, series: str, interval: str) -> Optional[Tuple[int, int]]:
+        """upstream에서 받아온 구간 (start_ts, end_ts), 없으면 None"""
+        with self._lock:
+            row = self._db().execute(
+                "SELECT start_ts, end_ts FROM coverage WHERE series = ? AND interval = ?", (series, interval)
+            ).fetchone()
+        return tuple(row) if row else None
+
+    def extend_coverage(self, series: str, interval: str, start_ts: int, end_ts: int):
+        """받아온 구간을 기존 구간과 합침"""
+        with self._lock:
+            self._db().execute(
+                "INSERT INTO coverage (series, interval, start_ts, end_ts) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (series, interval) DO UPDATE SET "
+                "start_ts = MIN(start_ts, excluded.start_ts), end_ts = MAX(end_ts, excluded.end_ts)",
+                (series, interval, start_ts, end_ts),
+            )
+
+    def stats(self) -> Dict:
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT interval, COUNT(DISTINCT series), COUNT(*) FROM candles GROUP BY interval"
+            ).fetchall()
+        return {interval: {"series": series, "bars": bars} for interval, series, bars in rows}
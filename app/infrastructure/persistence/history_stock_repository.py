@@ -0,0 +1,161 @@
+"""
+History Stock Repository (Infrastructure Layer)
+
+AsyncStockRepository 구현체를 감싸서 차트(분봉/일봉)를 CandleHistoryStore(SQLite)에서 먼저 읽고,
+로컬에 없는 뒷부분(또는 앞부분)만 upstream에 요청합니다.
+Spring Boot 비유: 로컬 DB를 먼저 조회하는 read-through @Repository 데코레이터
+
+- 분봉: 오늘 봉이 현재 시각(장 마감 후는 15:30)까지 있으면 upstream을 호출하지 않음
+- 일봉: coverage(받아온 구간) 밖의 구간만 페이지 단위로 받아서 저장.
+  오늘 일봉은 장중에 계속 바뀌므로 coverage에 넣지 않고 매번 다시 받음
+"""
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import asyncio
+import time
+
+from app.core.candles import bar_key
+from app.core.config import settings
+from app.domain.models import Order, Stock
+from app.domain.repositories.async_stock_repository import AsyncStockRepository
+from app.infrastructure.persistence.candle_history_store import DAILY, MINUTE, CandleHistoryStore
+
+MARKET_OPEN = 90000    # 정규장 시작 (HHMMSS)
+MARKET_CLOSE = 153000  # 정규장 마감 (HHMMSS)
+
+
+def parse_ts(ts: int) -> datetime:
+    """YYYYMMDDHHMMSS 정수 시각 -> datetime (HHMMSS끼리 빼면 시 경계에서 분 단위가 맞지 않음)"""
+    return datetime.strptime(f"{ts:014d}", "%Y%m%d%H%M%S")
+
+
+def shift_date(yyyymmdd: int, days: int) -> int:
+    """YYYYMMDD 정수 날짜에 days일을 더함"""
+    date = datetime.strptime(str(yyyymmdd), "%Y%m%d") + timedelta(days=days)
+    return int(date.strftime("%Y%m%d"))
+
+
+def last_session_ts(now: datetime) -> int:
+    """
+    now 시점에 분봉이 있어야 하는 마지막 시각 (YYYYMMDDHHMMSS)
+
+    장중이면 현재 시각, 장 마감 후면 당일 15:30, 주말/장 시작 전이면 직전 평일 15:30.
+    휴장일 달력은 없으므로 평일 휴장일에는 upstream을 다시 확인합니다.
+    """
+    hhmmss = int(now.strftime("%H%M%S"))
+    if now.weekday() < 5 and hhmmss >= MARKET_OPEN:
+        return int(now.strftime("%Y%m%d")) * 1_000_000 + min(hhmmss, MARKET_CLOSE)
+    day = now - timedelta(days=1)
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return int(day.strftime("%Y%m%d")) * 1_000_000 + MARKET_CLOSE
+
+
+class HistoryStockRepository(AsyncStockRepository):
+    """차트는 로컬 저장소 우선, 나머지 호출은 그대로 위임"""
+
+    def __init__(self, delegate: AsyncStockRepository, store: CandleHistoryStore,
+                 max_pages: Optional[int] = None):
+        """
+        Args:
+            delegate: REST 기반 AsyncStockRepository
+            store: 봉 저장소
+            max_pages: 일봉 조회 한 번에 upstream에 요청하는 최대 페이지 수
+        """
+        self._delegate = delegate
+        self._store = store
+        self._max_pages = max_pages or settings.CANDLE_HISTORY_MAX_PAGES
+
+    async def get_stock_price(self, code: str) -> Optional[Stock]:
+        return await self._delegate.get_stock_price(code)
+
+    async def get_stock_prices(self, codes: List[str]) -> Dict[str, Optional[Stock]]:
+        return await self._delegate.get_stock_prices(codes)
+
+    async def get_order_book(self, code: str) -> Dict:
+        return await self._delegate.get_order_book(code)
+
+    async def get_index_price(self, code: str) -> Optional[Dict]:
+        return await self._delegate.get_index_price(code)
+
+    async def get_index_chart(self, code: str) -> List[Dict]:
+        return await self._delegate.get_index_chart(code)
+
+    async def get_trade_amount_ranking(self, market: str = "J") -> List[Dict]:
+        return await self._delegate.get_trade_amount_ranking(market)
+
+    async def place_order(self, order: Order) -> Dict:
+        return await self._delegate.place_order(order)
+
+    async def get_today_orders(self) -> Optional[List[Dict]]:
+        return await self._delegate.get_today_orders()
+
+    async def get_balance(self) -> Dict:
+        return await self._delegate.get_balance()
+
+    def account_id(self) -> str:
+        return self._delegate.account_id()
+
+    # ------------------------------------------------------------------
+    # Intraday
+    # ------------------------------------------------------------------
+    async def get_stock_chart(self, code: str) -> List[Dict]:
+        """가장 최근 거래일의 분봉 (로컬에 마지막 거래 시각까지 있으면 upstream 호출 없음)"""
+        target = last_session_ts(datetime(*time.localtime()[:6]))
+        last = await asyncio.to_thread(self._store.last_ts, code, MINUTE)
+        # 마지막 봉이 1분 이내면 최신 상태
+        if last is None or parse_ts(target) - parse_ts(last) > timedelta(minutes=1):
+            rows = await self._delegate.get_stock_chart(code)
+            await asyncio.to_thread(self._store.upsert, code, MINUTE, rows)
+            last = await asyncio.to_thread(self._store.last_ts, code, MINUTE)
+        if last is None:
+            return []
+        day_start = last // 1_000_000 * 1_000_000
+        return await asyncio.to_thread(self._store.range, code, MINUTE, day_start, day_start + 999_999)
+
+    # ------------------------------------------------------------------
+    # Daily
+    # ------------------------------------------------------------------
+    async def get_daily_chart(self, code: str, start: int, end: int) -> List[Dict]:
+        """[start, end] 일봉 (coverage 밖의 구간만 upstream 조회)"""
+        if start > end:
+            raise ValueError(f"start ({start}) is after end ({end})")
+        today = int(time.strftime("%Y%m%d"))
+        coverage = await asyncio.to_thread(self._store.coverage, code, DAILY)
+        # (시작, 끝, 일부만 받아도 coverage와 이어지는지)
+        if coverage is None:
+            missing = [(start, end, True)]
+        else:
+            covered_start, covered_end = coverage
+            missing = []
+            if start < covered_start:
+                missing.append((start, shift_date(covered_start, -1), True))
+            if end > covered_end:
+                missing.append((shift_date(covered_end, 1), end, False))
+        for missing_start, missing_end, partial_ok in missing:
+            await self._fetch_daily(code, missing_start, missing_end, today, partial_ok)
+        return await asyncio.to_thread(self._store.range, code, DAILY, start, end)
+
+    async def _fetch_daily(self, code: str, start: int, end: int, today: int, partial_ok: bool):
+        """
+        end부터 과거 방향으로 페이지 단위 조회 후 저장, 받은 구간을 coverage에 기록
+
+        max_pages 안에 start까지 받지 못했을 때, 받은 구간이 기존 coverage와 떨어져 있으면
+        (partial_ok=False) coverage를 늘리지 않습니다 (봉은 저장되고, 다음 조회에서 다시 채움).
+        """
+        page_end, covered_from = end, None
+        for _ in range(self._max_pages):
+            rows = await self._delegate.get_daily_chart(code, start, page_end)
+            await asyncio.to_thread(self._store.upsert, code, DAILY, rows)
+            oldest = bar_key(rows[0]) if rows else None
+            if oldest is None or oldest <= start:
+                covered_from = start
+                break
+            covered_from = oldest
+            page_end = shift_date(oldest, -1)
+        # 오늘 봉은 아직 확정되지 않았으므로 coverage는 어제까지만
+        covered_to = min(end, shift_date(today, -1))
+        if covered_from != start and not partial_ok:
+            return
+        if covered_from is not None and covered_from <= covered_to:
+            await asyncio.to_thread(self._store.extend_coverage, code, DAILY, covered_from, covered_to)
@@ -0,0 +1,41 @@
+"""
+Rate-Limited Stock Repository (Infrastructure Layer)
+
+임의의 StockRepository 구현체를 감싸서 모든 호출이 전역 KIS rate limiter를 거치게 합니다.
+Spring Boot 비유: @RateLimiter AOP 프록시 (데코레이터 패턴)
+"""
+from typing import Dict, List, Optional
+from app.core.rate_limiter import Priority, RateLimiter, kis_rate_limiter, wait_timeout
+from app.domain.models import Order, Stock
+from app.domain.repositories.stock_repository import StockRepository
+
+
+class RateLimitedStockRepository(StockRepository):
+    """호출 종류별 우선순위로 토큰을 받은 뒤 내부 Repository에 위임"""
+
+    def __init__(self, delegate: StockRepository, rate_limiter: Optional[RateLimiter] = None):
+        self._delegate = delegate
+        self._rate_limiter = rate_limiter or kis_rate_limiter
+
+    def _acquire(self, priority: Priority):
+        self._rate_limiter.acquire(priority, timeout=wait_timeout(priority))
+
+    def get_stock_price(self, code: str) -> Optional[Stock]:
+        self._acquire(Priority.QUOTE)
+        return self._delegate.get_stock_price(code)
+
+    def get_order_book(self, code: str) -> Dict:
+        self._acquire(Priority.QUOTE)
+        return self._delegate.get_order_book(code)
+
+    def get_stock_chart(self, code: str) -> List[Dict]:
+        self._acquire(Priority.CHART)
+        return self._delegate.get_stock_chart(code)
+
+    def place_order(self, order: Order) -> Dict:
+        self._acquire(Priority.ORDER)
+        return self._delegate.place_order(order)
+
+    def get_balance(self) -> Dict:
+        self._acquire(Priority.BALANCE)
+        return self._delegate.get_balance()
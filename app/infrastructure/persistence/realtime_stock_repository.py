@@ -0,0 +1,118 @@
+"""
+Realtime Stock Repository (Infrastructure Layer)
+
+AsyncStockRepository 구현체를 감싸서, 실시간 피드(KisRealtimeFeed)에 최신 데이터가 있으면
+REST 호출 없이 메모리에서 현재가/호가를 반환합니다.
+Spring Boot 비유: 캐시 우선 조회를 하는 @Repository 데코레이터
+
+조회된 종목은 feed.watch()로 구독 대상이 되며, 실시간 데이터가 아직 없거나 오래되었으면
+내부 Repository(REST)로 위임합니다.
+"""
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from app.core.config import settings
+from app.domain.models import Order, Stock
+from app.domain.repositories.async_stock_repository import AsyncStockRepository
+
+
+class RealtimeStockRepository(AsyncStockRepository):
+    """실시간 상태 테이블 우선, 없으면 REST 위임"""
+
+    def __init__(self, delegate: AsyncStockRepository, feed, max_age: Optional[float] = None,
+                 max_base_stocks: Optional[int] = None):
+        """
+        Args:
+            delegate: REST 기반 AsyncStockRepository
+            feed: KisRealtimeFeed
+            max_age: 실시간 데이터를 사용할 수 있는 최대 경과 시간 (초)
+            max_base_stocks: 마지막 REST 응답을 보관하는 최대 종목 수 (기본값: 실시간 구독 한도)
+        """
+        self._delegate = delegate
+        self._feed = feed
+        self._max_age = max_age or settings.KIS_REALTIME_MAX_AGE
+        # 종목명 등 실시간 피드에 없는 필드를 채우기 위한 마지막 REST 응답
+        # (최근 조회 순 LRU: 피드도 최근 조회된 종목부터 구독하므로 구독 한도만큼이면 충분)
+        self._base_stocks: "OrderedDict[str, Stock]" = OrderedDict()
+        self._max_base_stocks = max_base_stocks or settings.KIS_REALTIME_MAX_SUBSCRIPTIONS
+
+    def _realtime_stock(self, code: str) -> Optional[Stock]:
+        """실시간 체결가를 마지막 REST 응답에 덮어쓴 Stock (데이터가 없거나 오래되었으면 None)"""
+        self._feed.watch(code)
+        tick = self._feed.store.get_price(code, self._max_age)
+        base = self._base_stocks.get(code)
+        if base:
+            self._base_stocks.move_to_end(code)
+        if tick and base:
+            return base.model_copy(update={
+                "price": tick["price"],
+                "change_amount": tick["change_amount"],
+                "change_rate": tick["change_rate"],
+            })
+        return None
+
+    async def get_stock_price(self, code: str) -> Optional[Stock]:
+        stock = self._realtime_stock(code)
+        if stock:
+            return stock
+        stock = await self._delegate.get_stock_price(code)
+        if stock:
+            self._remember(code, stock)
+        return stock
+
+    async def get_stock_prices(self, codes: List[str]) -> Dict[str, Optional[Stock]]:
+        """실시간 데이터가 있는 종목은 메모리에서, 나머지만 REST로 일괄 조회"""
+        results: Dict[str, Optional[Stock]] = {}
+        misses = []
+        for code in codes:
+            stock = self._realtime_stock(code)
+            if stock:
+                results[code] = stock
+            else:
+                misses.append(code)
+        if misses:
+            fetched = await self._delegate.get_stock_prices(misses)
+            for code, stock in fetched.items():
+                if stock:
+                    self._remember(code, stock)
+            results.update(fetched)
+        return results
+
+    def _remember(self, code: str, stock: Stock):
+        self._base_stocks[code] = stock
+        self._base_stocks.move_to_end(code)
+        while len(self._base_stocks) > self._max_base_stocks:
+            self._base_stocks.popitem(last=False)
+
+    async def get_order_book(self, code: str) -> Dict:
+        self._feed.watch(code)
+        book = self._feed.store.get_order_book(code, self._max_age)
+        if book:
+            return {"asks": book["asks"], "bids": book["bids"]}
+        return await self._delegate.get_order_book(code)
+
+    async def get_stock_chart(self, code: str) -> List[Dict]:
+        return await self._delegate.get_stock_chart(code)
+
+    async def get_daily_chart(self, code: str, start: int, end: int) -> List[Dict]:
+        return await self._delegate.get_daily_chart(code, start, end)
+
+    async def get_index_price(self, code: str) -> Optional[Dict]:
+        return await self._delegate.get_index_price(code)
+
+    async def get_index_chart(self, code: str) -> List[Dict]:
+        return await self._delegate.get_index_chart(code)
+
+    async def get_trade_amount_ranking(self, market: str = "J") -> List[Dict]:
+        return await self._delegate.get_trade_amount_ranking(market)
+
+    async def place_order(self, order: Order) -> Dict:
+        return await self._delegate.place_order(order)
+
+    async def get_today_orders(self) -> Optional[List[Dict]]:
+        return await self._delegate.get_today_orders()
+
+    async def get_balance(self) -> Dict:
+        return await self._delegate.get_balance()
+
+    def account_id(self) -> str:
+        return self._delegate.account_id()
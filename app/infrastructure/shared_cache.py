@@ -0,0 +1,196 @@
+"""
+Redis Protocol Shared Cache (Infrastructure Layer)
+
+SharedCache 인터페이스의 Redis 프로토콜(RESP2) 구현체입니다. 별도 라이브러리 없이
+asyncio 스트림으로 GET / SET (PX, NX) / DEL / SCAN 명령과 아래 두 Lua 스크립트(EVAL)만 사용합니다.
+Spring Boot 비유: Lettuce 커넥션 (RedisTemplate 중 get/set/setIfAbsent/delete만 사용)
+
+- Redis 또는 로컬 stand-in(app/infrastructure/shared_cache_server.py)에 연결합니다.
+- 연결은 요청마다 하나씩 빌려 쓰고 돌려받으며, 놀고 있는 연결은 pool_size개까지 보관합니다.
+- 연결/응답 오류가 나면 retry_after초 동안 시도하지 않고 바로 SharedCacheUnavailable을 발생시킵니다
+  (공유 캐시 장애 중에도 요청마다 연결 timeout을 기다리지 않음).
+"""
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+import asyncio
+import time
+
+from app.core.config import settings
+from app.core.shared_cache import SharedCache, SharedCacheUnavailable
+
+
+# 값이 같을 때만 삭제 (잠금 해제: GET 후 DEL 사이에 잠금이 만료되어 다른 워커가 잡아도 지우지 않음)
+DELETE_IF_EQUALS_SCRIPT = (
+    "if redis.call('GET', KEYS[1]) == ARGV[1] then return redis.call('DEL', KEYS[1]) else return 0 end"
+)
+# INCRBY 후 만료 시간이 없으면(새 키) PEXPIRE 설정
+INCR_SCRIPT = (
+    "local n = redis.call('INCRBY', KEYS[1], ARGV[1]) "
+    "if redis.call('PTTL', KEYS[1]) < 0 then redis.call('PEXPIRE', KEYS[1], ARGV[2]) end "
+    "return n"
+)
+
+
+class RespError(Exception):
+    """서버가 돌려준 오류 응답 (-ERR ...)"""
+
+
+def encode_command(*args) -> bytes:
+    """명령을 RESP 배열로 인코딩"""
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+async def read_reply(reader: asyncio.StreamReader):
+    """RESP 응답 하나 읽기 (bulk string은 bytes, 오류 응답은 RespError 객체로 반환)"""
+    line = await reader.readline()
+    if not line.endswith(b"\r\n"):
+        raise ConnectionError("connection closed")
+    kind, payload = line[:1], line[1:-2]
+    if kind == b"+":
+        return payload.decode()
+    if kind == b"-":
+        return RespError(payload.decode())
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        length = int(payload)
+        if length < 0:
+            return None
+        return (await reader.readexactly(length + 2))[:-2]
+    if kind == b"*":
+        length = int(payload)
+        return None if length < 0 else [await read_reply(reader) for _ in range(length)]
+    raise ConnectionError(f"invalid reply: {line[:20]!r}")
+
+
+class RespSharedCache(SharedCache):
+    """Redis 프로토콜 공유 캐시 클라이언트"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 6379, db: int = 0,
+                 password: Optional[str] = None, timeout: float = 1.0,
+                 retry_after: float = 5.0, pool_size: int = 8):
+        """
+        Args:
+            timeout: 연결/명령 하나의 최대 대기 시간 (초)
+            retry_after: 오류 후 다시 연결을 시도하기까지 기다리는 시간 (초)
+            pool_size: 보관하는 유휴 연결 수
+        """
+        self._host = host
+        self._port = port
+        self._db = db
+        self._password = password
+        self._timeout = timeout
+        self._retry_after = retry_after
+        self._pool_size = pool_size
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._down_until = 0.0
+        self._stats = {"commands": 0, "connects": 0, "errors": 0}
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RespSharedCache":
+        """redis://[:password@]host[:port][/db]"""
+        parsed = urlparse(url)
+        if parsed.scheme != "redis":
+            raise ValueError(f"unsupported shared cache URL: {url}")
+        db = parsed.path.strip("/")
+        return cls(
+            host=parsed.hostname or "127.0.0.1", port=parsed.port or 6379, db=int(db) if db else 0,
+            password=parsed.password, **kwargs,
+        )
+
+    async def _connect(self):
+        reader, writer = await asyncio.open_connection(self._host, self._port)
+        self._stats["connects"] += 1
+        commands = []
+        if self._password:
+            commands.append(("AUTH", self._password))
+        if self._db:
+            commands.append(("SELECT", self._db))
+        for command in commands:
+            writer.write(encode_command(*command))
+            reply = await read_reply(reader)
+            if isinstance(reply, RespError):
+                writer.close()
+                raise ConnectionError(f"{command[0]} failed: {reply}")
+        return reader, writer
+
+    async def _command(self, *args):
+        if time.monotonic() < self._down_until:
+            raise SharedCacheUnavailable("shared cache is unavailable (retrying later)")
+        connection = self._idle.pop() if self._idle else None
+        try:
+            if connection is None:
+                connection = await asyncio.wait_for(self._connect(), self._timeout)
+            reader, writer = connection
+            writer.write(encode_command(*args))
+            reply = await asyncio.wait_for(read_reply(reader), self._timeout)
+        except (OSError, EOFError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError) as e:
+            self._close(connection)
+            self._stats["errors"] += 1
+            self._down_until = time.monotonic() + self._retry_after
+            raise SharedCacheUnavailable(f"shared cache {self._host}:{self._port}: {e!r}") from e
+        except BaseException:
+            # 취소 등으로 응답을 다 읽지 못한 연결은 재사용하지 않음
+            self._close(connection)
+            raise
+        self._stats["commands"] += 1
+        if len(self._idle) < self._pool_size:
+            self._idle.append(connection)
+        else:
+            self._close(connection)
+        if isinstance(reply, RespError):
+            raise SharedCacheUnavailable(f"shared cache {self._host}:{self._port}: {reply}")
+        return reply
+
+    @staticmethod
+    def _close(connection):
+        if connection is not None:
+            connection[1].close()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._command("GET", key)
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        await self._command("SET", key, value, "PX", max(int(ttl * 1000), 1))
+
+    async def add(self, key: str, value: bytes, ttl: float) -> bool:
+        return await self._command("SET", key, value, "PX", max(int(ttl * 1000), 1), "NX") == "OK"
+
+    async def delete(self, key: str):
+        await self._command("DEL", key)
+
+    async def delete_if_equals(self, key: str, value: bytes) -> bool:
+        return await self._command("EVAL", DELETE_IF_EQUALS_SCRIPT, 1, key, value) == 1
+
+    async def delete_matching(self, pattern: str) -> int:
+        cursor, deleted = b"0", 0
+        while True:
+            cursor, keys = await self._command("SCAN", cursor, "MATCH", pattern, "COUNT", 500)
+            if keys:
+                deleted += await self._command("DEL", *keys)
+            if cursor == b"0":
+                return deleted
+
+    async def incr(self, key: str, amount: int, ttl: float) -> int:
+        return await self._command("EVAL", INCR_SCRIPT, 1, key, amount, max(int(ttl * 1000), 1))
+
+    async def aclose(self):
+        while self._idle:
+            self._close(self._idle.pop())
+
+    def stats(self) -> Dict:
+        return {
+            **self._stats,
+            "idle_connections": len(self._idle),
+            "available": time.monotonic() >= self._down_until,
+        }
+
+
+# 싱글톤 인스턴스 (settings.SHARED_CACHE_URL이 비어 있으면 None: 워커별 메모리 캐시만 사용)
+shared_cache: Optional[RespSharedCache] = (
+    RespSharedCache.from_url(settings.SHARED_CACHE_URL) if settings.SHARED_CACHE_URL else None
+)
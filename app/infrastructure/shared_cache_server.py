@@ -0,0 +1,184 @@
+"""
+Shared Cache Stand-in Server (Infrastructure Layer, 개발/단일 호스트용)
+
+Redis가 없는 환경에서 워커 간 공유 캐시로 쓰는 작은 Redis 프로토콜 서버입니다.
+RespSharedCache가 사용하는 명령(GET, SET [PX|EX] [NX], DEL, SCAN)과 PING, SELECT, AUTH, DBSIZE, FLUSHDB만 지원합니다.
+EVAL은 Lua를 실행하지 않고, RespSharedCache가 보내는 스크립트 두 개(compare-and-delete, INCR+만료)만
+같은 동작의 파이썬 코드로 실행합니다 (한 이벤트 루프에서 처리하므로 Redis처럼 원자적).
+Spring Boot 비유: 테스트용 embedded Redis
+
+- 데이터는 메모리에만 있으며 재시작하면 사라집니다 (캐시이므로 문제없음).
+- 만료된 키는 조회할 때, 그리고 SET 명령 SWEEP_EVERY번마다 한꺼번에 정리합니다.
+- SELECT/AUTH는 항상 성공하며 DB를 나누지 않습니다.
+
+실행:
+    python -m app.infrastructure.shared_cache_server --port 6390
+그리고 앱은 SHARED_CACHE_URL=redis://127.0.0.1:6390 으로 여러 워커를 실행합니다.
+"""
+from fnmatch import fnmatchcase
+from typing import Dict, List, Optional, Tuple
+import argparse
+import asyncio
+import time
+
+from app.infrastructure.shared_cache import DELETE_IF_EQUALS_SCRIPT, INCR_SCRIPT, RespError, read_reply
+
+# 만료 키 정리 주기 (SET 명령 수)
+SWEEP_EVERY = 1000
+
+
+def _encode_reply(reply) -> bytes:
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, RespError):
+        return b"-%s\r\n" % str(reply).encode()
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if isinstance(reply, str):
+        return b"+%s\r\n" % reply.encode()
+    if isinstance(reply, list):
+        return b"*%d\r\n" % len(reply) + b"".join(_encode_reply(item) for item in reply)
+    return b"$%d\r\n%s\r\n" % (len(reply), reply)
+
+
+class SharedCacheStore:
+    """만료 시간이 있는 key-value 저장소 (이벤트 루프 하나에서만 사용)"""
+
+    def __init__(self):
+        self._data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        self._sets = 0
+
+    def _alive(self, key: bytes, now: float) -> Optional[bytes]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        if item[1] is not None and item[1] <= now:
+            del self._data[key]
+            return None
+        return item[0]
+
+    def sweep(self):
+        now = time.monotonic()
+        for key in [k for k, (_, expires) in self._data.items() if expires is not None and expires <= now]:
+            del self._data[key]
+
+    def execute(self, args: List[bytes]):
+        """명령 실행 결과 (오류는 RespError 객체)"""
+        if not args:
+            return RespError("ERR empty command")
+        name, args = args[0].upper(), args[1:]
+        now = time.monotonic()
+        if name == b"PING":
+            return "PONG"
+        if name in (b"SELECT", b"AUTH"):
+            return "OK"
+        if name == b"GET" and len(args) == 1:
+            return self._alive(args[0], now)
+        if name == b"SET" and len(args) >= 2:
+            return self._set(args[0], args[1], args[2:], now)
+        if name == b"DEL" and args:
+            deleted = [key for key in args if self._alive(key, now) is not None]
+            for key in deleted:
+                del self._data[key]
+            return len(deleted)
+        if name == b"SCAN" and args:
+            # 커서 없이 한 번에 전부 응답 (cursor "0")
+            options = dict(zip((o.upper() for o in args[1::2]), args[2::2]))
+            pattern = options.get(b"MATCH", b"*").decode(errors="replace")
+            self.sweep()
+            keys = [key for key in self._data if fnmatchcase(key.decode(errors="replace"), pattern)]
+            return [b"0", keys]
+        if name == b"EVAL" and len(args) >= 2:
+            return self._eval(args[0], args[2:], now)
+        if name == b"DBSIZE":
+            self.sweep()
+            return len(self._data)
+        if name == b"FLUSHDB":
+            self._data.clear()
+            return "OK"
+        return RespError(f"ERR unknown command or wrong number of arguments for '{name.decode(errors='replace')}'")
+
+    def _eval(self, script: bytes, args: List[bytes], now: float):
+        if script == DELETE_IF_EQUALS_SCRIPT.encode() and len(args) == 2:
+            key, value = args
+            if self._alive(key, now) != value:
+                return 0
+            del self._data[key]
+            return 1
+        if script == INCR_SCRIPT.encode() and len(args) == 3:
+            key = args[0]
+            try:
+                amount, ttl_ms = int(args[1]), int(args[2])
+                current = int(self._alive(key, now) or 0)
+            except ValueError:
+                return RespError("ERR value is not an integer or out of range")
+            expires = self._data[key][1] if key in self._data else None
+            if expires is None:
+                expires = now + ttl_ms / 1000
+            self._data[key] = (str(current + amount).encode(), expires)
+            return current + amount
+        return RespError("NOSCRIPT only the scripts sent by RespSharedCache are supported")
+
+    def _set(self, key: bytes, value: bytes, options: List[bytes], now: float):
+        expires, nx, i = None, False, 0
+        try:
+            while i < len(options):
+                option = options[i].upper()
+                if option == b"NX":
+                    nx = True
+                elif option in (b"PX", b"EX"):
+                    amount = int(options[i + 1])
+                    expires = now + (amount / 1000 if option == b"PX" else amount)
+                    i += 1
+                else:
+                    return RespError("ERR syntax error")
+                i += 1
+        except (IndexError, ValueError):
+            return RespError("ERR syntax error")
+        if nx and self._alive(key, now) is not None:
+            return None
+        self._data[key] = (value, expires)
+        self._sets += 1
+        if self._sets % SWEEP_EVERY == 0:
+            self.sweep()
+        return "OK"
+
+
+async def serve(host: str = "127.0.0.1", port: int = 6390, store: Optional[SharedCacheStore] = None) -> asyncio.AbstractServer:
+    """서버 시작 (반환된 server를 close()하면 종료), port=0이면 임의 포트 사용"""
+    store = store or SharedCacheStore()
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                command = await read_reply(reader)
+                if not isinstance(command, list):
+                    writer.write(_encode_reply(RespError("ERR expected an array command")))
+                    break
+                writer.write(_encode_reply(store.execute(command)))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="shared cache stand-in (Redis protocol subset)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6390)
+    args = parser.parse_args()
+
+    async def run():
+        server = await serve(args.host, args.port)
+        print(f"shared cache stand-in listening on {args.host}:{args.port}")
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""
+Stock Master Index (Infrastructure Layer)
+
+KIS 종목 마스터 파일(KOSPI/KOSDAQ)을 메모리 인덱스로 올려서 종목 검색을 로컬에서 처리합니다.
+Spring Boot 비유: @PostConstruct로 적재하고 @Scheduled로 갱신하는 검색 인덱스 @Component
+
+- 종목코드 접두어 ("0059" -> 005930)
+- 종목명 부분 문자열 ("전자" -> 삼성전자, LG전자, ...)
+- 초성 ("ㅅㅅㅈㅈ" -> 삼성전자)
+
+접두어 검색은 정렬된 배열 + 이진 탐색, 부분 문자열은 이름을 이어 붙인 문자열에서 str.find로 찾으므로
+전체를 순회하지 않습니다. 마스터 파일은 디스크에 보관하여 재시작 시 다시 받지 않고, 하루에 한 번 갱신합니다.
+"""
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, NamedTuple, Optional
+import asyncio
+import io
+import os
+import time
+import zipfile
+
+from app.core.config import settings
+
+# (시장, 마스터 파일명, 행 끝 고정폭 영역 길이) - KIS 종목정보파일 샘플 기준
+MASTER_FILES = (
+    ("KOSPI", "kospi_code", 228),
+    ("KOSDAQ", "kosdaq_code", 222),
+)
+
+CHOSUNG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_HANGUL_BASE, _HANGUL_LAST, _JUNG_JONG = 0xAC00, 0xD7A3, 21 * 28
+_CHOSUNG_SET = frozenset(CHOSUNG)
+
+
+class StockMasterEntry(NamedTuple):
+    code: str
+    name: str
+    market: str
+
+
+def to_chosung(text: str) -> str:
+    """한글 음절을 초성으로 변환 (그 외 문자는 그대로)"""
+    return "".join(
+        CHOSUNG[(ord(ch) - _HANGUL_BASE) // _JUNG_JONG] if _HANGUL_BASE <= ord(ch) <= _HANGUL_LAST else ch
+        for ch in text
+    )
+
+
+def _normalize(text: str) -> str:
+    return text.replace(" ", "").upper()
+
+
+def parse_master(text: str, market: str, tail_width: int) -> List[StockMasterEntry]:
+    """
+    마스터 파일(cp949 디코딩된 문자열) 파싱
+
+    각 행: 단축코드(9) + 표준코드(12) + 한글명 + 고정폭 영역(tail_width, 개행 포함)
+    """
+    entries = []
+    for row in text.splitlines(keepends=True):
+        head = row[: len(row) - tail_width]
+        code = head[0:9].strip()
+        name = head[21:].strip()
+        if code and name:
+            entries.append(StockMasterEntry(code=code, name=name, market=market))
+    return entries
+
+
+class StockMasterIndex:
+    """종목코드 접두어 / 종목명 부분 문자열 / 초성 검색 인덱스 (불변, 재적재 시 통째로 교체)"""
+
+    # 결과 정렬 순위 (작을수록 먼저)
+    EXACT, CODE_PREFIX, NAME_PREFIX, NAME_CONTAINS, CHOSUNG_PREFIX, CHOSUNG_CONTAINS = range(6)
+
+    def __init__(self, entries: Iterable[StockMasterEntry]):
+        # 같은 코드가 여러 번 나오면 마지막 것을 사용
+        self.entries: List[StockMasterEntry] = sorted({e.code: e for e in entries}.values())
+        self._names = [_normalize(e.name) for e in self.entries]
+        self._chosungs = [to_chosung(n) for n in self._names]
+        self._codes = [e.code.upper() for e in self.entries]  # entries가 코드순이므로 정렬됨
+        self._by_name = sorted(range(len(self.entries)), key=self._names.__getitem__)
+        self._sorted_names = [self._names[i] for i in self._by_name]
+        self._by_chosung = sorted(range(len(self.entries)), key=self._chosungs.__getitem__)
+        self._sorted_chosungs = [self._chosungs[i] for i in self._by_chosung]
+        self._name_blob, self._name_offsets = self._build_blob(self._names)
+        self._chosung_blob, self._chosung_offsets = self._build_blob(self._chosungs)
+        self.loaded_at = time.time()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @staticmethod
+    def _build_blob(values: List[str]):
+        """부분 문자열 검색용: 값들을 구분자로 이어 붙이고 각 시작 위치를 기록"""
+        offsets, position = [], 0
+        for value in values:
+            offsets.append(position)
+            position += len(value) + 1
+        return "\n".join(values), offsets
+
+    @staticmethod
+    def _prefix_range(sorted_values: List[str], prefix: str) -> range:
+        return range(bisect_left(sorted_values, prefix), bisect_right(sorted_values, prefix + "\uffff"))
+
+    @staticmethod
+    def _contains(blob: str, offsets: List[int], needle: str, limit: int) -> List[int]:
+        """needle을 포함하는 인덱스 (blob 앞쪽부터 최대 limit개)"""
+        found, start = [], 0
+        while len(found) < limit:
+            pos = blob.find(needle, start)
+            if pos < 0:
+                break
+            index = bisect_right(offsets, pos) - 1
+            found.append(index)
+            # 같은 값 안의 다음 매치는 건너뜀
+            start = offsets[index + 1] if index + 1 < len(offsets) else len(blob)
+        return found
+
+    def name_of(self, code: str) -> Optional[str]:
+        """종목코드 -> 종목명 (없으면 None)"""
+        key = code.upper()
+        i = bisect_left(self._codes, key)
+        if i < len(self._codes) and self._codes[i] == key:
+            return self.entries[i].name
+        return None
+
+    def search(self, query: str, limit: int = 20) -> List[Dict]:
+        """
+        종목 검색 (정확히 일치 > 코드 접두어 > 이름 접두어 > 이름 포함 > 초성 접두어 > 초성 포함)
+
+        같은 순위 안에서는 이름이 짧은 종목이 먼저 나옵니다.
+        """
+        needle = _normalize(query)
+        if not needle:
+            return []
+        scores: Dict[int, int] = {}
+
+        def add(indices: Iterable[int], score: int):
+            for i in indices:
+                if i not in scores or score < scores[i]:
+                    scores[i] = score
+
+        candidate_limit = max(limit * 5, 100)
+        code_hits = self._prefix_range(self._codes, needle)
+        add(code_hits[:candidate_limit], self.CODE_PREFIX)
+        name_hits = self._prefix_range(self._sorted_names, needle)
+        add((self._by_name[i] for i in name_hits[:candidate_limit]), self.NAME_PREFIX)
+        add(self._contains(self._name_blob, self._name_offsets, needle, candidate_limit), self.NAME_CONTAINS)
+
+        if all(ch in _CHOSUNG_SET for ch in needle):
+            chosung_hits = self._prefix_range(self._sorted_chosungs, needle)
+            add((self._by_chosung[i] for i in chosung_hits[:candidate_limit]), self.CHOSUNG_PREFIX)
+            add(self._contains(self._chosung_blob, self._chosung_offsets, needle, candidate_limit),
+                self.CHOSUNG_CONTAINS)
+
+        for i in scores:
+            if self._codes[i] == needle or self._names[i] == needle:
+                scores[i] = self.EXACT
+
+        ranked = sorted(scores, key=lambda i: (scores[i], len(self._names[i]), self._codes[i]))
+        return [
+            {"code": e.code, "name": e.name, "market": e.market}
+            for e in (self.entries[i] for i in ranked[:limit])
+        ]
+
+
+class StockMaster:
+    """
+    종목 마스터 적재/갱신 관리자
+
+    start()/stop()은 애플리케이션 lifespan에서 호출합니다.
+    인덱스가 아직 없으면 index는 None이며, 호출자는 기존 검색 API로 대체해야 합니다.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, cache_dir: Optional[str] = None,
+                 refresh_interval: Optional[float] = None, transport=None):
+        """
+        Args:
+            base_url: 마스터 파일 다운로드 주소 (파일명.mst.zip이 붙음)
+            cache_dir: 다운로드한 마스터 파일 보관 디렉토리
+            refresh_interval: 갱신 주기 (초)
+            transport: httpx transport (테스트용)
+        """
+        self._base_url = base_url or settings.STOCK_MASTER_URL
+        self._cache_dir = cache_dir or settings.STOCK_MASTER_DIR
+        self._refresh_interval = refresh_interval or settings.STOCK_MASTER_REFRESH_INTERVAL
+        self._transport = transport
+        self.index: Optional[StockMasterIndex] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.index is not None
+
+    def search(self, query: str, limit: int = 20) -> List[Dict]:
+        return self.index.search(query, limit) if self.index is not None else []
+
+    def name_of(self, code: str) -> Optional[str]:
+        """종목명 (인덱스가 없거나 마스터에 없는 종목이면 None)"""
+        return self.index.name_of(code) if self.index is not None else None
+
+    def stats(self) -> Dict:
+        return {
+            "loaded": self.is_loaded,
+            "entries": len(self.index) if self.index is not None else 0,
+            "loaded_at": self.index.loaded_at if self.index is not None else None,
+        }
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def refresh(self, force: bool = False):
+        """마스터 파일을 (필요하면 다운로드하여) 다시 읽고 인덱스를 교체"""
+        entries = []
+        for market, name, tail_width in MASTER_FILES:
+            text = await self._load_file(name, force)
+            entries.extend(parse_master(text, market, tail_width))
+        self.index = await asyncio.to_thread(StockMasterIndex, entries)
+
+    async def _run(self):
+        force = False
+        while True:
+            try:
+                await self.refresh(force)
+                delay = self._refresh_interval
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Stock master load error: {e}")
+                delay = 60.0
+            await asyncio.sleep(delay)
+            force = True
+
+    async def _load_file(self, name: str, force: bool) -> str:
+        """디스크 캐시가 refresh_interval 이내면 사용, 아니면 다운로드 후 저장"""
+        path = os.path.join(self._cache_dir, f"{name}.mst")
+        fresh = os.path.exists(path) and time.time() - os.path.getmtime(path) < self._refresh_interval
+        if force or not fresh:
+            import httpx
+            from app.infrastructure.http_pool import http_pool
+
+            if self._transport is None:
+                client = http_pool.client(timeout=30.0)
+            else:
+                client = httpx.AsyncClient(transport=self._transport, timeout=30.0)
+            async with client:
+                res = await client.get(f"{self._base_url}/{name}.mst.zip")
+                res.raise_for_status()
+            with zipfile.ZipFile(io.BytesIO(res.content)) as archive:
+                data = archive.read(f"{name}.mst")
+            os.makedirs(self._cache_dir, exist_ok=True)
+            # 워커들이 동시에 받아도 서로의 임시 파일을 덮어쓰지 않도록 pid별 임시 파일 사용
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        with open(path, encoding="cp949", errors="replace") as f:
+            return f.read()
+
+
+# 싱글톤 인스턴스
+stock_master = StockMaster()
@@ -1,12 +1,44 @@
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse
 from app.api.v1.endpoints import router as api_v1_router
 from app.core.config import settings
+from app.core.metrics import MetricsMiddleware, metrics
+from app.core.tracing import TracingMiddleware, tracer
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from contextlib import asynccontextmanager
 import os
 
-app = FastAPI(title=settings.PROJECT_NAME)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    from app.infrastructure.persistence.async_kis_stock_repository import async_kis_stock_repository
+    async_kis_stock_repository.start()
+    if settings.KIS_REALTIME_ENABLED:
+        from app.infrastructure.kis_realtime import kis_realtime_feed
+        kis_realtime_feed.start()
+    if settings.STOCK_MASTER_ENABLED:
+        from app.infrastructure.stock_master import stock_master
+        stock_master.start()
+    from app.application.order_pipeline import order_pipeline
+    order_pipeline.start()
+    yield
+    # 종료 시 주문 worker, 실시간 피드, 종목 마스터 갱신 작업, KIS HTTP 커넥션 풀과 공유 캐시 연결 정리
+    await order_pipeline.stop()
+    if settings.KIS_REALTIME_ENABLED:
+        await kis_realtime_feed.stop()
+    if settings.STOCK_MASTER_ENABLED:
+        await stock_master.stop()
+    await async_kis_stock_repository.aclose()
+    from app.infrastructure.http_pool import http_pool
+    await http_pool.aclose()
+    from app.infrastructure.shared_cache import shared_cache
+    if shared_cache is not None:
+        await shared_cache.aclose()
+
+
+app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
 
 # CORS
 app.add_middleware(
@@ -17,11 +49,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 큰 응답 gzip 압축 (SSE, 이미 brotli로 압축된 응답은 제외)
+app.add_middleware(GZipMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+
+# 표본 요청의 단계별 span 기록 (정적 파일, 지표/디버그 엔드포인트 제외)
+app.add_middleware(
+    TracingMiddleware, tracer=tracer,
+    exclude=("/static", "/metrics", f"{settings.API_V1_STR}/debug"),
+)
+
+# 요청 지연 시간/개수 측정 (가장 바깥에서 gzip, CORS 처리 시간까지 포함)
+app.add_middleware(MetricsMiddleware)
+
 frontend_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "frontend")
 
 # API Routes
 app.include_router(api_v1_router, prefix=settings.API_V1_STR)
 
+# Prometheus scrape 대상
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 # Serve Static Files
 app.mount("/static", StaticFiles(directory=os.path.join(frontend_path, "static")), name="static")
 
@@ -56,9 +56,64 @@ let hogaInterval = null;
 let homeInterval = null;
 let portfolioInterval = null;
 
+// Server push (WebSocket). Polling intervals are only used if push is unavailable.
+const push = {
+    socket: null,
+    handlers: {}, // topic -> render function for the current view
+    connected: false,
+    failed: false,
+
+    connect() {
+        const scheme = window.location.protocol === 'https:' ? 'wss' : 'ws';
+        let opened = false;
+        this.socket = new WebSocket(`${scheme}://${window.location.host}${API_BASE}/ws`);
+
+        this.socket.onopen = () => {
+            opened = true;
+            this.connected = true;
+            const topics = Object.keys(this.handlers);
+            if (topics.length) this.send({ action: 'subscribe', topics });
+        };
+
+        this.socket.onmessage = (event) => {
+            const msg = JSON.parse(event.data);
+            const handler = this.handlers[msg.topic];
+            if (handler && msg.data !== undefined) handler(msg.data);
+        };
+
+        this.socket.onclose = () => {
+            this.connected = false;
+            if (!opened) {
+                // Push not supported: fall back to polling for the current view
+                this.failed = true;
+                handleRouting();
+            } else {
+                setTimeout(() => this.connect(), 2000);
+            }
+        };
+    },
+
+    send(msg) {
+        if (this.connected) this.socket.send(JSON.stringify(msg));
+    },
+
+    // Replace the subscriptions of the previous view with the given topic handlers
+    setTopics(handlers) {
+        const previous = Object.keys(this.handlers);
+        const next = Object.keys(handlers);
+        this.handlers = handlers;
+
+        const removed = previous.filter(t => !next.includes(t));
+        const added = next.filter(t => !previous.includes(t));
+        if (removed.length) this.send({ action: 'unsubscribe', topics: removed });
+        if (added.length) this.send({ action: 'subscribe', topics: added });
+    }
+};
+
 // Initialize
 async function init() {
     setupEventListeners();
+    push.connect();
     window.addEventListener('popstate', handleRouting);
     handleRouting();
 }
@@ -164,13 +219,17 @@ async function fetchMarketIndices() {
     try {
         const res = await fetch(`${API_BASE}/indices`);
         const data = await res.json();
-
-        updateIndexUI('kospi', data.kospi);
-        updateIndexUI('kosdaq', data.kosdaq);
-        updateIndexUI('kospi200', data.kospi200);
+        renderIndices(data);
     } catch (e) { }
 }
 
+function renderIndices(data) {
+    if (!data) return;
+    updateIndexUI('kospi', data.kospi);
+    updateIndexUI('kosdaq', data.kosdaq);
+    updateIndexUI('kospi200', data.kospi200);
+}
+
 function updateIndexUI(id, data) {
     if (!data) return;
     const priceEl = document.getElementById(`home${id.charAt(0).toUpperCase() + id.slice(1)}Price`);
@@ -185,16 +244,28 @@ function updateIndexUI(id, data) {
 }
 
 async function fetchAndDrawChart(code, canvasId) {
+    const key = `index:${code}`;
+    const since = chartSince(key);
     try {
-        const res = await fetch(`${API_BASE}/index-chart/${code}`);
+        const res = await fetch(`${API_BASE}/index-chart/${code}${since ? `?since=${since}` : ''}`);
         const data = await res.json();
-        // Only render if we have data to avoid clearing the last good chart
-        if (data && data.length > 0) {
-            renderMiniChart(canvasId, data);
+        if (since === null) {
+            renderIndexChart(canvasId, data);
+            // Keep the series only if bars carry timestamps
+            if (data && data.length > 0 && barKey(data[0])) chartSeries[key] = data;
+        } else if (mergeChart(key, data)) {
+            renderIndexChart(canvasId, chartSeries[key]);
         }
     } catch (e) { }
 }
 
+function renderIndexChart(canvasId, data) {
+    // Only render if we have data to avoid clearing the last good chart
+    if (data && data.length > 0) {
+        renderMiniChart(canvasId, data);
+    }
+}
+
 function renderMiniChart(canvasId, data) {
     const canvas = document.getElementById(canvasId);
     if (!canvas) return;
@@ -241,17 +312,20 @@ async function fetchTransactionRankings() {
         const res = await fetch(`${API_BASE}/transaction-rankings`);
         const data = await res.json();
         renderRankings(data);
+        updateLastUpdateTime();
+    } catch (e) { }
+}
 
-        const now = new Date();
-        const year = now.getFullYear();
-        const month = String(now.getMonth() + 1).padStart(2, '0');
-        const day = String(now.getDate()).padStart(2, '0');
-        const hours = String(now.getHours()).padStart(2, '0');
-        const minutes = String(now.getMinutes()).padStart(2, '0');
-        const seconds = String(now.getSeconds()).padStart(2, '0');
+function updateLastUpdateTime() {
+    const now = new Date();
+    const year = now.getFullYear();
+    const month = String(now.getMonth() + 1).padStart(2, '0');
+    const day = String(now.getDate()).padStart(2, '0');
+    const hours = String(now.getHours()).padStart(2, '0');
+    const minutes = String(now.getMinutes()).padStart(2, '0');
+    const seconds = String(now.getSeconds()).padStart(2, '0');
 
-        document.getElementById('lastUpdateTime').textContent = `${year}-${month}-${day} ${hours}:${minutes}:${seconds} 업데이트`;
-    } catch (e) { }
+    document.getElementById('lastUpdateTime').textContent = `${year}-${month}-${day} ${hours}:${minutes}:${seconds} 업데이트`;
 }
 
 function renderRankings(stocks) {
@@ -302,108 +376,189 @@ async function selectStock(query, pushState = true) {
     showDetail(pushState); // showDetail will clear homeInterval
 
     if (hogaInterval) clearInterval(hogaInterval);
+    resetHoga(code);
 
     // Initial fetch for the stock details
     fetchStockData(code);
 
-    // REAL-TIME: 2 seconds polling for detail view
-    hogaInterval = setInterval(() => {
-        fetchStockData(code);
-    }, 2000);
+    // REAL-TIME: server push, or 2 seconds polling if push is unavailable
+    if (push.failed) {
+        hogaInterval = setInterval(() => {
+            fetchStockData(code);
+        }, 2000);
+    }
+    push.setTopics({
+        [`stock:${code}`]: renderStockDetail,
+        [`chart:${code}`]: (data) => {
+            if (data && data.length > 0) {
+                chartSeries[`stock:${code}`] = data;
+                renderStockChart('stockMainChart', data);
+            }
+        },
+        [`hoga:${code}`]: applyHoga,
+        balance: applyBalance,
+    });
 }
 
-// Helper to bundle detail fetches
-async function fetchStockData(code) {
-    await Promise.all([
-        fetchStockDetail(code),
-        fetchStockChart(code),
-        fetchHoga(code),
-        fetchBalance()
-    ]);
+// Chart series kept on the client; refreshes only fetch bars since the last one (?since=)
+const chartSeries = {};
+const MAX_CHART_BARS = 390; // same as the server-side buffer (one trading day of minute bars)
+
+function barKey(bar) {
+    return `${bar.date || ''}${bar.time || ''}`;
 }
 
-async function fetchStockDetail(code) {
-    try {
-        const response = await fetch(`${API_BASE}/stock/${code}`);
-        const data = await response.json();
+function chartSince(key) {
+    const bars = chartSeries[key];
+    return bars && bars.length > 0 ? barKey(bars[bars.length - 1]) : null;
+}
 
-        currentStockPrice = data.price;
-        elements.stockName.textContent = data.name;
-        elements.stockCodeLabel.textContent = data.code;
-        elements.mainPrice.textContent = formatNumber(data.price);
+// Merge a delta into the series (bars with the same timestamp are replaced); returns true if anything changed
+function mergeChart(key, delta) {
+    const bars = chartSeries[key] || [];
+    let changed = false;
+    delta.forEach(bar => {
+        // Minute bars: a new trading day starts a new series
+        if (bar.time && bars.length > 0 && bars[bars.length - 1].date !== bar.date) bars.length = 0;
+        const k = barKey(bar);
+        const last = bars.length > 0 ? barKey(bars[bars.length - 1]) : null;
+        if (last === null || k > last) {
+            bars.push(bar);
+            changed = true;
+            return;
+        }
+        const i = bars.findIndex(b => barKey(b) === k);
+        if (i >= 0 && (bars[i].price !== bar.price || bars[i].volume !== bar.volume)) {
+            bars[i] = bar;
+            changed = true;
+        }
+    });
+    if (bars.length > MAX_CHART_BARS) bars.splice(0, bars.length - MAX_CHART_BARS);
+    chartSeries[key] = bars;
+    return changed;
+}
 
-        const isUp = data.change_amount >= 0;
-        elements.mainPrice.className = `current-price ${isUp ? 'up' : 'down'}`;
-        elements.mainChange.textContent = `${isUp ? '+' : ''}${formatNumber(data.change_amount)} (${data.change_rate}%)`;
-        elements.mainChange.className = `price-change ${isUp ? 'up' : 'down'}`;
+// Detail view: detail, chart delta, hoga and balance in a single snapshot request
+async function fetchStockData(code) {
+    const key = `stock:${code}`;
+    const since = chartSince(key);
+    // hoga_since=0 asks for a full order book with a sequence number; afterwards only changed levels are sent
+    const params = [`hoga_since=${hoga.code === code && hoga.seq !== null ? hoga.seq : 0}`];
+    if (since) params.push(`chart_since=${since}`);
+    const query = `?${params.join('&')}`;
 
-        // Capture off-hours price if available
-        currentOvertimePrice = data.overtime_price || data.price;
+    try {
+        const response = await fetch(`${API_BASE}/stock/${code}/snapshot${query}`);
+        const data = await response.json();
 
-        // If currently in an off-hours mode, update the locked price field
-        if (['05', '06', '07'].includes(currentOrderDvsn)) {
-            elements.orderPrice.value = currentOvertimePrice;
-            updateEstimatedAmount();
-        } else if (elements.orderPrice.value === '' || elements.orderPrice.value == 0) {
-            elements.orderPrice.value = data.price;
+        if (data.detail) renderStockDetail(data.detail);
+        if (data.hoga) applyHoga(data.hoga);
+        if (data.balance) applyBalance(data.balance);
+        if (data.chart && mergeChart(key, data.chart)) {
+            renderStockChart('stockMainChart', chartSeries[key]);
         }
-        updateEstimatedAmount();
     } catch (e) { }
 }
 
-async function fetchHoga(code) {
-    try {
-        const response = await fetch(`${API_BASE}/stock/${code}/hoga`);
-        const data = await response.json();
-        renderHoga(data);
-    } catch (e) { }
+function renderStockDetail(data) {
+    currentStockPrice = data.price;
+    elements.stockName.textContent = data.name;
+    elements.stockCodeLabel.textContent = data.code;
+    elements.mainPrice.textContent = formatNumber(data.price);
+
+    const isUp = data.change_amount >= 0;
+    elements.mainPrice.className = `current-price ${isUp ? 'up' : 'down'}`;
+    elements.mainChange.textContent = `${isUp ? '+' : ''}${formatNumber(data.change_amount)} (${data.change_rate}%)`;
+    elements.mainChange.className = `price-change ${isUp ? 'up' : 'down'}`;
+
+    // Capture off-hours price if available
+    currentOvertimePrice = data.overtime_price || data.price;
+
+    // If currently in an off-hours mode, update the locked price field
+    if (['05', '06', '07'].includes(currentOrderDvsn)) {
+        elements.orderPrice.value = currentOvertimePrice;
+        updateEstimatedAmount();
+    } else if (elements.orderPrice.value === '' || elements.orderPrice.value == 0) {
+        elements.orderPrice.value = data.price;
+    }
+    updateEstimatedAmount();
 }
 
-async function fetchStockChart(code) {
-    try {
-        const response = await fetch(`${API_BASE}/stock/${code}/chart`);
-        const data = await response.json();
-        if (data && data.length > 0) {
-            renderStockChart('stockMainChart', data);
-        }
-    } catch (e) { }
+// Order book: 20 slots (0-9 asks 1-10, 10-19 bids 1-10), same layout as the server (app/core/order_book.py).
+// Rows are built once per stock; updates only touch the cells whose values changed.
+const HOGA_LEVELS = 10;
+const hoga = { code: null, seq: null, slots: [], rows: [] };
+
+function resetHoga(code) {
+    hoga.code = code;
+    hoga.seq = null;
+    hoga.slots = [];
+    hoga.rows = [];
+    elements.hogaList.innerHTML = '';
 }
 
-function renderHoga(data) {
-    const asks = (data.asks || []).reverse();
-    const bids = (data.bids || []);
-    const maxVol = Math.max(...[...asks, ...bids].map(x => x.volume), 1);
+// Accepts a full book ({asks, bids}, optionally with seq) or a delta ({seq, changes: [[slot, price, volume], ...]})
+function applyHoga(data) {
+    if (!data) return;
+    if (data.changes) {
+        if (hoga.slots.length !== HOGA_LEVELS * 2) return; // no base to apply the delta to
+        data.changes.forEach(([slot, price, volume]) => { hoga.slots[slot] = { price, volume }; });
+    } else {
+        hoga.slots = [...(data.asks || []), ...(data.bids || [])];
+    }
+    // A pushed full book has no seq; the next poll then asks for a full book again
+    hoga.seq = data.seq !== undefined ? data.seq : null;
+    renderHoga();
+}
 
-    let html = '';
+function buildHogaRows() {
+    // Asks from level 10 down to 1 (blue), then bids from level 1 to 10 (red)
+    const order = [];
+    for (let i = HOGA_LEVELS - 1; i >= 0; i--) order.push(i);
+    for (let i = 0; i < HOGA_LEVELS; i++) order.push(HOGA_LEVELS + i);
 
-    // Asks (Blue)
-    asks.forEach(a => {
-        const volPercent = (a.volume / maxVol) * 100;
-        html += `
-            <div class="hoga-item" onclick="setOrderPrice(${a.price})">
-                <div class="hoga-vol-bar ask" style="width: ${volPercent}%"></div>
-                <div class="hoga-val vol-left">${formatNumber(a.volume)}</div>
-                <div class="hoga-price-cell down">${formatNumber(a.price)}</div>
-                <div class="hoga-val"></div>
+    elements.hogaList.innerHTML = order.map(slot => {
+        const isAsk = slot < HOGA_LEVELS;
+        return `
+            <div class="hoga-item" data-slot="${slot}">
+                <div class="hoga-vol-bar ${isAsk ? 'ask' : 'bid'}"></div>
+                <div class="hoga-val ${isAsk ? 'vol-left' : ''}"></div>
+                <div class="hoga-price-cell ${isAsk ? 'down' : 'up'}"></div>
+                <div class="hoga-val ${isAsk ? '' : 'vol-right'}"></div>
             </div>
         `;
-    });
+    }).join('');
 
-    // Bids (Red)
-    bids.forEach(b => {
-        const volPercent = (b.volume / maxVol) * 100;
-        const isCurrent = b.price === currentStockPrice;
-        html += `
-            <div class="hoga-item ${isCurrent ? 'current' : ''}" onclick="setOrderPrice(${b.price})">
-                <div class="hoga-vol-bar bid" style="width: ${volPercent}%"></div>
-                <div class="hoga-val"></div>
-                <div class="hoga-price-cell up">${formatNumber(b.price)}</div>
-                <div class="hoga-val vol-right">${formatNumber(b.volume)}</div>
-            </div>
-        `;
+    hoga.rows = [];
+    elements.hogaList.querySelectorAll('.hoga-item').forEach(el => {
+        const slot = Number(el.dataset.slot);
+        hoga.rows[slot] = {
+            el,
+            bar: el.children[0],
+            volume: el.children[slot < HOGA_LEVELS ? 1 : 3],
+            price: el.children[2],
+            last: {},
+        };
+        el.onclick = () => setOrderPrice(hoga.slots[slot].price);
     });
+}
 
-    elements.hogaList.innerHTML = html;
+function renderHoga() {
+    const slots = hoga.slots;
+    if (slots.length !== HOGA_LEVELS * 2) return;
+    if (hoga.rows.length === 0) buildHogaRows();
+    const maxVol = Math.max(...slots.map(x => x.volume), 1);
+
+    slots.forEach((x, slot) => {
+        const row = hoga.rows[slot];
+        const width = `${(x.volume / maxVol) * 100}%`;
+        const isCurrent = slot >= HOGA_LEVELS && x.price === currentStockPrice;
+        if (row.last.price !== x.price) row.price.textContent = formatNumber(x.price);
+        if (row.last.volume !== x.volume) row.volume.textContent = formatNumber(x.volume);
+        if (row.last.width !== width) row.bar.style.width = width;
+        if (row.last.isCurrent !== isCurrent) row.el.classList.toggle('current', isCurrent);
+        row.last = { price: x.price, volume: x.volume, width, isCurrent };
+    });
 }
 
 function renderStockChart(canvasId, data) {
@@ -505,11 +660,18 @@ function showHome(pushState = true) {
     if (hogaInterval) { clearInterval(hogaInterval); hogaInterval = null; }
     if (portfolioInterval) { clearInterval(portfolioInterval); portfolioInterval = null; }
 
-    // Start home polling if not running
+    // Start home updates if not running (push, or polling if push is unavailable)
     if (!homeInterval) {
         loadHomeData(); // Initial load
-        homeInterval = setInterval(loadHomeData, 30000);
+        if (push.failed) homeInterval = setInterval(loadHomeData, 30000);
     }
+    push.setTopics({
+        indices: renderIndices,
+        rankings: (data) => { renderRankings(data); updateLastUpdateTime(); },
+        'index_chart:0001': (data) => renderIndexChart('kospiChart', data),
+        'index_chart:1001': (data) => renderIndexChart('kosdaqChart', data),
+        'index_chart:2001': (data) => renderIndexChart('kospi200Chart', data),
+    });
 }
 
 function showDetail(pushState = true) {
@@ -615,7 +777,8 @@ async function showPortfolio(pushState = true) {
     elements.holdingsList.innerHTML = '<div class="loading-shimmer">로딩 중...</div>';
 
     fetchPortfolio();
-    portfolioInterval = setInterval(fetchPortfolio, 30000);
+    if (push.failed) portfolioInterval = setInterval(fetchPortfolio, 30000);
+    push.setTopics({ balance: renderPortfolio });
 }
 
 async function fetchPortfolio() {
@@ -665,21 +828,68 @@ async function fetchBalance() {
     try {
         const res = await fetch(`${API_BASE}/balance`);
         const data = await res.json();
-        const power = parseFloat(data.summary?.orderable_cash || data.summary?.dnca_tot_amt || 0);
-        elements.buyingPower.textContent = formatNumber(power) + '원';
-
-        // Update current stock holding quantity if in detail view
-        if (currentStockCode && data.holdings) {
-            const holding = data.holdings.find(h => h.pdno === currentStockCode);
-            currentStockHoldingQty = holding ? parseInt(holding.hldg_qty) : 0;
-            if (elements.holdingQty) elements.holdingQty.textContent = formatNumber(currentStockHoldingQty) + '주';
-        } else {
-            currentStockHoldingQty = 0;
-            if (elements.holdingQty) elements.holdingQty.textContent = '0주';
-        }
+        applyBalance(data);
     } catch (e) { }
 }
 
+function applyBalance(data) {
+    const power = parseFloat(data.summary?.orderable_cash || data.summary?.dnca_tot_amt || 0);
+    elements.buyingPower.textContent = formatNumber(power) + '원';
+
+    // Update current stock holding quantity if in detail view
+    if (currentStockCode && data.holdings) {
+        const holding = data.holdings.find(h => h.pdno === currentStockCode);
+        currentStockHoldingQty = holding ? parseInt(holding.hldg_qty) : 0;
+        if (elements.holdingQty) elements.holdingQty.textContent = formatNumber(currentStockHoldingQty) + '주';
+    } else {
+        currentStockHoldingQty = 0;
+        if (elements.holdingQty) elements.holdingQty.textContent = '0주';
+    }
+}
+
+// Orders are queued by the server; one Idempotency-Key per confirmed order makes retries safe
+// (a retried POST returns the same order instead of placing it twice).
+function newIdempotencyKey() {
+    if (window.crypto && crypto.randomUUID) return crypto.randomUUID();
+    return `${Date.now()}-${Math.random().toString(16).slice(2)}`;
+}
+
+async function postOrder(payload, key, retries = 2) {
+    for (let attempt = 0; ; attempt++) {
+        try {
+            const response = await fetch(`${API_BASE}/order`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json', 'Idempotency-Key': key },
+                body: JSON.stringify(payload)
+            });
+            const data = await response.json();
+            if (!response.ok) return { error: data.detail || `HTTP ${response.status}` };
+            return data;
+        } catch (e) {
+            if (attempt >= retries) throw e;
+            await new Promise(resolve => setTimeout(resolve, 500 * (attempt + 1)));
+        }
+    }
+}
+
+// Submit an order and wait (long polling) until it is acked or rejected; resolves to {error}, {unknown} or the KIS result
+// 'unknown' means the request was sent but no response came back; the server checks today's orders, so keep waiting
+// 'unresolved' means it was still not found in today's orders; it may have been placed, so never report it as a failure
+async function submitOrder(payload) {
+    let status = await postOrder(payload, newIdempotencyKey());
+    if (status.error && !status.order_id) return status;
+    let unknownPolls = 0;
+    while (status.state === 'queued' || status.state === 'sent' || (status.state === 'unknown' && unknownPolls++ < 3)) {
+        const response = await fetch(`${API_BASE}/order/${status.order_id}?wait=10`);
+        if (!response.ok) return { error: `주문 상태를 확인할 수 없습니다 (HTTP ${response.status})` };
+        status = await response.json();
+    }
+    if (status.state === 'unknown' || status.state === 'unresolved') {
+        return { unknown: true, error: '주문 접수 여부를 아직 확인하지 못했습니다. 중복 주문을 피하려면 주문 내역과 잔고를 확인한 뒤 다시 주문하세요.' };
+    }
+    return status.state === 'rejected' ? { error: status.error } : (status.result || {});
+}
+
 async function executeOrder() {
     try {
         console.log('executeOrder called', { type: currentOrderType, dvsn: currentOrderDvsn });
@@ -701,21 +911,15 @@ async function executeOrder() {
             type: 'confirm',
             onConfirm: async () => {
                 try {
-                    const response = await fetch(`${API_BASE}/order`, {
-                        method: 'POST',
-                        headers: { 'Content-Type': 'application/json' },
-                        body: JSON.stringify({
-                            stock_code: currentStockCode,
-                            quantity: qty,
-                            price: price,
-                            order_type: currentOrderType,
-                            order_dvsn: currentOrderDvsn
-                        })
+                    const result = await submitOrder({
+                        stock_code: currentStockCode,
+                        quantity: qty,
+                        price: price,
+                        order_type: currentOrderType,
+                        order_dvsn: currentOrderDvsn
                     });
-
-                    const result = await response.json();
                     if (result.error) {
-                        showModal({ title: '주문 실패', message: result.error, type: 'alert' });
+                        showModal({ title: result.unknown ? '주문 확인 필요' : '주문 실패', message: result.error, type: 'alert' });
                     } else {
                         const stockName = elements.mainPrice.offsetParent ? elements.stockName.textContent : currentStockCode;
                         const sideLabel = currentOrderType === 'buy' ? '구매' : '판매';
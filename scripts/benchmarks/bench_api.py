@@ -0,0 +1,163 @@
+"""
+[API 부하/지연 시간 벤치마크]
+
+FastAPI 앱(app.main.app, 미들웨어 포함)을 FakeStockRepository 위에서 실행하고
+엔드포인트별로 동시 요청 수와 캐시 hit 비율을 바꿔 가며 처리량(req/s)과 지연 시간(p50/p90/p99)을 측정합니다.
+
+1. 실행 방법:
+   export PYTHONPATH=$(pwd)
+   python scripts/benchmarks/bench_api.py --output bench_api.json
+   python scripts/benchmarks/bench_api.py --endpoints detail,hoga --concurrency 1,64 --hit-ratio 0.5 --latency 0.05
+
+2. 옵션:
+   --requests:    조건마다 보내는 요청 수 (기본 1000)
+   --concurrency: 동시 요청 수 목록 (기본 1,8,32,128)
+   --hit-ratio:   캐시 hit 비율 목록 (기본 0,0.9,1). hit 요청은 미리 조회해 둔 종목, miss 요청은 처음 보는 종목을 요청
+   --latency:     fake upstream 지연 시간(초, 기본 0.02), --jitter: 추가 무작위 지연(초, 기본 0)
+   --endpoints:   detail, hoga, chart, snapshot, quotes 중 선택 (기본 전체)
+   --output:      결과 JSON 경로 (기본 표준출력 "-"), 형식은 results.py 참고. compare.py로 커밋 간 비교
+
+3. 참고:
+   - 요청은 httpx ASGITransport로 앱을 프로세스 안에서 직접 호출합니다 (네트워크/uvicorn 비용 제외).
+   - 캐시 TTL은 측정 중 만료되지 않도록 길게 설정하고, stale-while-revalidate는 끕니다.
+   - KIS rate limiter는 KIS Repository 안에 있으므로 측정에 포함되지 않습니다.
+   - 지수/랭킹처럼 kis_client를 직접 호출하는 엔드포인트는 측정하지 않습니다.
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import sys
+import time
+sys.path.insert(0, os.getcwd())
+
+import httpx
+
+from app.api.v1 import endpoints
+from app.application.async_trading_service import AsyncTradingService
+from app.core.cache import DEFAULT_POLICIES, CachePolicy, MemoryCache
+from app.main import app
+
+from fake_repository import FakeStockRepository
+from results import percentile, write_results
+
+ENDPOINTS = {
+    "detail": "/api/v1/stock/{code}",
+    "hoga": "/api/v1/stock/{code}/hoga",
+    "chart": "/api/v1/stock/{code}/chart",
+    "snapshot": "/api/v1/stock/{code}/snapshot",
+    "quotes": "/api/v1/stocks?codes={codes}",
+}
+HOT_CODES = [f"{i:06d}" for i in range(1, 21)]
+QUOTE_BATCH = 5
+
+
+def build_service(latency: float, jitter: float):
+    """측정 조건마다 새 서비스 (빈 캐시, 0부터 시작하는 통계)"""
+    repository = FakeStockRepository(latency=latency, jitter=jitter)
+    policies = {name: CachePolicy(ttl=3600) for name in list(DEFAULT_POLICIES) + ["balance"]}
+    service = AsyncTradingService(
+        stock_repository=repository, cache=MemoryCache(policies=policies), stale_while_revalidate=False,
+    )
+    return service, repository
+
+
+def make_paths(endpoint: str, requests: int, hit_ratio: float, seed: int = 0):
+    """hit_ratio 비율은 HOT_CODES(미리 조회), 나머지는 처음 보는 종목코드로 요청 경로 생성"""
+    rng = random.Random(seed)
+    cold = (f"{i:06d}" for i in itertools.count(100000))
+    template = ENDPOINTS[endpoint]
+    paths = []
+    for i in range(requests):
+        hot = rng.random() < hit_ratio
+        if endpoint == "quotes":
+            codes = [HOT_CODES[(i + j) % len(HOT_CODES)] if hot else next(cold) for j in range(QUOTE_BATCH)]
+            paths.append(template.format(codes=",".join(codes)))
+        else:
+            paths.append(template.format(code=HOT_CODES[i % len(HOT_CODES)] if hot else next(cold)))
+    return paths
+
+
+async def run_case(endpoint: str, concurrency: int, hit_ratio: float, requests: int,
+                   latency: float, jitter: float) -> dict:
+    service, repository = build_service(latency, jitter)
+    endpoints.async_trading_service = service
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # 캐시 예열 (hit 대상 종목)
+        for path in make_paths(endpoint, len(HOT_CODES), hit_ratio=1.0):
+            await client.get(path)
+        warm_calls = repository.total_calls
+
+        paths = iter(make_paths(endpoint, requests, hit_ratio))
+        latencies, errors = [], 0
+
+        async def worker():
+            nonlocal errors
+            for path in paths:
+                start = time.perf_counter()
+                response = await client.get(path)
+                latencies.append(time.perf_counter() - start)
+                if response.status_code not in (200, 304):
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        duration = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "key": {"endpoint": endpoint, "concurrency": concurrency, "hit_ratio": hit_ratio},
+        "metrics": {
+            "requests": requests,
+            "errors": errors,
+            "duration_s": round(duration, 4),
+            "rps": round(requests / duration, 1),
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+            "p90_ms": round(percentile(latencies, 0.90) * 1000, 3),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+            "max_ms": round(latencies[-1] * 1000, 3),
+            "upstream_calls": repository.total_calls - warm_calls,
+        },
+    }
+
+
+def parse_list(value: str, cast):
+    return [cast(v) for v in value.split(",") if v]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="API 부하/지연 시간 벤치마크")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", default="1,8,32,128")
+    parser.add_argument("--hit-ratio", default="0,0.9,1")
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS))
+    parser.add_argument("--output", default="-")
+    args = parser.parse_args()
+
+    names = parse_list(args.endpoints, str)
+    unknown = set(names) - set(ENDPOINTS)
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(sorted(unknown))}")
+
+    results = []
+    print(f"{'endpoint':<10}{'conc':>6}{'hit':>6}{'req/s':>10}{'p50(ms)':>10}{'p99(ms)':>10}{'upstream':>10}",
+          file=sys.stderr)
+    for name in names:
+        for concurrency in parse_list(args.concurrency, int):
+            for hit_ratio in parse_list(args.hit_ratio, float):
+                result = await run_case(name, concurrency, hit_ratio, args.requests, args.latency, args.jitter)
+                m = result["metrics"]
+                print(f"{name:<10}{concurrency:>6}{hit_ratio:>6.2f}{m['rps']:>10.1f}{m['p50_ms']:>10.2f}"
+                      f"{m['p99_ms']:>10.2f}{m['upstream_calls']:>10}", file=sys.stderr)
+                results.append(result)
+
+    params = {k: getattr(args, k) for k in ("requests", "concurrency", "hit_ratio", "latency", "jitter")}
+    write_results(args.output, "api", params, results)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
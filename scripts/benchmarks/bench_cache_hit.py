@@ -0,0 +1,87 @@
+"""
+[캐시 hit 경로 벤치마크]
+
+/api/v1/stock/{code} 응답이 캐시에 있을 때의 처리 비용을 비교합니다.
+
+- before: 캐시 dict -> Stock(**data) -> response_model=Stock 검증/직렬화 (이전 방식)
+- after:  캐시 엔트리에 보관된 인코딩된 JSON 본문을 그대로 응답 (현재 방식)
+
+1. 실행 방법:
+   export PYTHONPATH=$(pwd)
+   python scripts/benchmarks/bench_cache_hit.py [반복 횟수]
+
+2. 측정 항목:
+   - handler: 엔드포인트 안에서 하는 일만 (모델 생성/직렬화 vs 캐시된 bytes 재사용)
+   - http:    TestClient로 요청 전체 (라우팅, 미들웨어 포함)
+   KIS 서버에 접속하지 않습니다.
+   http 수치는 TestClient 자체 비용(요청당 ~1ms)이 대부분이므로 handler 수치로 비교하세요.
+"""
+import os
+import sys
+import time
+sys.path.insert(0, os.getcwd())
+
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+from app.core.cache import MemoryCache
+from app.domain.models import Stock
+
+STOCK = {
+    "code": "005930",
+    "name": "삼성전자",
+    "price": 70000.0,
+    "change_amount": 1000.0,
+    "change_rate": 1.45,
+}
+KEY = "stock_detail_005930"
+
+
+def build_apps(cache: MemoryCache):
+    before = FastAPI()
+    after = FastAPI()
+
+    @before.get("/stock/{code}", response_model=Stock)
+    async def get_stock_before(code: str):
+        return Stock(**cache.peek(f"stock_detail_{code}").value)
+
+    @after.get("/stock/{code}", response_model=Stock)
+    async def get_stock_after(code: str):
+        key = f"stock_detail_{code}"
+        entry = cache.peek(key)
+        return Response(content=cache.encoded(key, entry), media_type="application/json")
+
+    return before, after
+
+
+def timeit(func, n: int) -> float:
+    """1회당 평균 시간 (마이크로초)"""
+    start = time.perf_counter()
+    for _ in range(n):
+        func()
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    cache = MemoryCache()
+    # 서비스와 같이 model_dump() 결과를 캐시에 저장
+    entry = cache.set(KEY, Stock(**STOCK).model_dump())
+
+    handler_before = timeit(lambda: Stock(**entry.value).model_dump_json().encode(), n)
+    handler_after = timeit(lambda: cache.encoded(KEY, entry), n)
+
+    before_app, after_app = build_apps(cache)
+    clients = TestClient(before_app), TestClient(after_app)
+    assert clients[0].get("/stock/005930").json() == clients[1].get("/stock/005930").json()
+    http_n = max(n // 20, 100)
+    http_before = timeit(lambda: clients[0].get("/stock/005930"), http_n)
+    http_after = timeit(lambda: clients[1].get("/stock/005930"), http_n)
+
+    print(f"{'path':<10}{'before(us)':>12}{'after(us)':>12}{'speedup':>10}")
+    for name, b, a in (("handler", handler_before, handler_after), ("http", http_before, http_after)):
+        print(f"{name:<10}{b:>12.2f}{a:>12.2f}{b / a:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
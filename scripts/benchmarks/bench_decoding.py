@@ -0,0 +1,109 @@
+"""
+[KIS 응답 디코딩 벤치마크]
+
+KIS 샘플 헬퍼 방식(pandas DataFrame 생성 후 한 행 꺼내기)과
+app/infrastructure/kis_decoders.py(JSON -> 도메인 객체 직접 변환)를 비교합니다.
+
+1. 실행 방법:
+   export PYTHONPATH=$(pwd)
+   python scripts/benchmarks/bench_decoding.py [반복 횟수]
+
+2. 측정 항목:
+   - inquire_price:   현재가 1건 -> Stock
+   - volume_rank:     거래대금 순위 30건 -> 응답 dict 목록
+   - inquire_balance: 잔고 (보유 20종목) -> {summary, holdings}
+   - import pandas:   새 프로세스에서 pandas import에 걸리는 시간
+   KIS 서버에 접속하지 않습니다 (응답 형식만 흉내 낸 고정 데이터 사용).
+"""
+import os
+import subprocess
+import sys
+import time
+sys.path.insert(0, os.getcwd())
+
+import pandas as pd
+
+from app.domain.models import Stock
+from app.infrastructure.kis_decoders import decode_balance, decode_rankings, decode_stock
+
+PRICE_OUTPUT = {
+    "stck_prpr": "70000", "prdy_vrss": "-500", "prdy_ctrt": "-0.71", "acml_vol": "12345678",
+    **{f"field_{i}": str(i) for i in range(70)},  # 실제 응답처럼 사용하지 않는 필드가 많음
+}
+RANK_OUTPUT = [
+    {"mksc_shrn_iscd": f"{i:06d}", "hts_kor_isnm": f"종목{i}", "stck_prpr": "10000",
+     "prdy_ctrt": "1.5", "acml_tr_pbmn": "123456789000", **{f"field_{j}": "0" for j in range(20)}}
+    for i in range(30)
+]
+BALANCE_OUTPUT1 = [
+    {"pdno": f"{i:06d}", "prdt_name": f"종목{i}", "hldg_qty": "10", "pchs_avg_pric": "10000",
+     "prpr": "10500", "evlu_pfls_amt": "5000", **{f"field_{j}": "0" for j in range(20)}}
+    for i in range(20)
+]
+BALANCE_OUTPUT2 = [{"dnca_tot_amt": "1000000", "tot_evlu_amt": "3100000", **{f"field_{j}": "0" for j in range(20)}}]
+
+
+def pandas_price():
+    df = pd.DataFrame(PRICE_OUTPUT, index=[0])
+    return Stock(
+        code="005930",
+        name="삼성전자",
+        price=float(df["stck_prpr"].values[0]),
+        change_amount=float(df["prdy_vrss"].values[0]),
+        change_rate=float(df["prdy_ctrt"].values[0]),
+    )
+
+
+def pandas_rank():
+    df = pd.DataFrame(RANK_OUTPUT)
+    return [
+        {
+            "code": row["mksc_shrn_iscd"],
+            "name": row["hts_kor_isnm"],
+            "price": float(row["stck_prpr"]),
+            "change_rate": float(row["prdy_ctrt"]),
+            "amount": float(row["acml_tr_pbmn"]),
+        }
+        for _, row in df.iterrows()
+    ]
+
+
+def pandas_balance():
+    df1, df2 = pd.DataFrame(BALANCE_OUTPUT1), pd.DataFrame(BALANCE_OUTPUT2)
+    holdings = df1[df1["hldg_qty"].astype(int) > 0].to_dict("records")
+    return {"summary": df2.iloc[0].to_dict(), "holdings": holdings}
+
+
+def timeit(func, n: int) -> float:
+    """1회당 평균 시간 (마이크로초)"""
+    start = time.perf_counter()
+    for _ in range(n):
+        func()
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def import_time(module: str) -> float:
+    """새 프로세스에서 module import 시간 (밀리초)"""
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return float(out) * 1000
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    cases = (
+        ("inquire_price", pandas_price, lambda: decode_stock("005930", "삼성전자", PRICE_OUTPUT)),
+        ("volume_rank", pandas_rank, lambda: decode_rankings(RANK_OUTPUT)),
+        ("inquire_balance", pandas_balance, lambda: decode_balance(BALANCE_OUTPUT1, BALANCE_OUTPUT2)),
+    )
+
+    print(f"{'case':<18}{'pandas(us)':>12}{'decoder(us)':>13}{'speedup':>10}")
+    for name, before, after in cases:
+        assert before() == after(), name
+        b, a = timeit(before, n), timeit(after, n)
+        print(f"{name:<18}{b:>12.1f}{a:>13.1f}{b / a:>9.1f}x")
+    print(f"{'import pandas':<18}{import_time('pandas'):>12.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
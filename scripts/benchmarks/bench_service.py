@@ -0,0 +1,111 @@
+"""
+[서비스 계층 마이크로 벤치마크: AsyncTradingService._get_cached_data]
+
+HTTP 계층 없이 캐시 조회 경로 자체의 비용을 측정합니다.
+
+1. 실행 방법:
+   export PYTHONPATH=$(pwd)
+   python scripts/benchmarks/bench_service.py [--iterations 20000] [--output bench_service.json]
+
+2. 측정 항목 (1회당 마이크로초, us_per_op):
+   - fresh_hit:   TTL 안의 엔트리 조회
+   - miss:        매번 새 키 (fetch 지연 0, 캐시 저장 포함)
+   - coalesced:   같은 키를 동시에 100번 조회 (upstream 1ms, single-flight로 1번만 호출) - 100회 묶음당 시간
+   - stale_swr:   TTL이 지난 엔트리 조회 (stale 값 즉시 응답 + 백그라운드 갱신 합류)
+   결과 형식은 results.py 참고. compare.py로 커밋 간 비교합니다.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+sys.path.insert(0, os.getcwd())
+
+from app.application.async_trading_service import AsyncTradingService
+from app.core.cache import CachePolicy, MemoryCache
+
+from fake_repository import FakeStockRepository
+from results import write_results
+
+VALUE = {"code": "005930", "name": "삼성전자", "price": 70000.0, "change_amount": 1000.0, "change_rate": 1.45}
+
+
+def build_service(ttl: float = 3600) -> AsyncTradingService:
+    cache = MemoryCache(max_entries=10 ** 7, max_bytes=2 ** 40, policies={"bench": CachePolicy(ttl=ttl, max_stale=3600)})
+    return AsyncTradingService(stock_repository=FakeStockRepository(), cache=cache, stale_while_revalidate=True)
+
+
+async def fetch_value():
+    return VALUE
+
+
+async def slow_fetch():
+    await asyncio.sleep(0.001)
+    return VALUE
+
+
+async def bench_fresh_hit(n: int) -> float:
+    service = build_service()
+    await service._get_cached_data("bench_hit", fetch_value)
+    start = time.perf_counter()
+    for _ in range(n):
+        await service._get_cached_data("bench_hit", fetch_value)
+    return (time.perf_counter() - start) / n
+
+
+async def bench_miss(n: int) -> float:
+    service = build_service()
+    start = time.perf_counter()
+    for i in range(n):
+        await service._get_cached_data(f"bench_{i}", fetch_value)
+    return (time.perf_counter() - start) / n
+
+
+async def bench_coalesced(n: int) -> float:
+    service = build_service()
+    rounds = max(n // 100, 1)
+    start = time.perf_counter()
+    for i in range(rounds):
+        await asyncio.gather(*(service._get_cached_data(f"bench_{i}", slow_fetch) for _ in range(100)))
+    return (time.perf_counter() - start) / rounds
+
+
+async def bench_stale(n: int) -> float:
+    service = build_service(ttl=0)
+    await service._get_cached_data("bench_stale", fetch_value)
+    start = time.perf_counter()
+    for _ in range(n):
+        await service._get_cached_data("bench_stale", slow_fetch)
+    elapsed = time.perf_counter() - start
+    await asyncio.sleep(0.01)  # 백그라운드 갱신 정리
+    return elapsed / n
+
+
+CASES = (
+    ("fresh_hit", bench_fresh_hit),
+    ("miss", bench_miss),
+    ("coalesced", bench_coalesced),
+    ("stale_swr", bench_stale),
+)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="_get_cached_data 마이크로 벤치마크")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--output", default="-")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'case':<12}{'us/op':>12}{'ops/s':>14}", file=sys.stderr)
+    for name, bench in CASES:
+        seconds = await bench(args.iterations)
+        print(f"{name:<12}{seconds * 1e6:>12.2f}{1 / seconds:>14.0f}", file=sys.stderr)
+        results.append({
+            "key": {"case": name},
+            "metrics": {"us_per_op": round(seconds * 1e6, 3), "ops_per_s": round(1 / seconds, 1)},
+        })
+    write_results(args.output, "service", {"iterations": args.iterations}, results)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,61 @@
+"""
+[벤치마크 결과 비교]
+
+같은 벤치마크의 결과 JSON 두 개(기준, 비교 대상)를 key별로 비교하고, 허용 범위를 넘게 나빠진 항목을 표시합니다.
+
+1. 실행 방법:
+   git checkout <기준 커밋> && python scripts/benchmarks/bench_api.py --output base.json
+   git checkout <비교 커밋> && python scripts/benchmarks/bench_api.py --output head.json
+   python scripts/benchmarks/compare.py base.json head.json [--threshold 0.10]
+
+2. 판정:
+   - 지연 시간(*_ms, us_per_op)은 커질수록, 처리량(rps, ops_per_s)은 작아질수록 나빠진 것으로 봅니다.
+   - 변화율이 threshold(기본 10%)를 넘게 나빠진 항목이 있으면 종료 코드 1 (CI에서 사용 가능)
+"""
+import argparse
+import json
+import sys
+
+HIGHER_IS_BETTER = {"rps", "ops_per_s"}
+LOWER_IS_BETTER = {"p50_ms", "p90_ms", "p99_ms", "us_per_op"}
+
+
+def load(path: str):
+    """결과 파일 -> ({key JSON: metrics}, meta)"""
+    with open(path, encoding="utf-8") as f:
+        document = json.load(f)
+    return {json.dumps(r["key"], sort_keys=True): r["metrics"] for r in document["results"]}, document["meta"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크 결과 비교")
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args()
+
+    base, base_meta = load(args.base)
+    head, head_meta = load(args.head)
+    print(f"{base_meta['benchmark']}: {base_meta['commit']} -> {head_meta['commit']}")
+
+    regressions = 0
+    for key in sorted(base.keys() & head.keys()):
+        for metric in sorted((HIGHER_IS_BETTER | LOWER_IS_BETTER) & base[key].keys() & head[key].keys()):
+            before, after = base[key][metric], head[key][metric]
+            if not before:
+                continue
+            change = (after - before) / before
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            flag = "REGRESSION" if worse > args.threshold else ""
+            regressions += bool(flag)
+            print(f"{key:<60} {metric:<10} {before:>12.3f} -> {after:>12.3f} {change:>+8.1%} {flag}")
+
+    missing = base.keys() ^ head.keys()
+    if missing:
+        print(f"한쪽에만 있는 항목 {len(missing)}개는 비교하지 않았습니다.")
+    print(f"regressions: {regressions}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+[벤치마크용 Fake Repository]
+
+KIS 대신 응답을 만들어 주는 AsyncStockRepository 구현체입니다.
+upstream 지연 시간(고정 + 무작위 jitter)을 넣을 수 있어, 캐시/single-flight/rate limiter 밖의
+서비스 계층 비용과 KIS 응답 대기를 분리해서 측정할 수 있습니다.
+
+어떤 종목코드든 응답하므로, 매번 새 종목코드를 요청하면 캐시 miss를 만들 수 있습니다.
+bench_api.py, bench_service.py에서 사용합니다.
+"""
+import asyncio
+import random
+from typing import Dict, List, Optional
+
+from app.domain.models import Order, Stock
+from app.domain.repositories.async_stock_repository import AsyncStockRepository
+
+
+class FakeStockRepository(AsyncStockRepository):
+    """고정 데이터 + 주입 가능한 지연 시간"""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, seed: Optional[int] = 0):
+        """
+        Args:
+            latency: upstream 호출마다 기다리는 시간 (초)
+            jitter: latency에 더하는 0~jitter초 무작위 시간
+            seed: jitter 난수 seed (None이면 매번 다름)
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.calls: Dict[str, int] = {}
+        self._random = random.Random(seed)
+
+    async def _wait(self, method: str):
+        self.calls[method] = self.calls.get(method, 0) + 1
+        delay = self.latency + (self._random.random() * self.jitter if self.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def get_stock_price(self, code: str) -> Optional[Stock]:
+        await self._wait("get_stock_price")
+        base = 10000 + int(code) % 90000 if code.isdigit() else 50000
+        return Stock(code=code, name=f"종목{code}", price=float(base), change_amount=100.0, change_rate=1.0)
+
+    async def get_order_book(self, code: str) -> Dict:
+        await self._wait("get_order_book")
+        return {
+            "asks": [{"price": 70100.0 + i * 100, "volume": 1000 + i} for i in range(10)],
+            "bids": [{"price": 70000.0 - i * 100, "volume": 2000 + i} for i in range(10)],
+        }
+
+    async def get_stock_chart(self, code: str) -> List[Dict]:
+        await self._wait("get_stock_chart")
+        return [
+            {"date": "20250102", "time": f"{9 + (i + 30) // 60:02d}{(i + 30) % 60:02d}00",
+             "price": 70000.0 + i, "volume": 100 + i}
+            for i in range(30)
+        ]
+
+    async def place_order(self, order: Order) -> Dict:
+        await self._wait("place_order")
+        return {"ODNO": "0000000001", "msg1": "주문 전송 완료"}
+
+    async def get_balance(self) -> Dict:
+        await self._wait("get_balance")
+        return {
+            "summary": {"dnca_tot_amt": "1000000", "tot_evlu_amt": "3100000"},
+            "holdings": [{"pdno": f"{i:06d}", "prdt_name": f"종목{i}", "hldg_qty": "10"} for i in range(20)],
+        }
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
@@ -0,0 +1,58 @@
+"""
+[벤치마크 결과 파일 형식]
+
+bench_api.py, bench_service.py는 결과를 같은 JSON 형식으로 저장하고, compare.py로 두 결과를 비교합니다.
+
+{
+  "meta": {"benchmark": "api", "commit": "...", "python": "3.11.7", "timestamp": "...", "params": {...}},
+  "results": [
+    {"key": {"endpoint": "detail", "concurrency": 32, "hit_ratio": 0.9}, "metrics": {"rps": ..., "p99_ms": ...}},
+    ...
+  ]
+}
+key는 측정 조건, metrics는 측정값입니다. 같은 key끼리 비교합니다.
+"""
+from datetime import datetime
+from typing import Dict, List, Sequence
+import json
+import math
+import platform
+import subprocess
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """정렬된 값 목록의 q(0~1) 백분위수 (nearest-rank)"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(q * len(sorted_values)) - 1)]
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def write_results(path: str, benchmark: str, params: Dict, results: List[Dict]):
+    """결과를 JSON 파일로 저장 (path가 "-"이면 표준출력)"""
+    document = {
+        "meta": {
+            "benchmark": benchmark,
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "params": params,
+        },
+        "results": results,
+    }
+    text = json.dumps(document, ensure_ascii=False, indent=2)
+    if path == "-":
+        print(text)
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text + "\n")
+    print(f"결과 저장: {path}")
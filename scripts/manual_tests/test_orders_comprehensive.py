@@ -20,14 +20,19 @@
    - 시간외 단일가: 성공 (단, 거래시간/유동성에 따라 체결은 안 될 수 있음)
    
 4. 주의사항:
-   - "초당 거래건수를 초과하였습니다" 에러 발생 시, 스크립트의 time.sleep() 시간을 늘려주세요.
+   - 모든 KIS 호출은 전역 rate limiter(app/core/rate_limiter.py)를 거칩니다.
+     "초당 거래건수를 초과하였습니다" 에러 발생 시, KIS_RATE_LIMIT_PER_SEC 환경변수를 낮춰주세요.
    - 판매 테스트는 계좌에 삼성전자 주식이 있어야 성공합니다.
 """
 import sys
 import os
-import time
 sys.path.insert(0, os.getcwd())
 from app.infrastructure.kis_client import kis_client
+from app.core.rate_limiter import Priority, rate_limited
+
+get_stock_price = rate_limited(Priority.QUOTE, kis_client.get_stock_price)
+place_order = rate_limited(Priority.ORDER, kis_client.place_order)
+get_balance = rate_limited(Priority.BALANCE, kis_client.get_balance)
 
 STOCK_CODE = "005930" # Samsung Electronics
 
@@ -39,14 +44,14 @@ def run_order_test(description, order_type, order_dvsn, qty, price=0):
         # Fetch current price first just to have a reference
         if price == 0 and order_dvsn in ["00", "07"]:
             # If price is needed but 0 provided, fetch current
-            stock = kis_client.get_stock_price(STOCK_CODE)
+            stock = get_stock_price(STOCK_CODE)
             if stock:
                 # For limit order, buy lower / sell higher if we don't want immediate fill?
                 # But for testing SUCCESS of placement, we just want to send a valid price.
                 price = int(stock['price'])
                 print(f"Fetched current price: {price}")
         
-        result = kis_client.place_order(STOCK_CODE, qty, price, order_type, order_dvsn)
+        result = place_order(STOCK_CODE, qty, price, order_type, order_dvsn)
         
         if "error" in result:
             print(f"FAILED: {result['error']}")
@@ -60,8 +65,7 @@ def run_order_test(description, order_type, order_dvsn, qty, price=0):
             
     except Exception as e:
         print(f"EXCEPTION: {e}")
-    
-    time.sleep(2) # Prevent rate limit
+
 
 def test_orders():
     print(f"Starting Comprehensive Order Tests for {STOCK_CODE}")
@@ -76,7 +80,7 @@ def test_orders():
     # --- SELL TESTS ---
     # Assuming we have enough holdings. 
     # Current balance check
-    bal = kis_client.get_balance()
+    bal = get_balance()
     holdings = {h['pdno']: int(h['hldg_qty']) for h in bal.get('holdings', [])}
     cur_qty = holdings.get(STOCK_CODE, 0)
     print(f"\nCurrent Holdings of {STOCK_CODE}: {cur_qty}")
@@ -0,0 +1,140 @@
+"""
+AsyncKisStockRepository 단위 테스트
+
+httpx.MockTransport로 KIS API 응답을 흉내내어 네트워크 없이 응답 변환을 검증합니다.
+"""
+import asyncio
+import httpx
+import pytest
+from app.core.rate_limiter import RateLimiter
+from app.domain.models import Order
+from app.domain.repositories.async_stock_repository import OrderOutcomeUnknown
+from app.infrastructure.persistence.async_kis_stock_repository import AsyncKisStockRepository
+
+CONFIG = {
+    "paper_app": "app", "paper_sec": "sec", "my_paper_stock": "12345678", "my_prod": "01",
+    "vps": "https://kis.test",
+}
+
+
+def make_repository(handler):
+    return AsyncKisStockRepository(
+        config=CONFIG, server="vps", transport=httpx.MockTransport(handler),
+        rate_limiter=RateLimiter(rate=1000),
+    )
+
+
+def kis_handler(request: httpx.Request) -> httpx.Response:
+    path = request.url.path
+    if path == "/oauth2/tokenP":
+        return httpx.Response(200, json={"access_token": "token", "expires_in": 86400})
+    assert request.headers["authorization"] == "Bearer token"
+    if path.endswith("/search-stock-info"):
+        return httpx.Response(200, json={"rt_cd": "0", "output": {"prdt_abrv_name": "삼성전자"}})
+    if path.endswith("/inquire-price"):
+        return httpx.Response(200, json={
+            "rt_cd": "0", "output": {"stck_prpr": "70000", "prdy_vrss": "-500", "prdy_ctrt": "-0.71"},
+        })
+    if path.endswith("/inquire-asking-price-exp-ccn"):
+        output = {}
+        for i in range(1, 11):
+            output.update({f"askp{i}": str(70000 + i * 100), f"askp_rsqn{i}": str(i),
+                           f"bidp{i}": str(70000 - i * 100), f"bidp_rsqn{i}": str(i * 2)})
+        return httpx.Response(200, json={"rt_cd": "0", "output1": output})
+    if path.endswith("/inquire-index-price"):
+        assert request.url.params["FID_INPUT_ISCD"] == "0001"
+        return httpx.Response(200, json={"rt_cd": "0", "output": {
+            "bstp_nmix_prpr": "2650.12", "bstp_nmix_prdy_vrss": "10.5", "bstp_nmix_prdy_ctrt": "0.40",
+        }})
+    if path.endswith("/inquire-time-indexchartprice"):
+        return httpx.Response(200, json={"rt_cd": "0", "output2": [
+            {"stck_bsop_date": "20250102", "stck_cntg_hour": "090100", "bstp_nmix_prpr": "2651.00", "cntg_vol": "5"},
+            {"stck_bsop_date": "20250102", "stck_cntg_hour": "090000", "bstp_nmix_prpr": "2650.12", "cntg_vol": "3"},
+        ]})
+    if path.endswith("/volume-rank"):
+        assert request.url.params["FID_BLNG_CLS_CODE"] == "3"
+        return httpx.Response(200, json={"rt_cd": "0", "output": [{
+            "mksc_shrn_iscd": "005930", "hts_kor_isnm": "삼성전자",
+            "stck_prpr": "70000", "prdy_ctrt": "1.2", "acml_tr_pbmn": "1500000000000",
+        }]})
+    if path.endswith("/order-cash"):
+        return httpx.Response(200, json={"rt_cd": "1", "msg_cd": "APBK0919", "msg1": "주문가능금액을 초과"})
+    return httpx.Response(404)
+
+
+def test_get_stock_price_maps_to_domain():
+    repo = make_repository(kis_handler)
+
+    stock = asyncio.run(repo.get_stock_price("005930"))
+
+    assert stock.name == "삼성전자"
+    assert stock.price == 70000.0
+    assert stock.change_amount == -500.0
+
+
+def test_get_stock_price_uses_name_lookup():
+    """name_lookup(종목 마스터)에 있는 종목은 종목명 조회(CTPF1002R)를 하지 않음"""
+    paths = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.path)
+        return kis_handler(request)
+    repo = AsyncKisStockRepository(
+        config=CONFIG, server="vps", transport=httpx.MockTransport(handler),
+        rate_limiter=RateLimiter(rate=1000), name_lookup={"005930": "삼성전자(마스터)"}.get,
+    )
+
+    stock = asyncio.run(repo.get_stock_price("005930"))
+    other = asyncio.run(repo.get_stock_price("000660"))
+
+    assert stock.name == "삼성전자(마스터)"
+    assert other.name == "삼성전자"
+    assert sum(path.endswith("/search-stock-info") for path in paths) == 1
+
+
+def test_get_order_book_levels():
+    repo = make_repository(kis_handler)
+
+    book = asyncio.run(repo.get_order_book("005930"))
+
+    assert len(book["asks"]) == 10 and len(book["bids"]) == 10
+    assert book["asks"][0] == {"price": 70100.0, "volume": 1}
+    assert book["bids"][0] == {"price": 69900.0, "volume": 2}
+
+
+def test_index_quotations_and_trade_amount_ranking():
+    repo = make_repository(kis_handler)
+
+    index = asyncio.run(repo.get_index_price("0001"))
+    chart = asyncio.run(repo.get_index_chart("0001"))
+    ranking = asyncio.run(repo.get_trade_amount_ranking())
+
+    assert index == {"price": 2650.12, "change": 10.5, "rate": 0.4}
+    assert [(bar["time"], bar["price"]) for bar in chart] == [("090000", 2650.12), ("090100", 2651.0)]
+    assert ranking == [{"code": "005930", "name": "삼성전자", "price": 70000.0, "change_rate": 1.2, "amount": 1.5e12}]
+
+
+def test_place_order_error_is_returned():
+    repo = make_repository(kis_handler)
+    order = Order(stock_code="005930", quantity=1, price=70000, order_type="buy")
+
+    result = asyncio.run(repo.place_order(order))
+
+    assert "주문가능금액을 초과" in result["error"]
+
+
+def test_place_order_transport_errors():
+    """연결 전 실패는 거부, 요청을 보낸 뒤 응답을 못 받으면 OrderOutcomeUnknown"""
+    def failing(error):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("/order-cash"):
+                raise error("boom", request=request)
+            return kis_handler(request)
+        return handler
+    order = Order(stock_code="005930", quantity=1, price=70000, order_type="buy")
+
+    not_sent = asyncio.run(make_repository(failing(httpx.ConnectError)).place_order(order))
+    with pytest.raises(OrderOutcomeUnknown):
+        asyncio.run(make_repository(failing(httpx.ReadTimeout)).place_order(order))
+
+    assert "not sent" in not_sent["error"]
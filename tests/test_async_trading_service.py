@@ -0,0 +1,357 @@
+"""
+AsyncTradingService 단위 테스트
+
+TradingService 테스트와 같은 Given-When-Then 패턴을 사용하며,
+coroutine은 asyncio.run으로 실행합니다.
+"""
+import asyncio
+import time
+import pytest
+from app.application.async_trading_service import AsyncTradingService
+from app.core.encoding import decode_json
+from app.domain.models import Stock, Order
+from app.domain.repositories.async_stock_repository import AsyncStockRepository
+
+
+class MockAsyncStockRepository(AsyncStockRepository):
+    """테스트용 Mock Async Repository"""
+    
+    def __init__(self):
+        self.mock_data = {}
+        self.price_calls = 0
+        self.balance_calls = 0
+        self.delay = 0
+    
+    async def get_stock_price(self, code: str):
+        self.price_calls += 1
+        await asyncio.sleep(self.delay)
+        if code in self.mock_data:
+            return Stock(**self.mock_data[code])
+        return None
+    
+    async def get_order_book(self, code: str):
+        return {"asks": [], "bids": []}
+    
+    async def get_stock_chart(self, code: str):
+        return []
+    
+    async def place_order(self, order: Order):
+        return {"success": True, "order_id": "12345"}
+    
+    async def get_balance(self):
+        self.balance_calls += 1
+        return {"cash": 1000000}
+
+
+SAMSUNG = {
+    "code": "005930",
+    "name": "삼성전자",
+    "price": 70000.0,
+    "change_amount": 1000.0,
+    "change_rate": 1.45,
+}
+
+
+class TestAsyncTradingService:
+    
+    def setup_method(self):
+        self.mock_repo = MockAsyncStockRepository()
+        self.service = AsyncTradingService(stock_repository=self.mock_repo)
+    
+    def test_get_stock_detail_success(self):
+        """
+        Given: 종목 코드 "005930"에 대한 Mock 데이터가 있을 때
+        When: get_stock_detail을 await 하면
+        Then: Stock 엔티티가 반환되어야 함
+        """
+        self.mock_repo.mock_data["005930"] = dict(SAMSUNG)
+        
+        result = asyncio.run(self.service.get_stock_detail("005930"))
+        
+        assert result.code == "005930"
+        assert result.price == 70000.0
+    
+    def test_get_stock_detail_not_found(self):
+        with pytest.raises(Exception, match="Stock not found"):
+            asyncio.run(self.service.get_stock_detail("999999"))
+    
+    def test_execute_order(self):
+        result = asyncio.run(self.service.execute_order("005930", 10, 70000.0, "buy"))
+        
+        assert result["success"] is True
+    
+    def test_concurrent_requests_are_coalesced(self):
+        """
+        Given: upstream 응답이 느릴 때
+        When: 같은 종목을 동시에 여러 번 조회하면
+        Then: upstream은 한 번만 호출되어야 함
+        """
+        # Given
+        self.mock_repo.mock_data["005930"] = dict(SAMSUNG)
+        self.mock_repo.delay = 0.05
+        
+        async def scenario():
+            return await asyncio.gather(
+                *[self.service.get_stock_detail("005930") for _ in range(20)]
+            )
+        
+        # When
+        results = asyncio.run(scenario())
+        
+        # Then
+        assert self.mock_repo.price_calls == 1
+        assert all(r.price == 70000.0 for r in results)
+        assert self.service.get_cache_stats()["coalesced_calls"] == 19
+    
+    def test_stale_while_revalidate_refreshes_in_background(self):
+        """
+        Given: TTL이 만료되었지만 max_stale 한도 안의 캐시 항목이 있을 때
+        When: 조회하면
+        Then: stale 데이터를 즉시 반환하고, 백그라운드 갱신 후에는 새 데이터를 반환해야 함
+        """
+        # Given
+        self.service._cache.set("market_indices", {"v": "old"}, stored_at=time.time() - 10)
+        release = asyncio.Event()
+        
+        async def slow_fetch():
+            await release.wait()
+            return {"v": "new"}
+        
+        async def scenario():
+            stale = await self.service._get_cached_data("market_indices", slow_fetch)
+            release.set()
+            await self.service._inflight["market_indices"]
+            return stale, await self.service._get_cached_data("market_indices", slow_fetch)
+        
+        # When
+        stale, fresh = asyncio.run(scenario())
+        
+        # Then
+        assert stale == {"v": "old"}
+        assert fresh == {"v": "new"}
+        stats = self.service.get_cache_stats()
+        assert stats["background_refreshes"] == 1
+        assert stats["cache"]["categories"]["market_indices"]["stale_served"] == 1
+    
+    def test_entry_past_max_stale_is_not_served(self):
+        """
+        Given: max_stale 한도(market_indices: TTL 5초 + 30초)를 넘은 캐시 항목이 있을 때
+        When: 조회하면
+        Then: stale 데이터 대신 upstream의 새 데이터를 기다려서 반환해야 함
+        """
+        # Given
+        self.service._cache.set("market_indices", {"v": "old"}, stored_at=time.time() - 120)
+        
+        async def fetch():
+            return {"v": "new"}
+        
+        # When
+        result = asyncio.run(self.service._get_cached_data("market_indices", fetch))
+        
+        # Then
+        assert result == {"v": "new"}
+        assert self.service.get_cache_stats()["stale_served"] == 0
+    
+    def test_batch_quotes_fetch_only_cache_misses(self):
+        """
+        Given: 한 종목은 이미 캐시에 있고 나머지는 캐시에 없을 때
+        When: get_stock_details로 여러 종목을 한 번에 조회하면
+        Then: 캐시에 없는 종목만 upstream을 호출하고, 종목별 상태가 반환되어야 함
+        """
+        # Given
+        self.mock_repo.mock_data["005930"] = dict(SAMSUNG)
+        self.mock_repo.mock_data["000660"] = {**SAMSUNG, "code": "000660", "name": "SK하이닉스"}
+        asyncio.run(self.service.get_stock_detail("005930"))
+        assert self.mock_repo.price_calls == 1
+        
+        # When
+        results = asyncio.run(self.service.get_stock_details(["005930", "000660", "999999", "000660"]))
+        
+        # Then
+        assert self.mock_repo.price_calls == 3
+        assert list(results) == ["005930", "000660", "999999"]
+        assert results["005930"]["source"] == "cache"
+        assert results["000660"]["status"] == "ok"
+        assert results["000660"]["data"]["name"] == "SK하이닉스"
+        assert results["999999"]["status"] == "not_found"
+        
+        # 일괄 조회 결과도 캐시되어 단건 조회에서 재사용
+        asyncio.run(self.service.get_stock_detail("000660"))
+        assert self.mock_repo.price_calls == 3
+    
+    def test_batch_quotes_report_per_symbol_errors(self):
+        """
+        Given: 한 종목의 upstream 조회가 실패할 때
+        When: get_stock_details로 조회하면
+        Then: 해당 종목만 error 상태이고 나머지는 정상 반환되어야 함
+        """
+        # Given
+        self.mock_repo.mock_data["005930"] = dict(SAMSUNG)
+        original = self.mock_repo.get_stock_price
+        
+        async def flaky(code):
+            if code == "000660":
+                raise RuntimeError("EGW00201")
+            return await original(code)
+        self.mock_repo.get_stock_price = flaky
+        
+        # When
+        results = asyncio.run(self.service.get_stock_details(["005930", "000660"]))
+        
+        # Then
+        assert results["005930"]["status"] == "ok"
+        assert results["000660"]["status"] == "error"
+    
+    def test_stock_snapshot_combines_parts(self):
+        """
+        Given: 종목 데이터가 있을 때
+        When: chart를 제외하고 get_stock_snapshot을 호출하면
+        Then: detail, hoga, balance만 한 번에 반환되어야 함
+        """
+        # Given
+        self.mock_repo.mock_data["005930"] = dict(SAMSUNG)
+        
+        # When
+        snapshot = asyncio.run(self.service.get_stock_snapshot("005930", exclude={"chart"}))
+        
+        # Then
+        assert snapshot["detail"]["price"] == 70000.0
+        assert snapshot["hoga"] == {"asks": [], "bids": []}
+        assert snapshot["balance"] == {"cash": 1000000}
+        assert "chart" not in snapshot
+        assert "errors" not in snapshot
+    
+    def test_stock_snapshot_body_reuses_encoded_cache_entries(self):
+        """
+        Given: 종합 조회 결과가 있을 때
+        When: 응답 본문으로 인코딩하면
+        Then: 캐시 엔트리의 인코딩된 본문이 그대로 들어가고, 디코딩하면 결과와 같아야 함
+        """
+        # Given
+        self.mock_repo.mock_data["005930"] = dict(SAMSUNG)
+        snapshot = asyncio.run(self.service.get_stock_snapshot("005930", exclude={"chart"}))
+        
+        # When
+        body = self.service.encode_snapshot("005930", snapshot)
+        
+        # Then
+        detail_body, _ = self.service.get_cached_body("stock_detail_005930", snapshot["detail"])
+        assert b'"detail":' + detail_body in body
+        assert decode_json(body) == snapshot
+    
+    def test_stock_snapshot_reports_failed_parts(self):
+        """
+        Given: 존재하지 않는 종목일 때
+        When: get_stock_snapshot을 호출하면
+        Then: detail만 None으로 실패 처리되고 나머지 항목은 반환되어야 함
+        """
+        snapshot = asyncio.run(self.service.get_stock_snapshot("999999"))
+        
+        assert snapshot["detail"] is None
+        assert snapshot["errors"] == {"detail": "Stock not found"}
+        assert snapshot["balance"] == {"cash": 1000000}
+    
+    def test_stock_chart_since_returns_delta(self):
+        """
+        Given: 차트 봉이 병합되어 있을 때
+        When: since를 지정하여 get_stock_chart를 호출하면
+        Then: 해당 시각 이후(같은 시각 포함) 봉만 반환되어야 함
+        """
+        # Given
+        async def chart(code):
+            return [
+                {"date": "20250102", "time": t, "price": p, "volume": 1}
+                for t, p in (("090000", 100.0), ("090100", 101.0), ("090200", 102.0))
+            ]
+        self.mock_repo.get_stock_chart = chart
+        
+        # When
+        full = asyncio.run(self.service.get_stock_chart("005930"))
+        delta = asyncio.run(self.service.get_stock_chart("005930", since=20250102090100))
+        
+        # Then
+        assert len(full) == 3
+        assert [row["time"] for row in delta] == ["090100", "090200"]
+    
+    def test_market_indices_from_repository(self):
+        """
+        Given: Repository가 업종코드별 지수를 돌려줄 때
+        When: 시장 지수를 조회하면
+        Then: 코스피/코스닥/코스피200 키로 묶어서 반환해야 함
+        """
+        async def index_price(code):
+            return {"price": float(code), "change": 0.0, "rate": 0.0}
+        self.mock_repo.get_index_price = index_price
+
+        indices = asyncio.run(self.service.get_market_indices())
+
+        assert indices["kospi"]["price"] == 1.0
+        assert indices["kosdaq"]["price"] == 1001.0
+        assert indices["kospi200"]["price"] == 2001.0
+
+    def test_daily_chart_default_range_uses_resolved_cache_key(self):
+        """
+        Given: 기간을 지정하지 않고 일봉을 조회했을 때
+        When: 엔드포인트가 같은 인자로 캐시 키를 만들면
+        Then: 기본 기간이 채워진 키로 인코딩된 본문을 찾을 수 있어야 함
+        """
+        async def daily_chart(code, start, end):
+            return [{"date": str(end), "price": 70000.0}]
+        self.mock_repo.get_daily_chart = daily_chart
+        
+        data = asyncio.run(self.service.get_daily_chart("005930"))
+        
+        assert self.service.get_cached_body(self.service.daily_chart_key("005930"), data) is not None
+    
+    def test_order_book_delta_without_upstream_book(self):
+        """
+        Given: upstream이 호가를 돌려주지 않을 때
+        When: 호가 변경분을 조회하면
+        Then: 보관 중인 스냅샷이 없으면 LookupError, 있으면 그 스냅샷 기준으로 응답해야 함
+        """
+        async def no_book(code):
+            return None
+        self.mock_repo.get_order_book = no_book
+        
+        with pytest.raises(LookupError):
+            asyncio.run(self.service.get_order_book_delta("005930", since=0))
+        
+        seq = self.service._order_books.update("005930", {"asks": [{"price": 70100.0, "volume": 1}], "bids": []})
+        assert asyncio.run(self.service.get_order_book_delta("005930", since=seq)) == {"seq": seq, "changes": []}
+    
+    def test_balance_is_cached_and_refreshed_after_order(self):
+        """
+        Given: 잔고가 캐시되어 있을 때
+        When: 잔고를 다시 조회하고, 주문이 성공하면
+        Then: 재조회는 캐시를 사용하고, 주문 후에는 잔고를 upstream에서 다시 조회해야 함
+        """
+        async def scenario():
+            await self.service.get_balance()
+            await self.service.get_balance()
+            cached_calls = self.mock_repo.balance_calls
+            await self.service.execute_order("005930", 10, 70000.0, "buy")
+            await asyncio.sleep(0.01)
+            return cached_calls
+        
+        cached_calls = asyncio.run(scenario())
+        
+        assert cached_calls == 1
+        assert self.mock_repo.balance_calls == 2
+    
+    def test_fill_notices_are_coalesced(self):
+        """
+        Given: 잔고가 캐시되어 있을 때
+        When: 체결통보가 연달아 3건 오면
+        Then: 잔고는 한 번만 다시 조회되어야 함
+        """
+        async def scenario():
+            await self.service.get_balance()
+            for _ in range(3):
+                self.service.on_fill()
+            await asyncio.sleep(0.01)
+            return await self.service.get_balance()
+        
+        balance = asyncio.run(scenario())
+        
+        assert balance == {"cash": 1000000}
+        assert self.mock_repo.balance_calls == 2
@@ -0,0 +1,169 @@
+"""
+차트 이력 저장소 / read-through 리포지토리 단위 테스트
+
+SQLite는 메모리 DB(":memory:")를 사용하고, upstream은 호출 기록만 남기는 Mock으로 대체합니다.
+"""
+import asyncio
+import time
+
+import pytest
+from app.infrastructure.persistence.candle_history_store import DAILY, MINUTE, CandleHistoryStore
+from app.infrastructure.persistence.history_stock_repository import HistoryStockRepository, shift_date
+
+
+def daily_rows(start, days):
+    return [{"date": str(shift_date(start, i)), "time": "", "price": 100.0 + i, "volume": i} for i in range(days)]
+
+
+class MockUpstream:
+    """일봉/분봉 호출 범위를 기록하는 upstream (일봉은 페이지당 page_size개, 최신부터)"""
+    def __init__(self, page_size=100):
+        self.page_size = page_size
+        self.daily_calls = []
+        self.chart_calls = 0
+
+    async def get_daily_chart(self, code, start, end):
+        self.daily_calls.append((start, end))
+        rows, day = [], end
+        while day >= start and len(rows) < self.page_size:
+            rows.append({"date": str(day), "time": "", "price": 100.0, "volume": 1})
+            day = shift_date(day, -1)
+        return list(reversed(rows))
+
+    async def get_stock_chart(self, code):
+        self.chart_calls += 1
+        return [{"date": time.strftime("%Y%m%d"), "time": "090000", "price": 100.0, "volume": 1}]
+
+
+def test_store_upsert_and_range():
+    # Given: 10일치 일봉 저장 (같은 날짜는 덮어씀)
+    store = CandleHistoryStore(":memory:")
+    store.upsert("005930", DAILY, daily_rows(20250101, 10))
+    store.upsert("005930", DAILY, [{"date": "20250101", "time": "", "price": 1.0, "volume": 9}])
+
+    # When
+    rows = store.range("005930", DAILY, 20250101, 20250103)
+
+    # Then
+    assert [row["date"] for row in rows] == ["20250101", "20250102", "20250103"]
+    assert rows[0] == {"date": "20250101", "time": "", "price": 1.0, "volume": 9}
+    assert store.last_ts("005930", DAILY) == 20250110
+    assert store.range("000660", DAILY) == []
+
+
+def test_daily_chart_fetches_only_missing_segments():
+    # Given
+    upstream = MockUpstream()
+    repo = HistoryStockRepository(upstream, CandleHistoryStore(":memory:"), max_pages=5)
+    asyncio.run(repo.get_daily_chart("005930", 20240301, 20240331))
+    assert upstream.daily_calls == [(20240301, 20240331)]
+
+    # When: 이미 받은 구간 조회 -> upstream 호출 없음
+    cached = asyncio.run(repo.get_daily_chart("005930", 20240310, 20240320))
+    # When: 앞뒤로 넓힌 구간 조회 -> 빠진 앞/뒤 구간만 호출
+    wider = asyncio.run(repo.get_daily_chart("005930", 20240220, 20240405))
+
+    # Then
+    assert len(cached) == 11
+    assert upstream.daily_calls[1:] == [(20240220, 20240229), (20240401, 20240405)]
+    assert len(wider) == 46
+
+
+def test_daily_chart_pages_backwards():
+    # Given: 페이지당 10봉
+    upstream = MockUpstream(page_size=10)
+    repo = HistoryStockRepository(upstream, CandleHistoryStore(":memory:"), max_pages=5)
+
+    # When
+    rows = asyncio.run(repo.get_daily_chart("005930", 20240101, 20240125))
+
+    # Then: 최신 페이지부터 과거 방향으로 3페이지
+    assert upstream.daily_calls == [(20240101, 20240125), (20240101, 20240115), (20240101, 20240105)]
+    assert len(rows) == 25
+
+
+def freeze_time(monkeypatch, yyyymmddhhmmss):
+    now = time.strptime(yyyymmddhhmmss, "%Y%m%d%H%M%S")
+    monkeypatch.setattr(time, "localtime", lambda *args: now)
+
+
+def test_minute_chart_skips_upstream_when_up_to_date(monkeypatch):
+    # Given: 장 마감(15:30) 봉까지 저장되어 있고 현재 시각이 같은 날(목) 18:00
+    store = CandleHistoryStore(":memory:")
+    store.upsert("005930", MINUTE, [
+        {"date": "20250102", "time": "090000", "price": 100.0, "volume": 1},
+        {"date": "20250102", "time": "153000", "price": 101.0, "volume": 2},
+    ])
+    freeze_time(monkeypatch, "20250102180000")
+    upstream = MockUpstream()
+    repo = HistoryStockRepository(upstream, store, max_pages=5)
+
+    # When
+    rows = asyncio.run(repo.get_stock_chart("005930"))
+
+    # Then
+    assert upstream.chart_calls == 0
+    assert [row["time"] for row in rows] == ["090000", "153000"]
+
+
+def test_minute_chart_fetches_when_empty():
+    # Given
+    upstream = MockUpstream()
+    repo = HistoryStockRepository(upstream, CandleHistoryStore(":memory:"), max_pages=5)
+
+    # When
+    rows = asyncio.run(repo.get_stock_chart("005930"))
+
+    # Then
+    assert upstream.chart_calls == 1
+    assert rows[0]["time"] == "090000"
+
+
+def test_minute_chart_freshness_across_hour_boundary(monkeypatch):
+    # Given: 09:59 봉까지 저장되어 있고 현재 시각이 10:00
+    store = CandleHistoryStore(":memory:")
+    store.upsert("005930", MINUTE, [{"date": "20250102", "time": "095900", "price": 100.0, "volume": 1}])
+    freeze_time(monkeypatch, "20250102100000")
+    upstream = MockUpstream()
+    repo = HistoryStockRepository(upstream, store, max_pages=5)
+
+    # When
+    asyncio.run(repo.get_stock_chart("005930"))
+
+    # Then: 1분 차이이므로 upstream 호출 없음
+    assert upstream.chart_calls == 0
+
+
+def test_minute_chart_weekend_and_pre_open_use_last_session(monkeypatch):
+    # Given: 금요일(20250103) 장 마감 봉까지 저장되어 있음
+    store = CandleHistoryStore(":memory:")
+    store.upsert("005930", MINUTE, [{"date": "20250103", "time": "153000", "price": 100.0, "volume": 1}])
+    upstream = MockUpstream()
+    repo = HistoryStockRepository(upstream, store, max_pages=5)
+
+    # When: 토요일 오후, 다음 주 월요일 장 시작 전에 조회
+    freeze_time(monkeypatch, "20250104140000")
+    asyncio.run(repo.get_stock_chart("005930"))
+    freeze_time(monkeypatch, "20250106083000")
+    asyncio.run(repo.get_stock_chart("005930"))
+
+    # Then: 직전 거래일 마감까지 있으므로 upstream 호출 없음
+    assert upstream.chart_calls == 0
+
+
+def test_daily_chart_rejects_reversed_range():
+    repo = HistoryStockRepository(MockUpstream(), CandleHistoryStore(":memory:"), max_pages=5)
+
+    with pytest.raises(ValueError):
+        asyncio.run(repo.get_daily_chart("005930", 20250110, 20250101))
+
+
+def test_store_creates_file_on_first_use(tmp_path):
+    path = tmp_path / "history" / "candles.sqlite3"
+    store = CandleHistoryStore(str(path))
+    assert not path.exists()
+
+    store.upsert("005930", DAILY, daily_rows(20250101, 1))
+
+    assert path.exists()
+    store.close()
@@ -0,0 +1,67 @@
+"""
+공유 HTTP 커넥션 풀 테스트
+
+로컬 HTTP/1.1 서버(keep-alive)에 여러 번 요청하여 연결이 재사용되는지 확인합니다.
+"""
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.infrastructure.http_pool import HttpPool, timeout_for
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'{"rt_cd":"0"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_clients_share_pooled_connections(server_url):
+    # Given: 같은 풀을 쓰는 클라이언트 두 개 (Repository, 종목 마스터 등)
+    pool = HttpPool(max_connections=4, max_keepalive=4)
+
+    async def run():
+        first, second = pool.client(base_url=server_url), pool.client(base_url=server_url)
+        for client in (first, second, first):
+            assert (await client.get("/quotations")).status_code == 200
+        # 클라이언트를 닫아도 공유 풀은 유지
+        await first.aclose()
+        assert (await second.get("/quotations")).status_code == 200
+        await pool.aclose()
+
+    # When
+    asyncio.run(run())
+
+    # Then: 요청마다 새 연결을 열지 않음
+    stats = pool.stats()
+    assert stats["requests"] == 4
+    assert stats["connections_opened"] == 1
+    assert stats["reused"] == 3
+    assert stats["reuse_ratio"] == 0.75
+
+
+def test_timeout_for_uses_longest_matching_prefix():
+    assert timeout_for("/oauth2/tokenP").read == 10.0
+    assert timeout_for("/uapi/domestic-stock/v1/trading/order-cash").read == 10.0
+    assert timeout_for("/uapi/domestic-stock/v1/quotations/inquire-price").read == 5.0
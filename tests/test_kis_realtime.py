@@ -0,0 +1,142 @@
+"""
+KIS 실시간 피드 단위 테스트
+
+실제 KIS 서버 대신 메시지 문자열과 로컬 WebSocket 서버로 검증합니다.
+"""
+import asyncio
+import json
+import websockets
+from app.domain.models import Stock
+from app.infrastructure.kis_realtime import KisRealtimeFeed, TR_EXECUTION, TR_ORDER_BOOK
+from app.infrastructure.persistence.realtime_stock_repository import RealtimeStockRepository
+
+
+def execution_message(code="005930", price="71000"):
+    fields = [code, "093000", price, "2", "1000", "1.43"] + ["0"] * 40
+    return f"0|{TR_EXECUTION}|001|" + "^".join(fields)
+
+
+def order_book_message(code="005930"):
+    fields = [code, "093000", "0"]
+    fields += [str(71000 + i * 100) for i in range(1, 11)]  # ASKP1~10
+    fields += [str(71000 - i * 100) for i in range(10)]     # BIDP1~10
+    fields += [str(i + 1) for i in range(10)]               # ASKP_RSQN1~10
+    fields += [str((i + 1) * 10) for i in range(10)]        # BIDP_RSQN1~10
+    fields += ["0"] * 15
+    return f"0|{TR_ORDER_BOOK}|001|" + "^".join(fields)
+
+
+class MockRestRepository:
+    """REST 위임 대상 (현재가 호출 횟수만 기록)"""
+    def __init__(self):
+        self.price_calls = 0
+
+    async def get_stock_price(self, code):
+        self.price_calls += 1
+        return Stock(code=code, name="삼성전자", price=70000.0, change_amount=1000.0, change_rate=1.45)
+
+
+class FakeKisRepository:
+    def __init__(self, url):
+        self.url = url
+
+    async def get_approval_key(self):
+        return "approval"
+
+    def websocket_url(self):
+        return self.url
+
+    def fill_notice_subscription(self):
+        return None
+
+
+def test_handle_message_updates_store():
+    feed = KisRealtimeFeed(repository=None)
+
+    feed.handle_message(execution_message())
+    feed.handle_message(order_book_message())
+
+    tick = feed.store.get_price("005930", max_age=10)
+    book = feed.store.get_order_book("005930", max_age=10)
+    assert tick["price"] == 71000.0 and tick["change_rate"] == 1.43
+    assert book["asks"][0] == {"price": 71100.0, "volume": 1}
+    assert book["bids"][0] == {"price": 71000.0, "volume": 10}
+
+
+def test_pingpong_is_echoed():
+    feed = KisRealtimeFeed(repository=None)
+    ping = json.dumps({"header": {"tr_id": "PINGPONG", "datetime": "20260101093000"}})
+
+    assert feed.handle_message(ping) == ping
+
+
+def test_desired_symbols_respect_subscription_limit():
+    feed = KisRealtimeFeed(repository=None, max_subscriptions=4)  # 종목 2개
+    for code in ["000001", "000002", "000003"]:
+        feed.watch(code)
+        feed._watched[code] -= 1 if code == "000001" else 0
+
+    assert feed.desired_symbols() == {"000002", "000003"}
+
+
+def test_realtime_repository_prefers_live_data():
+    mock_repo = MockRestRepository()
+    feed = KisRealtimeFeed(repository=None)
+    repo = RealtimeStockRepository(mock_repo, feed, max_age=10)
+
+    first = asyncio.run(repo.get_stock_price("005930"))  # REST (종목명 확보)
+    feed.handle_message(execution_message(price="72000"))
+    second = asyncio.run(repo.get_stock_price("005930"))
+
+    assert first.price == 70000.0
+    assert second.price == 72000.0 and second.name == "삼성전자"
+    assert mock_repo.price_calls == 1
+
+
+def test_realtime_repository_keeps_base_stocks_of_recent_symbols_only():
+    repo = RealtimeStockRepository(MockRestRepository(), KisRealtimeFeed(repository=None), max_base_stocks=2)
+
+    for code in ["000001", "000002", "000001", "000003"]:
+        asyncio.run(repo.get_stock_price(code))
+
+    assert list(repo._base_stocks) == ["000001", "000003"]
+
+
+def test_feed_subscribes_watched_symbols_over_websocket():
+    received = []
+
+    async def kis_server(ws):
+        async for raw in ws:
+            received.append(json.loads(raw))
+            if len(received) == 2:
+                await ws.send(execution_message())
+
+    async def scenario():
+        async with websockets.serve(kis_server, "127.0.0.1", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            feed = KisRealtimeFeed(repository=FakeKisRepository(f"ws://127.0.0.1:{port}"))
+            feed.watch("005930")
+            feed.start()
+            for _ in range(100):
+                if feed.store.get_price("005930", max_age=10):
+                    break
+                await asyncio.sleep(0.02)
+            await feed.stop()
+            return feed
+
+    feed = asyncio.run(scenario())
+
+    assert [m["body"]["input"]["tr_id"] for m in received] == [TR_EXECUTION, TR_ORDER_BOOK]
+    assert received[0]["header"]["tr_type"] == "1"
+    assert feed.store.get_price("005930", max_age=10)["price"] == 71000.0
+
+
+def test_fill_notice_notifies_listeners():
+    feed = KisRealtimeFeed(repository=None)
+    fills = []
+    feed.add_fill_listener(lambda: fills.append(1))
+
+    feed.handle_message("1|H0STCNI9|001|encrypted-payload")
+
+    assert fills == [1]
+    assert feed.stats()["fills"] == 1
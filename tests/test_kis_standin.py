@@ -0,0 +1,78 @@
+"""
+KIS stand-in 서버 단위 테스트
+
+AsyncKisStockRepository를 stand-in 앱(httpx ASGITransport)에 연결하여
+녹화 -> 재생, 장애 주입이 KIS 응답과 같은 방식으로 동작하는지 검증합니다.
+"""
+import asyncio
+import httpx
+import pytest
+from app.core.rate_limiter import Priority, RateLimiter
+from app.infrastructure.kis_standin import RECORD, REPLAY, Cassette, FaultInjector, create_app
+from app.infrastructure.persistence.async_kis_stock_repository import AsyncKisStockRepository, KisApiError
+
+CONFIG = {
+    "paper_app": "app", "paper_sec": "sec", "my_paper_stock": "12345678", "my_prod": "01",
+    "vps": "http://standin",
+}
+
+
+def kis_upstream(request: httpx.Request) -> httpx.Response:
+    """실제 KIS 대신 녹화 대상이 되는 upstream"""
+    path = request.url.path
+    if path == "/oauth2/tokenP":
+        return httpx.Response(200, json={"access_token": "real-token", "expires_in": 86400})
+    if path.endswith("/search-stock-info"):
+        return httpx.Response(200, json={"rt_cd": "0", "output": {"prdt_abrv_name": "삼성전자"}})
+    if path.endswith("/inquire-price"):
+        return httpx.Response(200, json={
+            "rt_cd": "0", "output": {"stck_prpr": "70000", "prdy_vrss": "-500", "prdy_ctrt": "-0.71"},
+        })
+    return httpx.Response(404, json={"rt_cd": "1", "msg1": "not found"})
+
+
+def repository_for(app):
+    return AsyncKisStockRepository(
+        config=CONFIG, server="vps", transport=httpx.ASGITransport(app=app),
+        rate_limiter=RateLimiter(rate=1000),
+    )
+
+
+def test_recorded_responses_replay_without_upstream(tmp_path):
+    """
+    Given: record 모드로 현재가를 한 번 조회하여 cassette 파일에 녹화했을 때
+    When: 같은 파일로 replay 모드 서버를 띄우고 다시 조회하면
+    Then: upstream 없이 같은 결과가 나와야 하고, 인증 응답과 계좌번호는 녹화되지 않아야 함
+    """
+    path = str(tmp_path / "cassette.jsonl")
+    recorder = create_app(Cassette(path), mode=RECORD, upstream="http://kis",
+                          upstream_transport=httpx.MockTransport(kis_upstream))
+    recorded = asyncio.run(repository_for(recorder).get_stock_price("005930"))
+
+    replayer = create_app(Cassette(path), mode=REPLAY)
+    replayed = asyncio.run(repository_for(replayer).get_stock_price("005930"))
+
+    assert replayed == recorded
+    assert replayed.price == 70000.0 and replayed.name == "삼성전자"
+    content = open(path, encoding="utf-8").read()
+    assert "real-token" not in content and "12345678" not in content
+
+
+def test_rate_limit_returns_kis_throttling_error():
+    """
+    Given: 초당 1회로 제한된 replay 서버
+    When: 1초 안에 두 번 조회하면
+    Then: 두 번째 요청은 KIS와 같은 EGW00201 오류가 되어야 함
+    """
+    cassette = Cassette()
+    app = create_app(cassette, mode=REPLAY, faults=FaultInjector(rate_limit=1))
+    repo = repository_for(app)
+
+    async def scenario():
+        await repo._request("GET", "/uapi/domestic-stock/v1/quotations/inquire-price", "FHKST01010100",
+                            Priority.QUOTE, params={"FID_INPUT_ISCD": "005930"})
+
+    with pytest.raises(KisApiError, match="STANDIN404"):
+        asyncio.run(scenario())
+    with pytest.raises(KisApiError, match="EGW00201"):
+        asyncio.run(scenario())
@@ -0,0 +1,93 @@
+"""
+TokenManager 테스트
+
+워커 여러 개는 같은 토큰 파일을 쓰는 TokenManager 인스턴스 여러 개로 흉내 냅니다
+(flock은 같은 프로세스 안에서도 파일을 따로 열면 서로 배타적).
+"""
+import asyncio
+import json
+import time
+
+from app.infrastructure.kis_token_manager import TokenManager
+
+
+class Issuer:
+    """발급 횟수를 세는 가짜 토큰 발급기"""
+
+    def __init__(self, expires_in: float = 86400, delay: float = 0.05):
+        self.calls = 0
+        self.expires_in = expires_in
+        self.delay = delay
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return f"token-{self.calls}", self.expires_in
+
+
+def test_workers_share_one_issued_token(tmp_path):
+    # Given: 같은 파일을 쓰는 워커 3개
+    path = str(tmp_path / "token.json")
+    issuer = Issuer()
+    workers = [TokenManager(issuer, path=path, key="vps:app") for _ in range(3)]
+
+    async def run():
+        return await asyncio.gather(*(w.get() for w in workers for _ in range(3)))
+
+    # When: 동시에 토큰 요청
+    tokens = asyncio.run(run())
+
+    # Then: 발급은 한 번, 재시작한 워커도 파일의 토큰을 사용
+    assert set(tokens) == {"token-1"}
+    assert issuer.calls == 1
+    assert asyncio.run(TokenManager(issuer, path=path, key="vps:app").get()) == "token-1"
+    assert issuer.calls == 1
+
+
+def test_token_of_other_app_is_not_used(tmp_path):
+    path = str(tmp_path / "token.json")
+    asyncio.run(TokenManager(Issuer(), path=path, key="vps:app").get())
+
+    issuer = Issuer()
+    token = asyncio.run(TokenManager(issuer, path=path, key="prod:other").get())
+
+    assert token == "token-1" and issuer.calls == 1
+    assert json.load(open(path))["key"] == "prod:other"
+
+
+def test_expiring_token_is_served_while_refreshing_in_background():
+    # Given: 만료까지 30분 남은 토큰 (refresh_ahead 1시간)
+    issuer = Issuer(expires_in=1800, delay=0.1)
+    manager = TokenManager(issuer, refresh_ahead=3600)
+
+    async def run():
+        first = await manager.get()
+        issuer.expires_in = 86400
+        started = time.perf_counter()
+        second = await manager.get()  # 재발급을 기다리지 않음
+        waited = time.perf_counter() - started
+        await manager._refresh_task
+        return first, second, waited, await manager.get()
+
+    # When
+    first, second, waited, third = asyncio.run(run())
+
+    # Then
+    assert first == second == "token-1"
+    assert waited < 0.05
+    assert third == "token-2"
+    assert issuer.calls == 2
+
+
+def test_rejected_token_is_reissued_even_if_cached_on_disk(tmp_path):
+    path = str(tmp_path / "token.json")
+    issuer = Issuer()
+    manager = TokenManager(issuer, path=path, key="vps:app")
+
+    async def run():
+        token = await manager.get()
+        manager.invalidate(token)
+        return await manager.get()
+
+    assert asyncio.run(run()) == "token-2"
+    assert issuer.calls == 2
@@ -0,0 +1,259 @@
+"""
+OrderPipeline 단위 테스트
+
+Given-When-Then 패턴, coroutine은 asyncio.run으로 실행합니다.
+"""
+import asyncio
+import time
+import pytest
+from app.application.order_pipeline import IdempotencyConflict, OrderPipeline, OrderState, OrderStoreUnavailable
+from app.core.config import settings
+from app.domain.models import Order
+from app.domain.repositories.async_stock_repository import OrderOutcomeUnknown
+from app.infrastructure.shared_cache import RespSharedCache
+from app.infrastructure.shared_cache_server import serve
+
+
+class MockTradingService:
+    """주문 호출 기록 (error가 있으면 거부 응답)"""
+
+    def __init__(self, error=None):
+        self.orders = []
+        self.error = error
+
+    async def execute_order(self, code, qty, price, order_type, order_dvsn="00"):
+        self.orders.append((code, qty, price, order_type))
+        await asyncio.sleep(0.01)
+        if self.error:
+            return {"error": self.error}
+        return {"ODNO": f"{len(self.orders):010d}", "msg1": "주문 전송 완료"}
+
+
+def order(qty=10):
+    return Order(stock_code="005930", quantity=qty, price=70000.0, order_type="buy")
+
+
+def test_order_is_queued_then_acked():
+    """
+    Given: 주문 파이프라인
+    When: 주문을 접수하고 완료까지 기다리면
+    Then: 접수 즉시 queued 상태를 받고, 이후 acked 상태와 단계별 지연 시간이 기록되어야 함
+    """
+    service = MockTradingService()
+    pipeline = OrderPipeline(service, queue_size=10, max_tracked=10)
+
+    async def scenario():
+        accepted = await pipeline.submit(order())
+        final = await pipeline.wait(accepted["order_id"], timeout=1)
+        await pipeline.stop()
+        return accepted, final
+
+    accepted, final = asyncio.run(scenario())
+
+    assert accepted["state"] == OrderState.QUEUED
+    assert final["state"] == OrderState.ACKED
+    assert final["result"]["ODNO"] == "0000000001"
+    assert set(final["latency_ms"]) == {"queue", "ack", "total"}
+    assert pipeline.stats()["latency_ms"]["total"]["count"] == 1
+
+
+def test_same_idempotency_key_places_order_once():
+    """
+    Given: 같은 Idempotency-Key로 재시도된 주문 3건
+    When: 모두 접수하면
+    Then: KIS 주문은 한 번만 전송되고 같은 order_id를 받아야 함
+    """
+    service = MockTradingService()
+    pipeline = OrderPipeline(service, queue_size=10, max_tracked=10)
+
+    async def scenario():
+        tickets = [await pipeline.submit(order(), idempotency_key="key-1") for _ in range(3)]
+        await pipeline.wait(tickets[0]["order_id"], timeout=1)
+        await pipeline.stop()
+        return tickets
+
+    tickets = asyncio.run(scenario())
+
+    assert len({t["order_id"] for t in tickets}) == 1
+    assert len(service.orders) == 1
+    assert pipeline.stats()["duplicates"] == 2
+
+
+def test_reused_key_with_different_order_conflicts():
+    pipeline = OrderPipeline(MockTradingService(), queue_size=10, max_tracked=10)
+
+    async def scenario():
+        await pipeline.submit(order(qty=10), idempotency_key="key-1")
+        try:
+            await pipeline.submit(order(qty=20), idempotency_key="key-1")
+        finally:
+            await pipeline.stop()
+
+    with pytest.raises(IdempotencyConflict):
+        asyncio.run(scenario())
+
+
+def test_error_result_is_rejected():
+    pipeline = OrderPipeline(MockTradingService(error="주문가능금액 부족"), queue_size=10, max_tracked=10)
+
+    async def scenario():
+        accepted = await pipeline.submit(order())
+        final = await pipeline.wait(accepted["order_id"], timeout=1)
+        await pipeline.stop()
+        return final
+
+    final = asyncio.run(scenario())
+
+    assert final["state"] == OrderState.REJECTED
+    assert final["error"] == "주문가능금액 부족"
+
+
+class UnknownOutcomeService(MockTradingService):
+    """주문 응답을 받지 못하는 서비스 (today_orders: 당일 주문 내역)"""
+
+    def __init__(self, today_orders):
+        super().__init__()
+        self.today_orders = today_orders
+
+    async def execute_order(self, code, qty, price, order_type, order_dvsn="00"):
+        self.orders.append((code, qty, price, order_type))
+        raise OrderOutcomeUnknown("ReadTimeout")
+
+    async def get_today_orders(self):
+        return self.today_orders
+
+
+def test_unknown_outcome_is_reconciled_against_today_orders(monkeypatch):
+    """
+    Given: 주문 전송 후 응답을 받지 못했지만 KIS 주문 내역에는 접수되어 있을 때
+    When: 주문 상태를 확인하면
+    Then: rejected가 아니라 unknown이었다가 주문 내역 대조 후 acked가 되어야 함
+    """
+    monkeypatch.setattr(settings, "ORDER_RECONCILE_DELAYS", (0.01, 0.02))
+    row = {"order_no": "0000012345", "code": "005930", "side": "buy", "quantity": 10,
+           "price": 70000.0, "time": time.strftime("%H%M%S"), "filled": 0}
+    pipeline = OrderPipeline(UnknownOutcomeService([row]), queue_size=10, max_tracked=10)
+
+    async def scenario():
+        accepted = await pipeline.submit(order())
+        await asyncio.sleep(0.005)
+        pending = await pipeline.status(accepted["order_id"])
+        final = await pipeline.wait(accepted["order_id"], timeout=1)
+        await pipeline.stop()
+        return pending, final
+
+    pending, final = asyncio.run(scenario())
+
+    assert pending["state"] == OrderState.UNKNOWN
+    assert final["state"] == OrderState.ACKED
+    assert final["result"] == {"ODNO": "0000012345", "reconciled": True}
+
+
+def test_unknown_outcome_not_in_today_orders_is_unresolved(monkeypatch):
+    """
+    Given: 응답을 받지 못한 주문이 대조 시점까지 당일 주문 내역에 나타나지 않을 때
+    When: 완료까지 기다리면
+    Then: 이미 접수되었을 수 있으므로 rejected가 아니라 unresolved로 끝나야 함
+    """
+    monkeypatch.setattr(settings, "ORDER_RECONCILE_DELAYS", (0.01,))
+    pipeline = OrderPipeline(UnknownOutcomeService([]), queue_size=10, max_tracked=10)
+
+    async def scenario():
+        accepted = await pipeline.submit(order())
+        final = await pipeline.wait(accepted["order_id"], timeout=1)
+        await pipeline.stop()
+        return final
+
+    final = asyncio.run(scenario())
+
+    assert final["state"] == OrderState.UNRESOLVED
+    assert "not found" in final["error"]
+    assert pipeline.stats()["rejected"] == 0
+    assert pipeline.stats()["unresolved"] == 1
+
+
+def test_retry_on_another_worker_places_order_once():
+    """
+    Given: 공유 캐시를 쓰는 워커 두 개 (같은 upstream)
+    When: 같은 Idempotency-Key의 재시도가 다른 워커로 가고, 상태도 다른 워커에서 조회하면
+    Then: KIS 주문은 한 번만 전송되고, 두 워커 모두 같은 주문의 완료 상태를 돌려줘야 함
+    """
+    service = MockTradingService()
+
+    async def scenario():
+        server = await serve(port=0)
+        port = server.sockets[0].getsockname()[1]
+        workers = [OrderPipeline(service, queue_size=10, max_tracked=10, shared_cache=RespSharedCache(port=port))
+                   for _ in range(2)]
+        try:
+            first = await workers[0].submit(order(), idempotency_key="key-1")
+            retried = await workers[1].submit(order(), idempotency_key="key-1")
+            final = await workers[1].wait(first["order_id"], timeout=1)
+            with pytest.raises(IdempotencyConflict):
+                await workers[1].submit(order(qty=20), idempotency_key="key-1")
+        finally:
+            for worker in workers:
+                await worker.stop()
+                await worker._shared.aclose()
+            server.close()
+            await server.wait_closed()
+        return first, retried, final
+
+    first, retried, final = asyncio.run(scenario())
+
+    assert retried["order_id"] == first["order_id"]
+    assert len(service.orders) == 1
+    assert final["state"] == OrderState.ACKED
+    assert final["result"]["ODNO"] == "0000000001"
+
+
+def test_second_worker_without_shared_cache_refuses_orders(tmp_path):
+    """
+    Given: 공유 캐시 없이 실행된 워커 두 개 (같은 lock 파일)
+    When: 두 번째 워커에 주문하면
+    Then: 멱등성 키를 지킬 수 없으므로 거부하고, 첫 번째 워커가 종료되면 lock이 풀려야 함
+    """
+    lock_path = str(tmp_path / "order_pipeline.lock")
+    first = OrderPipeline(MockTradingService(), queue_size=10, max_tracked=10)
+    second = OrderPipeline(MockTradingService(), queue_size=10, max_tracked=10)
+    first.start(lock_path)
+    second.start(lock_path)
+
+    async def scenario():
+        accepted = await first.submit(order(), idempotency_key="key-1")
+        try:
+            await second.submit(order(), idempotency_key="key-1")
+        finally:
+            await first.stop()
+            await second.stop()
+        return accepted
+
+    with pytest.raises(OrderStoreUnavailable):
+        asyncio.run(scenario())
+    third = OrderPipeline(MockTradingService(), queue_size=10, max_tracked=10)
+    third.start(lock_path)
+    assert third._process_lock is not None
+    asyncio.run(third.stop())
+
+
+def test_claimed_order_numbers_are_limited_to_today_orders(monkeypatch):
+    """
+    Given: 어제 대조로 찾은 주문번호와 오늘 주문 내역에서 사라진 주문번호가 남아 있을 때
+    When: 다음 unknown 주문을 대조하면
+    Then: 당일 주문 내역에 있는 오늘 주문번호만 남아야 함
+    """
+    monkeypatch.setattr(settings, "ORDER_RECONCILE_DELAYS", (0.01,))
+    today = time.strftime("%Y%m%d")
+    row = {"order_no": "0000000003", "code": "005930", "side": "buy", "quantity": 10,
+           "price": 70000.0, "time": time.strftime("%H%M%S"), "filled": 0}
+    pipeline = OrderPipeline(UnknownOutcomeService([row]), queue_size=10, max_tracked=10)
+    pipeline._claimed = {"0000000001": "20000101", "0000000002": today}
+
+    async def scenario():
+        accepted = await pipeline.submit(order())
+        await pipeline.wait(accepted["order_id"], timeout=1)
+        await pipeline.stop()
+
+    asyncio.run(scenario())
+
+    assert pipeline._claimed == {"0000000003": today}
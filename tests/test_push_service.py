@@ -0,0 +1,137 @@
+"""
+PushHub 단위 테스트
+
+Given-When-Then 패턴, coroutine은 asyncio.run으로 실행합니다.
+"""
+import asyncio
+import json
+from fastapi.testclient import TestClient
+from app.application.push_service import PushHub, PushSubscriber, SlowConsumerError, TopicRejected
+from app.domain.models import Stock
+
+
+class MockTradingService:
+    """토픽 데이터 소스 (호출 횟수 기록)"""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    async def get_stock_detail(self, code):
+        self.calls += 1
+        return Stock(code=code, name="삼성전자", price=70000.0, change_amount=0, change_rate=0)
+    
+    async def get_market_indices(self):
+        self.calls += 1
+        return {"kospi": {"price": 2500}}
+
+
+def test_update_is_computed_once_and_fanned_out():
+    """
+    Given: 같은 토픽을 구독한 클라이언트 3개
+    When: 발행 Task가 한 번 실행되면
+    Then: 데이터는 한 번만 계산되고 3개 클라이언트 모두 같은 메시지를 받아야 함
+    """
+    service = MockTradingService()
+    hub = PushHub(trading_service=service)
+    
+    async def scenario():
+        subscribers = [PushSubscriber() for _ in range(3)]
+        for s in subscribers:
+            hub.subscribe(s, "stock:005930")
+        return await asyncio.gather(*[s.next_message() for s in subscribers])
+    
+    messages = asyncio.run(scenario())
+    
+    assert service.calls == 1
+    assert len(set(messages)) == 1
+    assert json.loads(messages[0])["data"]["price"] == 70000.0
+
+
+def test_unchanged_data_is_not_resent():
+    hub = PushHub(trading_service=MockTradingService())
+    
+    async def scenario():
+        subscriber = PushSubscriber()
+        subscriber.topics.add("indices")
+        hub._subscribers["indices"] = {subscriber}
+        return hub.publish("indices", {"v": 1}), hub.publish("indices", {"v": 1}), hub.publish("indices", {"v": 2})
+    
+    assert asyncio.run(scenario()) == (1, 0, 1)
+
+
+def test_slow_consumer_is_dropped():
+    """
+    Given: 송신 큐 크기가 2인 구독자가 메시지를 읽지 않을 때
+    When: 그 이상 발행하면
+    Then: 구독자는 끊기고 다른 구독자는 계속 받아야 함
+    """
+    hub = PushHub(trading_service=MockTradingService())
+    
+    async def scenario():
+        slow, fast = PushSubscriber(queue_size=2), PushSubscriber(queue_size=10)
+        for s in (slow, fast):
+            s.topics.add("indices")
+        hub._subscribers["indices"] = {slow, fast}
+        for i in range(3):
+            hub.publish("indices", {"v": i})
+        try:
+            await slow.next_message()
+            slow_error = None
+        except SlowConsumerError as e:
+            slow_error = e
+        return slow_error, fast.queue.qsize()
+    
+    slow_error, fast_pending = asyncio.run(scenario())
+    
+    assert isinstance(slow_error, SlowConsumerError)
+    assert fast_pending == 3
+    assert hub.stats()["dropped_clients"] == 1
+
+
+def test_invalid_topics_and_topic_limit_are_rejected(monkeypatch):
+    """
+    Given: 구독자별 최대 토픽 수가 2일 때
+    When: 잘못된 코드나 한도를 넘는 토픽을 구독하면
+    Then: TopicRejected가 발생하고 발행 Task는 생기지 않아야 함
+    """
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "PUSH_MAX_TOPICS", 2)
+    hub = PushHub(trading_service=MockTradingService())
+    
+    async def scenario():
+        subscriber = PushSubscriber()
+        errors = []
+        for topic in ("stock:005930", "stock:not-a-code", "index_chart:0001", "stock:005930", "stock:000660"):
+            try:
+                hub.subscribe(subscriber, topic)
+            except TopicRejected as e:
+                errors.append((topic, str(e)))
+        publishers = set(hub._publishers)
+        hub.disconnect(subscriber)
+        return errors, publishers
+    
+    errors, publishers = asyncio.run(scenario())
+    
+    assert errors == [("stock:not-a-code", "unknown topic"), ("stock:000660", "too many topics")]
+    assert publishers == {"stock:005930", "index_chart:0001"}
+
+
+def test_websocket_subscription(monkeypatch):
+    """WebSocket 엔드포인트로 구독하면 토픽 데이터가 푸시되어야 함"""
+    from app.main import app
+    from app.application.push_service import push_hub
+    monkeypatch.setattr(push_hub, "_service", MockTradingService())
+    
+    with TestClient(app) as client:
+        with client.websocket_connect("/api/v1/ws") as ws:
+            ws.send_json({"action": "subscribe", "topics": ["indices", "bogus"]})
+            messages = [ws.receive_json(), ws.receive_json()]
+    
+            # 형식이 잘못된 메시지는 오류로 응답하고 연결은 유지
+            ws.send_json(["indices"])
+            invalid = ws.receive_json()
+    
+    assert invalid == {"error": "invalid message"}
+    by_topic = {m["topic"]: m for m in messages}
+    assert by_topic["indices"]["data"] == {"kospi": {"price": 2500}}
+    assert by_topic["bogus"]["error"] == "unknown topic"
@@ -0,0 +1,193 @@
+"""
+워커 간 공유 캐시 테스트
+
+로컬 stand-in 서버(Redis 프로토콜)를 임의 포트로 띄우고, 서비스 인스턴스 두 개를
+각자의 클라이언트로 연결하여 워커 두 개를 흉내 냅니다.
+"""
+import asyncio
+import time
+
+from app.application.async_trading_service import AsyncTradingService
+from app.core.rate_limiter import Priority, RateLimiter, SharedRateWindow
+from app.domain.models import Order, Stock
+from app.domain.repositories.async_stock_repository import AsyncStockRepository
+from app.infrastructure.shared_cache import RespSharedCache
+from app.infrastructure.shared_cache_server import serve
+
+SAMSUNG = {"code": "005930", "name": "삼성전자", "price": 70000.0, "change_amount": 1000.0, "change_rate": 1.45}
+
+
+class CountingRepository(AsyncStockRepository):
+    """현재가 조회 횟수를 세는 테스트용 Repository (워커들이 같은 인스턴스를 공유 = 같은 upstream)"""
+
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.price_calls = 0
+        self.cash = 1000000
+
+    async def get_stock_price(self, code: str):
+        self.price_calls += 1
+        await asyncio.sleep(self.delay)
+        return Stock(**SAMSUNG)
+
+    async def get_order_book(self, code: str):
+        return {"asks": [], "bids": []}
+
+    async def get_stock_chart(self, code: str):
+        return []
+
+    async def place_order(self, order: Order):
+        return {"success": True}
+
+    async def get_balance(self):
+        return {"cash": self.cash}
+
+
+def build_worker(repository, port):
+    return AsyncTradingService(
+        stock_repository=repository, stale_while_revalidate=False,
+        shared_cache=RespSharedCache(port=port),
+    )
+
+
+def test_concurrent_workers_call_upstream_once():
+    # Given: 두 워커가 같은 upstream(카운터 공유)을 사용
+    repository = CountingRepository(delay=0.1)
+
+    async def run():
+        server = await serve(port=0)
+        port = server.sockets[0].getsockname()[1]
+        workers = [build_worker(repository, port) for _ in range(2)]
+        try:
+            # When: 두 워커에 동시에 같은 종목 요청
+            results = await asyncio.gather(*(
+                w.get_stock_detail_data("005930") for w in workers for _ in range(5)
+            ))
+            stats = [w.get_cache_stats() for w in workers]
+        finally:
+            for w in workers:
+                await w._shared.aclose()
+            server.close()
+            await server.wait_closed()
+        return results, stats
+
+    results, stats = asyncio.run(run())
+
+    # Then: upstream 호출은 한 번, 다른 워커는 공유 캐시 값을 사용
+    assert repository.price_calls == 1
+    assert all(r["price"] == 70000.0 for r in results)
+    assert sum(s["shared_hits"] for s in stats) == 1
+
+
+def test_unreachable_shared_cache_falls_back_to_upstream():
+    # Given: 아무도 듣지 않는 포트
+    repository = CountingRepository()
+
+    async def run():
+        server = await serve(port=0)
+        port = server.sockets[0].getsockname()[1]
+        server.close()
+        await server.wait_closed()
+        worker = build_worker(repository, port)
+        data = await worker.get_stock_detail_data("005930")
+        return data, worker.get_cache_stats()["shared_cache"]
+
+    # When
+    data, shared_stats = asyncio.run(run())
+
+    # Then: 요청은 성공하고 공유 캐시는 잠시 사용 중지
+    assert data["price"] == 70000.0
+    assert repository.price_calls == 1
+    assert shared_stats["errors"] == 1
+    assert shared_stats["available"] is False
+
+
+def test_lock_release_and_clear_cache_use_shared_keys():
+    # Given: 잠금을 잡은 워커와 값을 공유 캐시에 올린 워커
+    repository = CountingRepository()
+
+    async def run():
+        server = await serve(port=0)
+        port = server.sockets[0].getsockname()[1]
+        cache, worker = RespSharedCache(port=port), build_worker(repository, port)
+        try:
+            await cache.add("lock", b"token-b", 10)
+            # When: 다른 토큰으로 해제하면 지우지 않고, 자기 토큰이면 지움
+            released = [await cache.delete_if_equals("lock", b"token-a"),
+                        await cache.delete_if_equals("lock", b"token-b")]
+            await worker.get_stock_detail_data("005930")
+            cleared = await worker.clear_cache("stock_detail")
+            await worker.get_stock_detail_data("005930")
+        finally:
+            await cache.aclose()
+            await worker._shared.aclose()
+            server.close()
+            await server.wait_closed()
+        return released, cleared
+
+    released, cleared = asyncio.run(run())
+
+    # Then: 캐시를 비우면 공유 값도 지워져서 upstream을 다시 호출
+    assert released == [False, True]
+    assert cleared == 2
+    assert repository.price_calls == 2
+
+
+def test_shared_rate_window_limits_all_workers():
+    # Given: 프로세스 버킷은 넉넉하고 공유 한도는 초당 2회인 워커 두 개
+    async def run():
+        server = await serve(port=0)
+        port = server.sockets[0].getsockname()[1]
+        caches = [RespSharedCache(port=port) for _ in range(2)]
+        limiters = [RateLimiter(rate=100, burst=100) for _ in caches]
+        for limiter, cache in zip(limiters, caches):
+            limiter.use_shared_window(SharedRateWindow(cache, rate=2))
+        acquired_at = []
+
+        async def call(limiter):
+            await limiter.acquire_async(Priority.QUOTE)
+            acquired_at.append(int(time.time()))
+
+        try:
+            # When: 두 워커가 합쳐서 4번 호출
+            await asyncio.gather(*(call(limiter) for limiter in limiters for _ in range(2)))
+        finally:
+            for cache in caches:
+                await cache.aclose()
+            server.close()
+            await server.wait_closed()
+        return acquired_at
+
+    acquired_at = asyncio.run(run())
+
+    # Then: 어느 1초에도 합계 2회를 넘지 않음
+    assert max(acquired_at.count(second) for second in acquired_at) <= 2
+
+
+def test_order_on_one_worker_invalidates_balance_on_others():
+    # Given: 두 워커가 모두 잔고를 캐시하고 있음
+    repository = CountingRepository()
+
+    async def run():
+        server = await serve(port=0)
+        port = server.sockets[0].getsockname()[1]
+        workers = [build_worker(repository, port) for _ in range(2)]
+        try:
+            before = [await w.get_balance() for w in workers]
+            # When: 워커 0에서 주문이 체결되어 잔고가 바뀜
+            repository.cash = 930000
+            await workers[0].execute_order("005930", 1, 70000.0, "buy")
+            await asyncio.sleep(0.05)
+            after = await workers[1].get_balance()
+        finally:
+            for w in workers:
+                await w._shared.aclose()
+            server.close()
+            await server.wait_closed()
+        return before, after
+
+    before, after = asyncio.run(run())
+
+    # Then: 다른 워커도 TTL을 기다리지 않고 새 잔고를 응답
+    assert before == [{"cash": 1000000}] * 2
+    assert after == {"cash": 930000}
@@ -0,0 +1,104 @@
+"""
+종목 마스터 인덱스 테스트
+
+마스터 파일 형식: 단축코드(9) + 표준코드(12) + 한글명 + 고정폭 영역 (KOSPI 228자, 개행 포함)
+"""
+import asyncio
+import io
+import zipfile
+
+import httpx
+
+from app.infrastructure.stock_master import (
+    StockMaster, StockMasterEntry, StockMasterIndex, parse_master, to_chosung,
+)
+
+
+def master_row(code: str, name: str, tail_width: int) -> str:
+    return f"{code:<9}KR7{code}000{name}" + "0" * (tail_width - 1) + "\n"
+
+
+ENTRIES = [
+    StockMasterEntry("005930", "삼성전자", "KOSPI"),
+    StockMasterEntry("005935", "삼성전자우", "KOSPI"),
+    StockMasterEntry("066570", "LG전자", "KOSPI"),
+    StockMasterEntry("000660", "SK하이닉스", "KOSPI"),
+    StockMasterEntry("0015G0", "그린광학", "KOSDAQ"),
+    StockMasterEntry("028260", "삼성물산", "KOSPI"),
+]
+
+
+def codes(results):
+    return [r["code"] for r in results]
+
+
+def test_parse_master_rows():
+    text = master_row("005930", "삼성전자", 228) + master_row("0015G0", "그린광학", 228)
+
+    entries = parse_master(text, "KOSPI", 228)
+
+    assert entries == [
+        StockMasterEntry("005930", "삼성전자", "KOSPI"),
+        StockMasterEntry("0015G0", "그린광학", "KOSPI"),
+    ]
+
+
+def test_to_chosung():
+    assert to_chosung("삼성전자") == "ㅅㅅㅈㅈ"
+    assert to_chosung("LG전자") == "LGㅈㅈ"
+
+
+def test_search_ranking():
+    """
+    Given: 종목 마스터 인덱스가 있을 때
+    When: 코드 접두어 / 이름 / 초성으로 검색하면
+    Then: 정확히 일치 > 접두어 > 포함 순으로 정렬되어야 함
+    """
+    index = StockMasterIndex(ENTRIES)
+
+    assert codes(index.search("00593")) == ["005930", "005935"]
+    assert codes(index.search("삼성전자")) == ["005930", "005935"]
+    assert codes(index.search("전자")) == ["005930", "066570", "005935"]
+    assert codes(index.search("ㅅㅅㅈㅈ")) == ["005930", "005935"]
+    assert codes(index.search("ㅈㅈ")) == ["005930", "066570", "005935"]
+    assert codes(index.search("sk하이")) == ["000660"]
+    assert codes(index.search("0015g0")) == ["0015G0"]
+    assert index.search("없는종목") == []
+
+
+def test_name_of():
+    index = StockMasterIndex(ENTRIES)
+
+    assert index.name_of("005930") == "삼성전자"
+    assert index.name_of("0015g0") == "그린광학"
+    assert index.name_of("999999") is None
+
+
+def test_stock_master_downloads_and_caches(tmp_path):
+    """
+    Given: 마스터 파일 다운로드 서버가 있을 때
+    When: refresh 후 다시 refresh 하면
+    Then: 인덱스가 적재되고, 두 번째는 디스크 캐시를 사용해야 함
+    """
+    requests = []
+
+    def handler(request: httpx.Request):
+        requests.append(request.url.path)
+        name = request.url.path.rsplit("/", 1)[-1].removesuffix(".mst.zip")
+        tail = 228 if name == "kospi_code" else 222
+        rows = master_row("005930", "삼성전자", tail) if tail == 228 else master_row("0015G0", "그린광학", tail)
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            archive.writestr(f"{name}.mst", rows.encode("cp949"))
+        return httpx.Response(200, content=buffer.getvalue())
+
+    master = StockMaster(base_url="http://master.test", cache_dir=str(tmp_path),
+                         transport=httpx.MockTransport(handler))
+
+    asyncio.run(master.refresh())
+    asyncio.run(master.refresh())
+
+    assert requests == ["/kospi_code.mst.zip", "/kosdaq_code.mst.zip"]
+    assert master.stats()["entries"] == 2
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["kosdaq_code.mst", "kospi_code.mst"]
+    assert master.search("그린")[0] == {"code": "0015G0", "name": "그린광학", "market": "KOSDAQ"}
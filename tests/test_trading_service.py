@@ -10,6 +10,8 @@ TDD/BDD 원칙:
 - Given-When-Then 패턴 사용
 """
 import pytest
+import threading
+import time
 from unittest.mock import Mock
 from app.application.trading_service import TradingService
 from app.domain.models import Stock, Order
@@ -159,6 +161,117 @@ class TestTradingService:
         assert first_result.price == 70000.0
         assert second_result.price == 70000.0  # 캐시된 값
 
+    
+    def test_concurrent_requests_are_coalesced(self):
+        """
+        Given: 캐시에 없는 키에 대해 upstream 호출이 느릴 때
+        When: 여러 스레드가 동시에 같은 키를 조회하면
+        Then: upstream은 한 번만 호출되고 모든 요청이 같은 결과를 받아야 함
+        """
+        # Given
+        calls = []
+        
+        def slow_fetch():
+            calls.append(1)
+            time.sleep(0.2)
+            return {"kospi": {"price": 2500}}
+        
+        results = []
+        
+        def worker():
+            results.append(self.service._get_cached_data("market_indices", slow_fetch))
+        
+        # When
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        # Then
+        assert len(calls) == 1
+        assert results == [{"kospi": {"price": 2500}}] * 8
+        stats = self.service.get_cache_stats()
+        assert stats["upstream_calls"] == 1
+        assert stats["coalesced_calls"] == 7
+    
+    def test_coalesced_request_gets_stale_data_while_refreshing(self):
+        """
+        Given: TTL이 만료된 캐시 항목이 있고 다른 요청이 갱신 중일 때
+        When: 같은 키를 조회하면
+        Then: 기다리지 않고 stale 데이터를 즉시 반환해야 함
+        """
+        # Given: stale-while-revalidate 없이 leader가 직접 갱신하는 서비스
+        service = TradingService(stock_repository=self.mock_repo, stale_while_revalidate=False)
+        service._cache.set("market_indices", {"v": "old"}, stored_at=time.time() - 10)
+        started = threading.Event()
+        release = threading.Event()
+        
+        def blocking_fetch():
+            started.set()
+            release.wait(2)
+            return {"v": "new"}
+        
+        leader = threading.Thread(
+            target=service._get_cached_data, args=("market_indices", blocking_fetch)
+        )
+        leader.start()
+        started.wait(2)
+        
+        # When
+        result = service._get_cached_data("market_indices", blocking_fetch)
+        release.set()
+        leader.join()
+        
+        # Then
+        assert result == {"v": "old"}
+        assert service._get_cached_data("market_indices", blocking_fetch) == {"v": "new"}
+        assert service.get_cache_stats()["stale_served"] == 1
+    
+    def test_stale_while_revalidate_refreshes_in_background(self):
+        """
+        Given: TTL이 만료되었지만 max_stale 한도 안의 캐시 항목이 있을 때
+        When: 조회하면
+        Then: stale 데이터를 즉시 반환하고, 백그라운드 갱신 후에는 새 데이터를 반환해야 함
+        """
+        # Given
+        self.service._cache.set("market_indices", {"v": "old"}, stored_at=time.time() - 10)
+        release = threading.Event()
+        
+        def slow_fetch():
+            release.wait(2)
+            return {"v": "new"}
+        
+        # When
+        started_at = time.time()
+        result = self.service._get_cached_data("market_indices", slow_fetch)
+        elapsed = time.time() - started_at
+        flight = self.service._inflight["market_indices"]
+        release.set()
+        flight.event.wait(2)
+        
+        # Then
+        assert result == {"v": "old"}
+        assert elapsed < 0.5
+        assert self.service._get_cached_data("market_indices", slow_fetch) == {"v": "new"}
+        assert self.service.get_cache_stats()["background_refreshes"] == 1
+        assert self.service.get_cache_stats()["cache"]["categories"]["market_indices"]["stale_served"] == 1
+    
+    def test_entry_past_max_stale_is_not_served(self):
+        """
+        Given: max_stale 한도를 넘은 캐시 항목이 있을 때
+        When: 조회하면
+        Then: stale 데이터 대신 upstream의 새 데이터를 기다려서 반환해야 함
+        """
+        # Given: market_indices 정책은 TTL 5초 + max_stale 30초
+        self.service._cache.set("market_indices", {"v": "old"}, stored_at=time.time() - 120)
+        
+        # When
+        result = self.service._get_cached_data("market_indices", lambda: {"v": "new"})
+        
+        # Then
+        assert result == {"v": "new"}
+        assert self.service.get_cache_stats()["stale_served"] == 0
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,83 @@
+import time
+import pytest
+from app.core.cache import MemoryCache, CachePolicy
+
+def test_category_ttl():
+    cache = MemoryCache()
+    assert cache.category_of("order_book_005930") == "order_book"
+    assert cache.category_of("stock_chart_005930") == "stock_chart"
+    assert cache.category_of("unknown_key") == "default"
+
+    now = time.time()
+    book = cache.set("order_book_005930", {"asks": [1]}, stored_at=now - 2)
+    chart = cache.set("stock_chart_005930", [{"price": 1}], stored_at=now - 2)
+    assert not cache.is_fresh(book, now)  # order book TTL ~1s
+    assert cache.is_fresh(chart, now)     # chart TTL ~60s
+
+def test_lru_eviction_by_entry_count():
+    cache = MemoryCache(max_entries=2)
+    cache.set("stock_detail_A", {"p": 1})
+    cache.set("stock_detail_B", {"p": 2})
+    cache.get("stock_detail_A")  # A를 최근 사용으로 갱신
+    cache.set("stock_detail_C", {"p": 3})
+
+    assert "stock_detail_A" in cache
+    assert "stock_detail_B" not in cache
+    assert "stock_detail_C" in cache
+    assert cache.stats()["categories"]["stock_detail"]["evictions"] == 1
+
+def test_lru_eviction_by_bytes():
+    cache = MemoryCache(max_bytes=20_000)
+    for i in range(100):
+        cache.set(f"stock_chart_{i:06d}", [{"price": float(j)} for j in range(20)])
+
+    stats = cache.stats()
+    assert stats["bytes"] <= 20_000
+    assert 0 < stats["entries"] < 100
+
+def test_stats_and_clear():
+    cache = MemoryCache(policies={"x": CachePolicy(ttl=10)})
+    cache.set("x_1", 1)
+    cache.get("x_1")
+    cache.get("x_2")
+    stats = cache.stats()["categories"]["x"]
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+    assert cache.clear("x") == 1
+    assert len(cache) == 0
+    assert cache.stats()["bytes"] == 0
+
+def test_version_changes_only_when_value_changes():
+    cache = MemoryCache()
+    first = cache.set("stock_chart_005930", [{"price": 1}])
+    same = cache.set("stock_chart_005930", [{"price": 1}])
+    changed = cache.set("stock_chart_005930", [{"price": 2}])
+
+    assert cache.etag(first) == cache.etag(same)
+    assert cache.etag(changed) != cache.etag(first)
+
+def test_encoded_body_is_computed_once():
+    cache = MemoryCache()
+    entry = cache.set("stock_detail_005930", {"code": "005930", "name": "삼성전자"})
+    before = cache.stats()["bytes"]
+
+    body = cache.encoded("stock_detail_005930", entry)
+
+    assert body == '{"code":"005930","name":"삼성전자"}'.encode("utf-8")
+    assert cache.encoded("stock_detail_005930", entry) is body
+    assert cache.stats()["bytes"] == before + len(body)
+
+def test_entry_values_are_read_only_copies():
+    cache = MemoryCache()
+    rows = [{"price": 1}]
+    entry = cache.set("stock_chart_005930", rows)
+    rows.append({"price": 2})  # 호출자의 원본을 바꿔도 캐시 값은 그대로
+
+    assert entry.value == [{"price": 1}]
+    with pytest.raises(TypeError):
+        entry.value.append({"price": 3})
+    with pytest.raises(TypeError):
+        entry.value[0]["price"] = 3
+    copied = list(entry.value)
+    copied.append({"price": 3})
+    assert cache.encoded("stock_chart_005930", entry) == b'[{"price":1}]'
@@ -0,0 +1,40 @@
+from app.core.candles import CandleBuffer, CandleStore
+
+
+def bar(time: str, price: float, volume: int = 1, date: str = "20250102"):
+    return {"date": date, "time": time, "price": price, "volume": volume}
+
+
+def test_ring_buffer_keeps_last_bars():
+    buffer = CandleBuffer(capacity=3)
+
+    changed = buffer.merge([(1, 10.0, 1), (2, 11.0, 1), (3, 12.0, 1), (4, 13.0, 1)])
+
+    assert changed == 4
+    assert [row["price"] for row in buffer.rows()] == [11.0, 12.0, 13.0]
+
+
+def test_merge_only_new_or_updated_bars():
+    store = CandleStore(capacity=390, max_series=10)
+    store.merge("stock_chart_005930", [bar("090000", 100), bar("090100", 101)])
+
+    # upstream은 겹치는 구간을 다시 보내고, 진행 중인 마지막 봉은 값이 바뀜
+    rows = store.merge("stock_chart_005930", [bar("090100", 102, 5), bar("090200", 103)])
+
+    assert [(r["time"], r["price"]) for r in rows] == [("090000", 100), ("090100", 102), ("090200", 103)]
+    assert CandleStore.since(rows, 20250102090100) == rows[1:]
+
+
+def test_new_trading_day_resets_minute_series():
+    store = CandleStore(capacity=390, max_series=10)
+    store.merge("stock_chart_005930", [bar("153000", 100, date="20250102")])
+
+    rows = store.merge("stock_chart_005930", [bar("090000", 105, date="20250103")])
+
+    assert [(r["date"], r["time"]) for r in rows] == [("20250103", "090000")]
+
+
+def test_rows_without_timestamps_are_not_merged():
+    store = CandleStore(capacity=390, max_series=10)
+
+    assert store.merge("index_chart_0001", [{"price": 2650.0}]) is None
@@ -0,0 +1,24 @@
+from app.core.histogram import LatencyHistogram
+
+
+def test_percentiles_use_bucket_upper_bounds():
+    histogram = LatencyHistogram(buckets_ms=(10, 100, 1000))
+    for _ in range(90):
+        histogram.observe(0.005)  # 5ms
+    for _ in range(10):
+        histogram.observe(0.5)    # 500ms
+
+    snapshot = histogram.snapshot()
+
+    assert snapshot["count"] == 100
+    assert snapshot["p50"] == 10
+    assert snapshot["p95"] == 1000
+    assert snapshot["buckets"] == {"10": 90, "100": 90, "1000": 100, "+Inf": 100}
+
+
+def test_overflow_bucket_reports_max():
+    histogram = LatencyHistogram(buckets_ms=(10,))
+    histogram.observe(2.0)
+
+    assert histogram.percentile(0.99) == 2000.0
+    assert LatencyHistogram().percentile(0.5) is None
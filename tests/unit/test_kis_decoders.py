@@ -0,0 +1,50 @@
+import subprocess
+import sys
+
+from app.infrastructure.kis_decoders import (
+    decode_balance, decode_index, decode_rankings, decode_stock, to_float, to_int,
+)
+
+
+def test_decode_stock():
+    stock = decode_stock("005930", "삼성전자", {"stck_prpr": "70000", "prdy_vrss": "-500", "prdy_ctrt": "-0.71"})
+
+    assert stock.price == 70000.0
+    assert stock.change_amount == -500.0
+    assert decode_stock("005930", "삼성전자", {}) is None
+
+
+def test_decode_index_and_rankings():
+    index = decode_index({"bstp_nmix_prpr": "2650.12", "bstp_nmix_prdy_vrss": "10.5", "bstp_nmix_prdy_ctrt": "0.40"})
+    rankings = decode_rankings([{
+        "mksc_shrn_iscd": "005930", "hts_kor_isnm": "삼성전자",
+        "stck_prpr": "70000", "prdy_ctrt": "1.2", "acml_tr_pbmn": "1500000000000",
+    }])
+
+    assert index == {"price": 2650.12, "change": 10.5, "rate": 0.4}
+    assert rankings[0]["code"] == "005930"
+    assert rankings[0]["amount"] == 1.5e12
+
+
+def test_decode_balance_skips_empty_holdings():
+    balance = decode_balance(
+        [{"pdno": "005930", "hldg_qty": "10"}, {"pdno": "000660", "hldg_qty": "0"}],
+        [{"dnca_tot_amt": "1000000"}],
+    )
+
+    assert [h["pdno"] for h in balance["holdings"]] == ["005930"]
+    assert balance["summary"]["dnca_tot_amt"] == "1000000"
+
+
+def test_number_parsing_falls_back_to_default():
+    assert to_float("-0.71") == -0.71
+    assert to_float("", 1.5) == 1.5
+    assert to_int("10.0") == 10
+    assert to_int(None, 86400) == 86400
+
+
+def test_server_startup_does_not_import_pandas():
+    code = "import sys, app.main; print('pandas' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == "False"
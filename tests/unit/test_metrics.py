@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+
+from app.core.metrics import MetricsMiddleware, MetricsRegistry, observe_upstream, UPSTREAM_ERRORS
+
+
+def test_render_counters_gauges_histograms_and_collectors():
+    # Given
+    registry = MetricsRegistry()
+    registry.counter("hits_total", "Hits", ("category",)).inc(category="stock")
+    registry.counter("hits_total", "Hits", ("category",)).inc(2, category="stock")
+    registry.gauge("inflight", "In flight").set(3)
+    registry.histogram("latency_seconds", "Latency", ("api",)).observe(0.004, api="FHKST01010100")
+    registry.register_collector(lambda: [("entries", "gauge", "Entries", [({"category": "chart"}, 7)])])
+
+    # When
+    text = registry.render()
+
+    # Then
+    assert "# TYPE hits_total counter" in text
+    assert 'hits_total{category="stock"} 3' in text
+    assert "inflight 3" in text
+    assert 'latency_seconds_bucket{api="FHKST01010100",le="0.0025"} 0' in text
+    assert 'latency_seconds_bucket{api="FHKST01010100",le="0.005"} 1' in text
+    assert 'latency_seconds_bucket{api="FHKST01010100",le="+Inf"} 1' in text
+    assert 'latency_seconds_count{api="FHKST01010100"} 1' in text
+    assert 'entries{category="chart"} 7' in text
+    assert text.endswith("\n")
+
+
+def test_observe_upstream_counts_errors_by_code():
+    class CodedError(Exception):
+        code = "EGW00201"
+
+    # When
+    with pytest.raises(CodedError):
+        with observe_upstream("TEST_API"):
+            raise CodedError()
+
+    # Then
+    assert 'kis_upstream_errors_total{api="TEST_API",reason="EGW00201"} 1' in "\n".join(UPSTREAM_ERRORS.render())
+
+
+def test_middleware_labels_requests_by_route_template():
+    import httpx
+    from app.core.metrics import HTTP_REQUESTS
+
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: str):
+        return {"id": item_id}
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            await client.get("/items/1")
+            await client.get("/items/2")
+            await client.get("/missing")
+
+    # When
+    asyncio.run(run())
+
+    # Then
+    text = "\n".join(HTTP_REQUESTS.render())
+    assert 'http_requests_total{method="GET",route="/items/{item_id}",status="200"} 2' in text
+    assert 'http_requests_total{method="GET",route="unmatched",status="404"} 1' in text
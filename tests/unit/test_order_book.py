@@ -0,0 +1,61 @@
+from app.core.order_book import OrderBookStore, compact, expand
+
+
+def book(ask_volume: int = 100, bid_volume: int = 200):
+    return {
+        "asks": [{"price": 70100.0 + i * 100, "volume": ask_volume + i} for i in range(10)],
+        "bids": [{"price": 70000.0 - i * 100, "volume": bid_volume + i} for i in range(10)],
+    }
+
+
+def test_compact_round_trip():
+    assert expand(compact(book())) == book()
+
+
+def test_unchanged_book_keeps_seq():
+    store = OrderBookStore(history=10, max_series=10)
+
+    first = store.update("005930", book())
+    second = store.update("005930", book())
+
+    assert first == second
+
+
+def test_delta_contains_only_changed_levels():
+    store = OrderBookStore(history=10, max_series=10)
+    base = store.update("005930", book())
+    changed = book()
+    changed["bids"][0]["volume"] = 999
+    seq = store.update("005930", changed)
+
+    delta = store.delta("005930", since=base)
+
+    assert delta == {"seq": seq, "changes": [[10, 70000.0, 999]]}
+    assert store.delta("005930", since=seq) == {"seq": seq, "changes": []}
+
+
+def test_unknown_or_expired_seq_returns_full_book():
+    store = OrderBookStore(history=2, max_series=10)
+    oldest = store.update("005930", book(ask_volume=1))
+    store.update("005930", book(ask_volume=2))
+    store.update("005930", book(ask_volume=3))
+
+    delta = store.delta("005930", since=oldest)
+
+    assert delta["full"] is True
+    assert delta["asks"][0]["volume"] == 3
+    assert store.delta("000660", since=oldest) is None
+
+
+def test_seq_from_another_store_is_not_matched():
+    # Given: 같은 호가를 받은 두 저장소 (워커 두 개)
+    worker_a, worker_b = OrderBookStore(history=10, max_series=10), OrderBookStore(history=10, max_series=10)
+    seq_a = worker_a.update("005930", book(ask_volume=1))
+    worker_b.update("005930", book(ask_volume=2))
+
+    # When: worker A의 seq로 worker B에 변경분을 요청하면
+    delta = worker_b.delta("005930", since=seq_a)
+
+    # Then: 다른 기준과 비교하지 않고 전체 호가를 응답
+    assert delta["full"] is True
+    assert seq_a < 2 ** 53
@@ -0,0 +1,58 @@
+import asyncio
+import threading
+import time
+import pytest
+from app.core.rate_limiter import Priority, RateLimiter, RateLimitTimeout
+
+def test_burst_then_throttle():
+    limiter = RateLimiter(rate=20, burst=2, reserve_ratio={})
+    start = time.monotonic()
+    for _ in range(4):
+        limiter.acquire(Priority.QUOTE)
+    # 2개는 즉시, 나머지 2개는 1/20초 간격으로 충전
+    assert time.monotonic() - start >= 0.09
+
+def test_higher_priority_is_served_first():
+    limiter = RateLimiter(rate=10, burst=1, reserve_ratio={})
+    limiter.acquire(Priority.QUOTE)  # 버킷 비우기
+    order = []
+
+    def worker(priority):
+        limiter.acquire(priority)
+        order.append(priority)
+
+    low = threading.Thread(target=worker, args=(Priority.RANKING,))
+    low.start()
+    time.sleep(0.02)
+    high = threading.Thread(target=worker, args=(Priority.ORDER,))
+    high.start()
+    low.join()
+    high.join()
+
+    assert order == [Priority.ORDER, Priority.RANKING]
+
+def test_low_priority_keeps_reserve_for_orders():
+    limiter = RateLimiter(rate=0.01, burst=2)
+    limiter.acquire(Priority.QUOTE)  # 토큰 1개 남음
+
+    # 랭킹은 버킷의 절반(1개)을 남겨야 하므로 대기하다가 timeout
+    with pytest.raises(RateLimitTimeout):
+        limiter.acquire(Priority.RANKING, timeout=0.05)
+    # 주문은 남은 토큰을 바로 사용
+    limiter.acquire(Priority.ORDER, timeout=0.05)
+
+    stats = limiter.stats()
+    assert stats["priorities"]["ranking"]["timeouts"] == 1
+    assert stats["priorities"]["order"]["acquired"] == 1
+    assert stats["queue_depth"] == 0
+
+def test_async_acquire_shares_bucket():
+    limiter = RateLimiter(rate=50, burst=1, reserve_ratio={})
+
+    async def scenario():
+        await asyncio.gather(*[limiter.acquire_async(Priority.CHART) for _ in range(3)])
+
+    start = time.monotonic()
+    asyncio.run(scenario())
+    assert time.monotonic() - start >= 0.03
+    assert limiter.stats()["priorities"]["chart"]["acquired"] == 3
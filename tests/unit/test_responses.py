@@ -0,0 +1,43 @@
+"""
+json_response (ETag/304, 압축) 단위 테스트
+"""
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from app.api.v1.responses import json_response
+
+CHART = [{"date": "20250101", "time": "090000", "price": 70000.0, "volume": 100}] * 50
+
+app = FastAPI()
+
+@app.get("/chart")
+async def chart(request: Request):
+    return json_response(request, CHART, etag='"abc-1"')
+
+client = TestClient(app)
+
+
+def test_etag_and_not_modified():
+    """
+    Given: ETag가 붙은 응답을 받은 클라이언트가
+    When: If-None-Match로 같은 ETag를 보내면
+    Then: 본문 없이 304를 받아야 함
+    """
+    first = client.get("/chart")
+    assert first.status_code == 200
+    assert first.headers["etag"] == '"abc-1"'
+    assert first.json() == CHART
+
+    second = client.get("/chart", headers={"If-None-Match": 'W/"abc-1"'})
+    assert second.status_code == 304
+    assert second.content == b""
+
+    changed = client.get("/chart", headers={"If-None-Match": '"abc-0"'})
+    assert changed.status_code == 200
+
+
+def test_brotli_when_client_accepts_br():
+    response = client.get("/chart", headers={"Accept-Encoding": "br"})
+
+    assert response.headers["content-encoding"] == "br"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.json() == CHART
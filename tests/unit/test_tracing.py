@@ -0,0 +1,72 @@
+import asyncio
+import threading
+import time
+
+from app.core.profiler import SamplingProfiler
+from app.core.tracing import Tracer, annotate, span
+
+
+def test_spans_nest_across_tasks_and_threads():
+    tracer = Tracer(sample_rate=1.0)
+
+    def blocking_call():
+        with span("kis_client.get_indices"):
+            time.sleep(0.001)
+
+    async def fetch():
+        with span("upstream"):
+            await asyncio.to_thread(blocking_call)
+
+    async def handle():
+        with tracer.trace("GET /indices"):
+            with span("cache", key="market_indices"):
+                annotate(result="miss")
+                await asyncio.ensure_future(fetch())
+
+    # When
+    asyncio.run(handle())
+
+    # Then
+    trace = tracer.recent()[0]
+    names = [(s["name"], s["parent"]) for s in trace["spans"]]
+    assert names == [("cache", -1), ("upstream", 0), ("kis_client.get_indices", 1)]
+    assert trace["spans"][0]["attrs"] == {"key": "market_indices", "result": "miss"}
+    assert trace["duration_ms"] >= trace["spans"][2]["duration_ms"] >= 1
+
+
+def test_unsampled_requests_are_not_recorded_and_buffer_is_bounded():
+    # Given
+    tracer = Tracer(sample_rate=0.0, capacity=2)
+
+    # When
+    with tracer.trace("GET /a") as trace:
+        with span("cache"):
+            annotate(result="hit")
+    for i in range(3):
+        with tracer.trace(f"GET /forced/{i}", force=True):
+            pass
+
+    # Then
+    assert trace is None
+    assert [t["name"] for t in tracer.recent()] == ["GET /forced/2", "GET /forced/1"]
+    assert tracer.stats()["sampled"] == 3
+
+
+def test_profiler_collects_stacks_of_other_threads():
+    stop = threading.Event()
+
+    def busy_worker():
+        while not stop.is_set():
+            sum(range(1000))
+
+    worker = threading.Thread(target=busy_worker)
+    worker.start()
+    try:
+        result = SamplingProfiler().run(seconds=0.1, interval=0.002)
+    finally:
+        stop.set()
+        worker.join()
+
+    assert result["samples"] > 0
+    assert any("busy_worker" in stack for stack in result["stacks"])
+    assert "busy_worker" in SamplingProfiler.collapsed(result)